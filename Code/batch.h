@@ -0,0 +1,64 @@
+#ifndef BATCH_H
+#define BATCH_H
+
+#include <cstdio>
+#include <fstream>
+#include <iostream>
+#include <string>
+
+#include "phase_timer.h"
+
+// Manifest batch mode shared by the engines: one process handles many graphs.
+// The manifest is a file with one graph path per line, or "-" for stdin. Each
+// graph produces exactly one JSON line on stdout, flushed immediately, so a
+// driver can keep the process alive, write a path and read back its result.
+
+inline std::string jsonQuote(const std::string &s) {
+    std::string out = "\"";
+    for (char c : s) {
+        if (c == '"' || c == '\\') {
+            out += '\\';
+            out += c;
+        } else if ((unsigned char)c < 0x20) {
+            char buf[8];
+            snprintf(buf, sizeof(buf), "\\u%04x", c);
+            out += buf;
+        } else {
+            out += c;
+        }
+    }
+    return out + "\"";
+}
+
+// {"engine":...,"file":...,"error":...} for a graph that could not be processed.
+inline std::string batchError(const std::string &engine, const std::string &path, const std::string &message) {
+    return "{\"engine\":" + jsonQuote(engine) + ",\"file\":" + jsonQuote(path) + ",\"error\":" + jsonQuote(message) + "}";
+}
+
+// Calls solve(path) for every non-empty manifest line and prints the JSON line
+// it returns. The peak RSS is reset before each graph, so the record's
+// peak_rss covers that graph (plus whatever earlier graphs left resident).
+// Returns the process exit code.
+template <class Solve>
+int runManifest(const std::string &manifest, Solve solve) {
+    std::ifstream file;
+    if (manifest != "-") {
+        file.open(manifest);
+        if (!file) {
+            std::cerr << "Error: Cannot open manifest " << manifest << "\n";
+            return 1;
+        }
+    }
+    std::istream &in = manifest == "-" ? std::cin : file;
+    std::string path;
+    while (std::getline(in, path)) {
+        size_t first = path.find_first_not_of(" \t\r");
+        if (first == std::string::npos) continue;
+        path = path.substr(first, path.find_last_not_of(" \t\r") - first + 1);
+        resetPeakRss();
+        std::cout << solve(path) << '\n' << std::flush;
+    }
+    return 0;
+}
+
+#endif
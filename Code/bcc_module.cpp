@@ -0,0 +1,239 @@
+// CPython extension exposing both engines in-process; built and loaded by
+// Scripts/bcc.py. Inputs are read through the buffer protocol without
+// copying (int32 indices, int64 or int32 indptr; other widths are converted),
+// the GIL is released while computing, and results are written into
+// bytearrays that bcc.py wraps as NumPy arrays. The *_block_cut_tree variants
+// return the serialized block-cut tree instead (block_cut_tree.h), which
+// Scripts/block_cut_tree.py queries.
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <cstdint>
+#include <cstring>
+#include <limits>
+#include <string>
+#include <vector>
+
+#include "block_cut_tree.h"
+#include "csr_graph.h"
+#include "parallel_util.h"
+#include "slota.h"
+#include "tarjan_parallel.h"
+
+namespace {
+
+enum Engine { SLOTA, TARJAN_VISHKIN };
+enum Output { LABELS, BLOCK_CUT_TREE };
+
+// A 1-D C-contiguous buffer of signed 32- or 64-bit integers.
+struct IntBuffer {
+    Py_buffer view{};
+    bool held = false;
+
+    ~IntBuffer() {
+        if (held) PyBuffer_Release(&view);
+    }
+
+    bool acquire(PyObject *obj, const char *name) {
+        if (PyObject_GetBuffer(obj, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0) return false;
+        held = true;
+        const char *format = view.format ? view.format : "B";
+        while (*format == '@' || *format == '=' || *format == '<') ++format;
+        bool isInt = std::strlen(format) == 1 && std::strchr("ilq", format[0]) != nullptr;
+        if (view.ndim != 1 || !isInt || (view.itemsize != 4 && view.itemsize != 8)) {
+            PyErr_Format(PyExc_TypeError, "%s must be a 1-D array of int32 or int64", name);
+            return false;
+        }
+        return true;
+    }
+
+    Py_ssize_t size() const { return view.len / view.itemsize; }
+    int64_t at(Py_ssize_t i) const {
+        return view.itemsize == 8 ? static_cast<const int64_t *>(view.buf)[i] : static_cast<const int32_t *>(view.buf)[i];
+    }
+};
+
+// Checks the layout the engines rely on; returns an error message or "".
+std::string validateCsr(const CsrGraph &g) {
+    if (g.offsets[0] != 0) return "indptr[0] must be 0";
+    for (int v = 0; v < g.n; ++v)
+        if (g.offsets[v + 1] < g.offsets[v]) return "indptr must be non-decreasing";
+    std::string error;
+#pragma omp parallel for schedule(dynamic, 1024)
+    for (int v = 0; v < g.n; ++v) {
+        for (int64_t p = g.offsets[v]; p < g.offsets[v + 1]; ++p) {
+            int u = g.adj[p];
+            const char *problem = nullptr;
+            if (u < 0 || u >= g.n)
+                problem = "indices out of range";
+            else if (u == v)
+                problem = "self-loops are not supported";
+            else if (p > g.offsets[v] && g.adj[p - 1] >= u)
+                problem = "each row of indices must be sorted without duplicates";
+            else if (!std::binary_search(g.begin(u), g.end(u), v))
+                problem = "the graph must be symmetric";
+            if (problem) {
+#pragma omp critical
+                if (error.empty()) error = problem;
+                break;
+            }
+        }
+    }
+    return error;
+}
+
+// Per-CSR-entry labels from an edge DSU whose roots are each block's smallest
+// edge id, so labels are numbered in order of their smallest edge. A vertex is
+// an articulation point when its edges carry more than one label.
+void labelEntries(const CsrGraph &g, const std::vector<int32_t> &edgeOf, ConcurrentDSU &blocks, int numEdges,
+                  int32_t *labels, std::vector<int32_t> &articulation) {
+    std::vector<int64_t> blockIndex(numEdges);
+#pragma omp parallel for
+    for (int e = 0; e < numEdges; ++e) blockIndex[e] = blocks.find(e) == e;
+    exclusiveScan(blockIndex);
+    int64_t nnz = g.nnz();
+#pragma omp parallel for
+    for (int64_t p = 0; p < nnz; ++p) labels[p] = (int32_t)blockIndex[blocks.find(edgeOf[p])];
+
+    std::vector<char> isArticulation(g.n, 0);
+#pragma omp parallel for schedule(dynamic, 1024)
+    for (int v = 0; v < g.n; ++v)
+        for (int64_t p = g.offsets[v] + 1; p < g.offsets[v + 1]; ++p)
+            if (labels[p] != labels[g.offsets[v]]) {
+                isArticulation[v] = 1;
+                break;
+            }
+    for (int v = 0; v < g.n; ++v)
+        if (isArticulation[v]) articulation.push_back(v);
+}
+
+PyObject *runEngine(PyObject *args, PyObject *kwargs, Engine engine, Output output) {
+    static const char *keywords[] = {"indptr", "indices", "threads", nullptr};
+    PyObject *indptrObj, *indicesObj;
+    int threads = 0;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|i", const_cast<char **>(keywords), &indptrObj, &indicesObj, &threads))
+        return nullptr;
+
+    IntBuffer indptr, indices;
+    if (!indptr.acquire(indptrObj, "indptr") || !indices.acquire(indicesObj, "indices")) return nullptr;
+    Py_ssize_t n = indptr.size() - 1;
+    if (n < 0 || n >= std::numeric_limits<int32_t>::max()) {
+        PyErr_SetString(PyExc_ValueError, "indptr must have between 1 and 2**31 - 1 entries");
+        return nullptr;
+    }
+    if (indptr.at(n) != indices.size()) {
+        PyErr_SetString(PyExc_ValueError, "indptr[-1] must equal len(indices)");
+        return nullptr;
+    }
+
+    Py_ssize_t labelBytes = output == LABELS ? indices.size() * (Py_ssize_t)sizeof(int32_t) : 0;
+    PyObject *labelsObj = PyByteArray_FromStringAndSize(nullptr, labelBytes);
+    if (!labelsObj) return nullptr;
+    int32_t *labels = reinterpret_cast<int32_t *>(PyByteArray_AS_STRING(labelsObj));
+
+    std::string error, tree;
+    std::vector<int32_t> articulation;
+    Py_BEGIN_ALLOW_THREADS
+    if (threads > 0) omp_set_num_threads(threads);
+
+    // Zero-copy view of the caller's arrays, widening indptr or narrowing
+    // indices into owned storage only when their width does not match.
+    CsrGraph g;
+    g.n = (int)n;
+    g.m = indices.size() / 2;
+    if (indptr.view.itemsize == 8) {
+        g.offsets = static_cast<const int64_t *>(indptr.view.buf);
+    } else {
+        g.ownedOffsets.resize(n + 1);
+        for (Py_ssize_t i = 0; i <= n; ++i) g.ownedOffsets[i] = indptr.at(i);
+        g.offsets = g.ownedOffsets.data();
+    }
+    if (indices.view.itemsize == 4) {
+        g.adj = static_cast<const int32_t *>(indices.view.buf);
+    } else {
+        g.ownedAdj.resize(indices.size());
+        for (Py_ssize_t i = 0; i < indices.size(); ++i) {
+            int64_t u = indices.at(i);
+            g.ownedAdj[i] = (u < 0 || u >= n) ? -1 : (int32_t)u;
+        }
+        g.adj = g.ownedAdj.data();
+    }
+
+    auto finish = [&](const std::vector<int32_t> &edgeOf, ConcurrentDSU &blocks, int numEdges) {
+        if (output == LABELS) {
+            labelEntries(g, edgeOf, blocks, numEdges, labels, articulation);
+            return;
+        }
+        BlockCutTree blockCutTree;
+        blockCutTree.build(g, numEdges, [&](int64_t p) { return blocks.find(edgeOf[p]); });
+        tree = blockCutTree.serialize();
+    };
+    error = validateCsr(g);
+    if (error.empty()) {
+        if (engine == SLOTA) {
+            SlotaBlocks slota(g);
+            slota.labelEdges();
+            finish(slota.edgeOf, slota.blocks, slota.numEdges);
+        } else {
+            TarjanVishkinParallel tarjan(g);
+            tarjan.labelEdges();
+            finish(tarjan.edgeOf, tarjan.blocks, tarjan.numEdges);
+        }
+    }
+    // The graph only borrows the caller's buffers.
+    g.offsets = nullptr;
+    g.adj = nullptr;
+    Py_END_ALLOW_THREADS
+
+    if (!error.empty()) {
+        Py_DECREF(labelsObj);
+        PyErr_SetString(PyExc_ValueError, error.c_str());
+        return nullptr;
+    }
+    if (output == BLOCK_CUT_TREE) {
+        Py_DECREF(labelsObj);
+        return PyBytes_FromStringAndSize(tree.data(), (Py_ssize_t)tree.size());
+    }
+    PyObject *articulationObj = PyByteArray_FromStringAndSize(reinterpret_cast<const char *>(articulation.data()),
+                                                              articulation.size() * (Py_ssize_t)sizeof(int32_t));
+    if (!articulationObj) {
+        Py_DECREF(labelsObj);
+        return nullptr;
+    }
+    return Py_BuildValue("(NN)", articulationObj, labelsObj);
+}
+
+PyObject *slotaBcc(PyObject *, PyObject *args, PyObject *kwargs) { return runEngine(args, kwargs, SLOTA, LABELS); }
+
+PyObject *tarjanVishkinBcc(PyObject *, PyObject *args, PyObject *kwargs) {
+    return runEngine(args, kwargs, TARJAN_VISHKIN, LABELS);
+}
+
+PyObject *slotaBlockCutTree(PyObject *, PyObject *args, PyObject *kwargs) {
+    return runEngine(args, kwargs, SLOTA, BLOCK_CUT_TREE);
+}
+
+PyObject *tarjanVishkinBlockCutTree(PyObject *, PyObject *args, PyObject *kwargs) {
+    return runEngine(args, kwargs, TARJAN_VISHKIN, BLOCK_CUT_TREE);
+}
+
+PyMethodDef methods[] = {
+    {"slota_bcc", reinterpret_cast<PyCFunction>(reinterpret_cast<void (*)(void)>(slotaBcc)), METH_VARARGS | METH_KEYWORDS,
+     "slota_bcc(indptr, indices, threads=0) -> (articulation bytes, per-entry label bytes), both int32"},
+    {"tarjan_vishkin_bcc", reinterpret_cast<PyCFunction>(reinterpret_cast<void (*)(void)>(tarjanVishkinBcc)),
+     METH_VARARGS | METH_KEYWORDS,
+     "tarjan_vishkin_bcc(indptr, indices, threads=0) -> (articulation bytes, per-entry label bytes), both int32"},
+    {"slota_block_cut_tree", reinterpret_cast<PyCFunction>(reinterpret_cast<void (*)(void)>(slotaBlockCutTree)),
+     METH_VARARGS | METH_KEYWORDS, "slota_block_cut_tree(indptr, indices, threads=0) -> serialized block-cut tree bytes"},
+    {"tarjan_vishkin_block_cut_tree",
+     reinterpret_cast<PyCFunction>(reinterpret_cast<void (*)(void)>(tarjanVishkinBlockCutTree)),
+     METH_VARARGS | METH_KEYWORDS,
+     "tarjan_vishkin_block_cut_tree(indptr, indices, threads=0) -> serialized block-cut tree bytes"},
+    {nullptr, nullptr, 0, nullptr},
+};
+
+PyModuleDef moduleDef = {PyModuleDef_HEAD_INIT, "_bcc", "Biconnected components through the engines' C++ code.", -1, methods};
+
+}  // namespace
+
+PyMODINIT_FUNC PyInit__bcc(void) { return PyModule_Create(&moduleDef); }
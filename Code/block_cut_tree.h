@@ -0,0 +1,224 @@
+#ifndef BLOCK_CUT_TREE_H
+#define BLOCK_CUT_TREE_H
+
+#include <algorithm>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <string>
+#include <vector>
+
+#include "csr_graph.h"
+#include "parallel_util.h"
+
+// Block-cut tree of a graph from its per-entry BCC labels, with the Euler tour
+// that answers LCA queries by a range minimum over depths. Nodes 0..B-1 are
+// the blocks, numbered by their smallest edge id as the engines number BCCs,
+// and nodes B..B+A-1 are the articulation points in vertex order. A vertex
+// maps to its cut node if it is an articulation point, to its only block
+// otherwise, and to -1 if it is isolated. Two vertices then share a block iff
+// their nodes are (number of cut nodes among them) apart, and the articulation
+// points separating them are the cut nodes strictly inside the tree path.
+// Each block also records its smallest edge, which is what incremental.h
+// needs to keep that numbering when edges are added.
+//
+// File layout written by write() and read by Scripts/block_cut_tree.py
+// (little endian):
+//   char     magic[8]      "BCCBCT\0\0"
+//   uint32_t version
+//   uint32_t flags         (reserved, 0)
+//   int64_t  n             number of vertices
+//   int64_t  blocks        B
+//   int64_t  cuts          A
+//   int64_t  eulerLength   L, 2 * nodes - trees
+//   int64_t  blockEdge[B]  smallest edge of each block, (u << 32) | v with u < v
+//   int32_t  vertexNode[n]
+//   int32_t  cutVertex[A]  vertex of each cut node
+//   int32_t  parent[B + A] -1 for a tree root
+//   int32_t  depth[B + A]
+//   int32_t  root[B + A]
+//   int32_t  first[B + A]  first position of each node in the tour
+//   int32_t  euler[L]      nodes in DFS order, repeated after each child
+static const char BCT_MAGIC[8] = {'B', 'C', 'C', 'B', 'C', 'T', 0, 0};
+static const uint32_t BCT_VERSION = 2;
+static const size_t BCT_HEADER_SIZE = 8 + 4 + 4 + 8 + 8 + 8 + 8;
+
+struct BlockCutTree {
+    int64_t n = 0, numBlocks = 0, numCuts = 0;
+    std::vector<int64_t> blockEdge;
+    std::vector<int32_t> vertexNode, cutVertex, parent, depth, root, first, euler;
+
+    // label(p) is the BCC of CSR entry p, any id in [0, numLabels) shared by
+    // both entries of an edge. Blocks are renumbered by first appearance in
+    // edge id order, so every engine writes the same tree.
+    template <class Label>
+    void build(const CsrGraph &g, int64_t numLabels, Label label) {
+        n = g.n;
+        std::vector<int32_t> blockOf(numLabels, -1);
+        blockEdge.clear();
+        for (int v = 0; v < g.n; ++v)
+            for (int64_t p = std::upper_bound(g.begin(v), g.end(v), v) - g.adj; p < g.offsets[v + 1]; ++p) {
+                int32_t &block = blockOf[label(p)];
+                if (block < 0) {
+                    block = (int32_t)blockEdge.size();
+                    blockEdge.push_back((int64_t)v << 32 | g.adj[p]);
+                }
+            }
+        numBlocks = blockEdge.size();
+
+        // Each articulation point links to the distinct blocks of its edges.
+        std::vector<std::vector<int32_t>> cutBlocks(g.n);
+        vertexNode.assign(g.n, -1);
+#pragma omp parallel for schedule(dynamic, 1024)
+        for (int v = 0; v < g.n; ++v) {
+            if (g.degree(v) == 0) continue;
+            int32_t block = blockOf[label(g.offsets[v])];
+            vertexNode[v] = block;
+            for (int64_t p = g.offsets[v] + 1; p < g.offsets[v + 1]; ++p)
+                if (blockOf[label(p)] != block) {
+                    std::vector<int32_t> &blocks = cutBlocks[v];
+                    for (int64_t q = g.offsets[v]; q < g.offsets[v + 1]; ++q) blocks.push_back(blockOf[label(q)]);
+                    std::sort(blocks.begin(), blocks.end());
+                    blocks.erase(std::unique(blocks.begin(), blocks.end()), blocks.end());
+                    break;
+                }
+        }
+        cutVertex.clear();
+        std::vector<std::vector<int32_t>> linked;
+        for (int v = 0; v < g.n; ++v)
+            if (!cutBlocks[v].empty()) {
+                vertexNode[v] = (int32_t)(numBlocks + cutVertex.size());
+                cutVertex.push_back(v);
+                linked.push_back(std::move(cutBlocks[v]));
+            }
+        std::vector<std::vector<int32_t>>().swap(cutBlocks);
+        numCuts = cutVertex.size();
+        linkCuts(linked);
+    }
+
+    // Tree edges from cut node numBlocks + i to the blocks in cutBlocks[i],
+    // listed in increasing order, then the Euler tour.
+    void linkCuts(const std::vector<std::vector<int32_t>> &cutBlocks) {
+        int64_t nodes = numBlocks + numCuts;
+        std::vector<int64_t> offsets(nodes + 1, 0);
+        for (int64_t i = 0; i < numCuts; ++i) {
+            offsets[numBlocks + i] += cutBlocks[i].size();
+            for (int32_t block : cutBlocks[i]) ++offsets[block];
+        }
+        int64_t links = exclusiveScan(offsets);
+        offsets[nodes] = links;
+        std::vector<int32_t> adj(links);
+        std::vector<int64_t> fill(offsets.begin(), offsets.end() - 1);
+        for (int64_t i = 0; i < numCuts; ++i)
+            for (int32_t block : cutBlocks[i]) {
+                adj[fill[numBlocks + i]++] = block;
+                adj[fill[block]++] = (int32_t)(numBlocks + i);
+            }
+        eulerTour(offsets, adj);
+    }
+
+    // Iterative DFS over each tree of the forest, recording parent, depth,
+    // root and the Euler tour.
+    void eulerTour(const std::vector<int64_t> &offsets, const std::vector<int32_t> &adj) {
+        int64_t nodes = numBlocks + numCuts;
+        parent.assign(nodes, -1);
+        depth.assign(nodes, -1);
+        root.assign(nodes, -1);
+        first.assign(nodes, -1);
+        euler.clear();
+        euler.reserve(2 * nodes);
+        std::vector<int64_t> next(offsets.begin(), offsets.end() - 1);
+        std::vector<int32_t> stack;
+        for (int32_t r = 0; r < nodes; ++r) {
+            if (depth[r] >= 0) continue;
+            depth[r] = 0;
+            root[r] = r;
+            first[r] = (int32_t)euler.size();
+            euler.push_back(r);
+            stack.push_back(r);
+            while (!stack.empty()) {
+                int32_t node = stack.back();
+                if (next[node] < offsets[node + 1]) {
+                    int32_t child = adj[next[node]++];
+                    if (child == parent[node]) continue;
+                    parent[child] = node;
+                    depth[child] = depth[node] + 1;
+                    root[child] = r;
+                    first[child] = (int32_t)euler.size();
+                    euler.push_back(child);
+                    stack.push_back(child);
+                } else {
+                    stack.pop_back();
+                    if (!stack.empty()) euler.push_back(stack.back());
+                }
+            }
+        }
+    }
+
+    // The file layout above, through a temporary file and a rename.
+    bool write(const std::string &filename) const {
+        std::string tmp = filename + ".tmp";
+        {
+            std::ofstream file(tmp, std::ios::binary);
+            if (!file) return false;
+            std::string bytes = serialize();
+            file.write(bytes.data(), bytes.size());
+            if (!file) return false;
+        }
+        return std::rename(tmp.c_str(), filename.c_str()) == 0;
+    }
+
+    std::string serialize() const {
+        std::string out;
+        uint32_t flags = 0;
+        int64_t eulerLength = euler.size();
+        auto put = [&out](const void *data, size_t size) { out.append(static_cast<const char *>(data), size); };
+        auto putArray = [&put](const std::vector<int32_t> &a) { put(a.data(), a.size() * sizeof(int32_t)); };
+        put(BCT_MAGIC, sizeof(BCT_MAGIC));
+        put(&BCT_VERSION, sizeof(BCT_VERSION));
+        put(&flags, sizeof(flags));
+        put(&n, sizeof(n));
+        put(&numBlocks, sizeof(numBlocks));
+        put(&numCuts, sizeof(numCuts));
+        put(&eulerLength, sizeof(eulerLength));
+        put(blockEdge.data(), blockEdge.size() * sizeof(int64_t));
+        for (const std::vector<int32_t> *a : {&vertexNode, &cutVertex, &parent, &depth, &root, &first, &euler})
+            putArray(*a);
+        return out;
+    }
+
+    // Loads a file written by write(); false if it is missing or malformed.
+    bool read(const std::string &filename) {
+        std::ifstream file(filename, std::ios::binary);
+        char header[BCT_HEADER_SIZE];
+        if (!file.read(header, sizeof(header)) || memcmp(header, BCT_MAGIC, sizeof(BCT_MAGIC)) != 0) return false;
+        uint32_t version;
+        int64_t eulerLength;
+        memcpy(&version, header + 8, sizeof(version));
+        memcpy(&n, header + 16, sizeof(n));
+        memcpy(&numBlocks, header + 24, sizeof(numBlocks));
+        memcpy(&numCuts, header + 32, sizeof(numCuts));
+        memcpy(&eulerLength, header + 40, sizeof(eulerLength));
+        if (version != BCT_VERSION || n < 0 || numBlocks < 0 || numCuts < 0 || eulerLength < 0) return false;
+        int64_t nodes = numBlocks + numCuts;
+        blockEdge.resize(numBlocks);
+        file.read(reinterpret_cast<char *>(blockEdge.data()), numBlocks * sizeof(int64_t));
+        const std::pair<std::vector<int32_t> *, int64_t> arrays[] = {
+            {&vertexNode, n}, {&cutVertex, numCuts}, {&parent, nodes}, {&depth, nodes},
+            {&root, nodes},   {&first, nodes},       {&euler, eulerLength}};
+        for (const auto &array : arrays) {
+            array.first->resize(array.second);
+            file.read(reinterpret_cast<char *>(array.first->data()), array.second * sizeof(int32_t));
+        }
+        return file && file.peek() == std::char_traits<char>::eof();
+    }
+};
+
+// Output file for graphPath in batch mode: directory/<graph file name>.bct.
+inline std::string blockCutTreeFile(const std::string &directory, const std::string &graphPath) {
+    size_t slash = graphPath.find_last_of('/');
+    return directory + "/" + (slash == std::string::npos ? graphPath : graphPath.substr(slash + 1)) + ".bct";
+}
+
+#endif
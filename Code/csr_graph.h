@@ -0,0 +1,152 @@
+#ifndef CSR_GRAPH_H
+#define CSR_GRAPH_H
+
+#include <algorithm>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <string>
+#include <vector>
+
+
+#ifdef __linux__
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+// Binary CSR cache layout written by Scripts/csr_cache.py (little endian):
+//   char     magic[8]      "BCCCSR\0\0"
+//   uint32_t version
+//   uint32_t flags         (reserved, 0)
+//   int64_t  n             number of vertices
+//   int64_t  m             edge count echoed from the .mtx header
+//   int64_t  nnz           length of the neighbor array
+//   uint8_t  sourceHash[32] sha256 of the source .mtx
+//   int64_t  offsets[n + 1]
+//   int32_t  adj[nnz]
+// The graph is symmetrized, 0-based, self-loop free and each adjacency
+// list is sorted without duplicates.
+static const char CSR_MAGIC[8] = {'B', 'C', 'C', 'C', 'S', 'R', 0, 0};
+static const uint32_t CSR_VERSION = 1;
+static const size_t CSR_HEADER_SIZE = 8 + 4 + 4 + 8 + 8 + 8 + 32;
+
+struct CsrGraph {
+    int n = 0;
+    long long m = 0;
+    const int64_t *offsets = nullptr;
+    const int32_t *adj = nullptr;
+
+    // Backing storage: either owned vectors (text input) or a read-only mapping.
+    std::vector<int64_t> ownedOffsets;
+    std::vector<int32_t> ownedAdj;
+    void *mapBase = nullptr;
+    size_t mapSize = 0;
+
+    CsrGraph() = default;
+    CsrGraph(const CsrGraph &) = delete;
+    CsrGraph &operator=(const CsrGraph &) = delete;
+    ~CsrGraph() { release(); }
+
+    int64_t nnz() const { return offsets ? offsets[n] : 0; }
+    int degree(int v) const { return (int)(offsets[v + 1] - offsets[v]); }
+    const int32_t *begin(int v) const { return adj + offsets[v]; }
+    const int32_t *end(int v) const { return adj + offsets[v + 1]; }
+
+    // Bytes held by the adjacency structure (mapped pages count as well).
+    size_t memoryBytes() const {
+        return sizeof(*this) + (size_t)(n + 1) * sizeof(int64_t) + (size_t)nnz() * sizeof(int32_t);
+    }
+
+    void release() {
+#ifdef __linux__
+        if (mapBase) munmap(mapBase, mapSize);
+#endif
+        mapBase = nullptr;
+        mapSize = 0;
+        ownedOffsets.clear();
+        ownedAdj.clear();
+        offsets = nullptr;
+        adj = nullptr;
+        n = 0;
+        m = 0;
+    }
+};
+
+// Map a binary CSR cache file read-only; the arrays are used in place.
+inline bool mapCsrFile(const std::string &filename, CsrGraph &graph) {
+#ifdef __linux__
+    int fd = open(filename.c_str(), O_RDONLY);
+    if (fd < 0) return false;
+    struct stat st;
+    if (fstat(fd, &st) != 0 || (size_t)st.st_size < CSR_HEADER_SIZE) {
+        close(fd);
+        return false;
+    }
+    size_t size = (size_t)st.st_size;
+    void *base = mmap(nullptr, size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (base == MAP_FAILED) return false;
+
+    const char *bytes = static_cast<const char *>(base);
+    uint32_t version;
+    int64_t n, m, nnz;
+    memcpy(&version, bytes + 8, sizeof(version));
+    memcpy(&n, bytes + 16, sizeof(n));
+    memcpy(&m, bytes + 24, sizeof(m));
+    memcpy(&nnz, bytes + 32, sizeof(nnz));
+    size_t expected = CSR_HEADER_SIZE + (size_t)(n + 1) * sizeof(int64_t) + (size_t)nnz * sizeof(int32_t);
+    if (memcmp(bytes, CSR_MAGIC, sizeof(CSR_MAGIC)) != 0 || version != CSR_VERSION || size != expected) {
+        munmap(base, size);
+        return false;
+    }
+
+    graph.release();
+    graph.n = (int)n;
+    graph.m = m;
+    graph.mapBase = base;
+    graph.mapSize = size;
+    graph.offsets = reinterpret_cast<const int64_t *>(bytes + CSR_HEADER_SIZE);
+    graph.adj = reinterpret_cast<const int32_t *>(bytes + CSR_HEADER_SIZE + (n + 1) * sizeof(int64_t));
+    return true;
+#else
+    (void)filename;
+    (void)graph;
+    return false;
+#endif
+}
+
+// Write a graph in the layout above, through a temporary file and a rename.
+// sourceHash may be null for graphs without a source file.
+inline bool writeCsrFile(const std::string &filename, const CsrGraph &graph, const uint8_t *sourceHash = nullptr) {
+    std::string tmp = filename + ".tmp";
+    {
+        std::ofstream file(tmp, std::ios::binary);
+        if (!file) return false;
+        uint32_t flags = 0;
+        int64_t n = graph.n, m = graph.m, nnz = graph.nnz();
+        uint8_t hash[32] = {0};
+        if (sourceHash) memcpy(hash, sourceHash, sizeof(hash));
+        file.write(CSR_MAGIC, sizeof(CSR_MAGIC));
+        file.write(reinterpret_cast<const char *>(&CSR_VERSION), sizeof(CSR_VERSION));
+        file.write(reinterpret_cast<const char *>(&flags), sizeof(flags));
+        file.write(reinterpret_cast<const char *>(&n), sizeof(n));
+        file.write(reinterpret_cast<const char *>(&m), sizeof(m));
+        file.write(reinterpret_cast<const char *>(&nnz), sizeof(nnz));
+        file.write(reinterpret_cast<const char *>(hash), sizeof(hash));
+        file.write(reinterpret_cast<const char *>(graph.offsets), (n + 1) * sizeof(int64_t));
+        file.write(reinterpret_cast<const char *>(graph.adj), nnz * sizeof(int32_t));
+        if (!file) return false;
+    }
+    return std::rename(tmp.c_str(), filename.c_str()) == 0;
+}
+
+inline bool isCsrFile(const std::string &filename) {
+    std::ifstream file(filename, std::ios::binary);
+    char magic[8] = {0};
+    return file.read(magic, sizeof(magic)) && memcmp(magic, CSR_MAGIC, sizeof(magic)) == 0;
+}
+
+#endif
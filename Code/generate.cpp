@@ -0,0 +1,281 @@
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <iostream>
+#include <string>
+#include <vector>
+#include "csr_graph.h"
+#include "mtx_reader.h"
+#include "parallel_util.h"
+using namespace std;
+
+// Seeded synthetic graphs for scaling studies, written as a Matrix Market
+// pattern file (streamed chunk by chunk in constant memory) or as a binary CSR
+// file (built in memory with the parallel reader's CSR builder).
+//
+//   generate <family> <n> <output.mtx|output.csr> [--degree D] [--block K] [--seed S] [--rmat a,b,c]
+//
+// Families: rmat (R-MAT/Kronecker with scrambled vertex ids), er (G(n, p)
+// with p = D / (n - 1)), grid2d, grid3d, path, cycle, and cliques: a chain of
+// K-vertex blocks where neighbouring blocks share one articulation vertex.
+// Each block is a cycle plus random chords up to average degree D, so the
+// default D = K - 1 gives cliques. The work is split into fixed chunks, each
+// with its own random stream, so the output depends only on the arguments and
+// not on the thread count.
+
+struct Spec {
+    string family;
+    int64_t n = 0;
+    double degree = -1;
+    int64_t block = 4;
+    uint64_t seed = 1;
+    double a = 0.57, b = 0.19, c = 0.19;
+    vector<int32_t> scramble;  // R-MAT vertex relabeling
+};
+
+// splitmix64: small, seedable and identical on every platform.
+struct Random {
+    uint64_t state;
+    explicit Random(uint64_t seed) : state(seed) {}
+    uint64_t next() {
+        uint64_t z = (state += 0x9e3779b97f4a7c15ULL);
+        z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+        z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+        return z ^ (z >> 31);
+    }
+    double uniform() { return (next() >> 11) * 0x1.0p-53; }
+    int64_t below(int64_t bound) { return (int64_t)(uniform() * bound); }
+};
+
+static Random chunkRandom(const Spec &spec, int64_t chunk) {
+    Random mix(spec.seed * 0x2545f4914f6cdd1dULL + (uint64_t)chunk);
+    return Random(mix.next());
+}
+
+static int rmatScale(int64_t n) {
+    int scale = 0;
+    while ((int64_t(1) << scale) < n) ++scale;
+    return scale;
+}
+
+static int64_t rmatEdges(const Spec &spec) { return spec.n < 2 ? 0 : (int64_t)llround(spec.n * spec.degree / 2); }
+
+static int64_t cliqueBlocks(const Spec &spec) { return spec.n <= 1 ? 0 : (spec.n - 2) / (spec.block - 1) + 1; }
+
+// Work units split into chunks: edges for rmat, blocks for cliques, vertices otherwise.
+static int64_t unitCount(const Spec &spec) {
+    if (spec.family == "rmat") return rmatEdges(spec);
+    if (spec.family == "cliques") return cliqueBlocks(spec);
+    return spec.n;
+}
+
+// Units per chunk, aiming at roughly 2^17 edges per chunk.
+static int64_t chunkUnits(const Spec &spec) {
+    if (spec.family == "rmat") return 1 << 17;
+    if (spec.family == "cliques") return max<int64_t>(1, (1 << 18) / (spec.block * spec.block));
+    if (spec.family == "er") return max<int64_t>(1, (int64_t)((1 << 18) / max(1.0, spec.degree)));
+    return 1 << 16;
+}
+
+static int64_t chunkCount(const Spec &spec) { return (unitCount(spec) + chunkUnits(spec) - 1) / chunkUnits(spec); }
+
+// Calls emit(u, v) for every edge of one chunk.
+template <class Emit>
+void generateChunk(const Spec &spec, int64_t chunk, Emit emit) {
+    int64_t n = spec.n;
+    int64_t lo = chunk * chunkUnits(spec), hi = min(unitCount(spec), lo + chunkUnits(spec));
+    Random random = chunkRandom(spec, chunk);
+
+    if (spec.family == "path" || spec.family == "cycle") {
+        for (int64_t v = lo; v < hi; ++v) {
+            if (v + 1 < n) emit(v, v + 1);
+            else if (spec.family == "cycle" && n >= 3) emit(v, 0);
+        }
+    } else if (spec.family == "grid2d") {
+        int64_t width = (int64_t)ceil(sqrt((double)n));
+        for (int64_t v = lo; v < hi; ++v) {
+            if (v % width + 1 < width && v + 1 < n) emit(v, v + 1);
+            if (v + width < n) emit(v, v + width);
+        }
+    } else if (spec.family == "grid3d") {
+        int64_t width = (int64_t)ceil(cbrt((double)n));
+        while (width * width * width < n) ++width;
+        for (int64_t v = lo; v < hi; ++v) {
+            if (v % width + 1 < width && v + 1 < n) emit(v, v + 1);
+            if (v / width % width + 1 < width && v + width < n) emit(v, v + width);
+            if (v + width * width < n) emit(v, v + width * width);
+        }
+    } else if (spec.family == "er") {
+        // Batagelj-Brandes geometric skipping over the pairs (v, w < v) of rows [lo, hi).
+        double p = n > 1 ? spec.degree / (n - 1) : 0;
+        if (p <= 0) return;
+        if (p >= 1) {
+            for (int64_t v = lo; v < hi; ++v)
+                for (int64_t w = 0; w < v; ++w) emit(v, w);
+            return;
+        }
+        double logq = log(1 - p);
+        int64_t v = max<int64_t>(lo, 1), w = -1;
+        while (v < hi) {
+            w += 1 + (int64_t)floor(log(1 - random.uniform()) / logq);
+            while (w >= v && v < hi) {
+                w -= v;
+                ++v;
+            }
+            if (v < hi) emit(v, w);
+        }
+    } else if (spec.family == "rmat") {
+        int scale = rmatScale(n);
+        for (int64_t e = lo; e < hi; ++e) {
+            int64_t u, v;
+            do {
+                u = v = 0;
+                for (int level = 0; level < scale; ++level) {
+                    double r = random.uniform();
+                    int quadrant = r < spec.a ? 0 : r < spec.a + spec.b ? 1 : r < spec.a + spec.b + spec.c ? 2 : 3;
+                    u = u * 2 + (quadrant >> 1);
+                    v = v * 2 + (quadrant & 1);
+                }
+            } while (u >= n || v >= n || u == v);
+            emit(spec.scramble[u], spec.scramble[v]);
+        }
+    } else if (spec.family == "cliques") {
+        int64_t size = spec.block;
+        for (int64_t blockIndex = lo; blockIndex < hi; ++blockIndex) {
+            int64_t first = blockIndex * (size - 1), count = min(size, n - first);
+            // A cycle through the block keeps it biconnected; chords raise its average degree.
+            int64_t pairs = count * (count - 1) / 2, cycle = count >= 3 ? count : count - 1;
+            double chordProbability =
+                pairs > cycle ? min(1.0, max(0.0, (count * spec.degree / 2 - cycle) / (double)(pairs - cycle))) : 0;
+            for (int64_t i = 0; i < count; ++i) {
+                for (int64_t j = i + 1; j < count; ++j) {
+                    bool onCycle = j == i + 1 || (i == 0 && j == count - 1 && count >= 3);
+                    if (onCycle || random.uniform() < chordProbability) emit(first + i, first + j);
+                }
+            }
+        }
+    }
+}
+
+static void appendIndex(string &out, int64_t value) {
+    char digits[24];
+    int length = 0;
+    do {
+        digits[length++] = (char)('0' + value % 10);
+        value /= 10;
+    } while (value);
+    while (length) out += digits[--length];
+}
+
+static bool writeMatrixMarket(const Spec &spec, const string &filename, const string &description) {
+    FILE *file = fopen(filename.c_str(), "wb");
+    if (!file) return false;
+    // The entry count is only known at the end; it is written into a padded field.
+    string header = "%%MatrixMarket matrix coordinate pattern symmetric\n% " + description + "\n" +
+                    to_string(spec.n) + " " + to_string(spec.n) + " ";
+    long countAt = (long)header.size();
+    header += string(20, ' ') + "\n";
+    fputs(header.c_str(), file);
+
+    int64_t chunks = chunkCount(spec);
+    int64_t window = 4 * omp_get_max_threads();
+    long long entries = 0;
+    for (int64_t base = 0; base < chunks; base += window) {
+        int64_t count = min(window, chunks - base);
+        vector<string> text(count);
+        vector<long long> lines(count, 0);
+#pragma omp parallel for schedule(dynamic, 1)
+        for (int64_t i = 0; i < count; ++i) {
+            generateChunk(spec, base + i, [&](int64_t u, int64_t v) {
+                // Lower triangle, 1-based.
+                appendIndex(text[i], max(u, v) + 1);
+                text[i] += ' ';
+                appendIndex(text[i], min(u, v) + 1);
+                text[i] += '\n';
+                ++lines[i];
+            });
+        }
+        for (int64_t i = 0; i < count; ++i) {
+            fwrite(text[i].data(), 1, text[i].size(), file);
+            entries += lines[i];
+        }
+    }
+    string countText = to_string(entries);
+    fseek(file, countAt, SEEK_SET);
+    fwrite(countText.data(), 1, countText.size(), file);
+    return fclose(file) == 0;
+}
+
+static bool writeCsr(const Spec &spec, const string &filename) {
+    int threads = omp_get_max_threads();
+    EdgeBuckets buckets((int)spec.n, threads);
+    int64_t chunks = chunkCount(spec);
+    long long entries = 0;
+#pragma omp parallel for schedule(dynamic, 1) reduction(+ : entries)
+    for (int64_t chunk = 0; chunk < chunks; ++chunk) {
+        int t = omp_get_thread_num();
+        generateChunk(spec, chunk, [&](int64_t u, int64_t v) {
+            buckets.add(t, (int)u, (int)v);
+            ++entries;
+        });
+    }
+    CsrGraph graph;
+    buildCsrParallel((int)spec.n, entries, buckets, graph);
+    return writeCsrFile(filename, graph);
+}
+
+int main(int argc, char *argv[]) {
+    if (argc < 4) {
+        cerr << "Usage: " << argv[0]
+             << " <rmat|er|grid2d|grid3d|path|cycle|cliques> <n> <output.mtx|output.csr>"
+                " [--degree D] [--block K] [--seed S] [--rmat a,b,c]\n";
+        return 1;
+    }
+    Spec spec;
+    spec.family = argv[1];
+    spec.n = atoll(argv[2]);
+    string output = argv[3];
+    for (int i = 4; i + 1 < argc; i += 2) {
+        string arg = argv[i];
+        if (arg == "--degree") spec.degree = atof(argv[i + 1]);
+        else if (arg == "--block") spec.block = atoll(argv[i + 1]);
+        else if (arg == "--seed") spec.seed = strtoull(argv[i + 1], nullptr, 10);
+        else if (arg == "--rmat") sscanf(argv[i + 1], "%lf,%lf,%lf", &spec.a, &spec.b, &spec.c);
+        else {
+            cerr << "Error: unknown option " << arg << "\n";
+            return 1;
+        }
+    }
+
+    const vector<string> families = {"rmat", "er", "grid2d", "grid3d", "path", "cycle", "cliques"};
+    if (find(families.begin(), families.end(), spec.family) == families.end()) {
+        cerr << "Error: unknown family " << spec.family << "\n";
+        return 1;
+    }
+    if (spec.n < 1 || spec.n > INT32_MAX || spec.block < 2) {
+        cerr << "Error: need 1 <= n < 2^31 and block >= 2\n";
+        return 1;
+    }
+    if (spec.degree < 0) spec.degree = spec.family == "cliques" ? (double)(spec.block - 1) : 8;
+    if (spec.family == "rmat") {
+        // Scrambled ids spread the high-degree vertices over the id range.
+        spec.scramble.resize(spec.n);
+        for (int64_t v = 0; v < spec.n; ++v) spec.scramble[v] = (int32_t)v;
+        Random random(spec.seed ^ 0x5851f42d4c957f2dULL);
+        for (int64_t v = spec.n - 1; v > 0; --v) swap(spec.scramble[v], spec.scramble[random.below(v + 1)]);
+    }
+
+    char description[256];
+    snprintf(description, sizeof(description), "generate %s n=%lld degree=%g block=%lld seed=%llu rmat=%g,%g,%g",
+             spec.family.c_str(), (long long)spec.n, spec.degree, (long long)spec.block, (unsigned long long)spec.seed,
+             spec.a, spec.b, spec.c);
+    bool ok = endsWith(output, ".csr") ? writeCsr(spec, output) : writeMatrixMarket(spec, output, description);
+    if (!ok) {
+        cerr << "Error: could not write " << output << "\n";
+        return 1;
+    }
+    return 0;
+}
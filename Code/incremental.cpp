@@ -0,0 +1,59 @@
+#include <iostream>
+#include <string>
+#include "block_cut_tree.h"
+#include "incremental.h"
+#include "mtx_reader.h"
+using namespace std;
+
+// Applies a batch of edge insertions to a saved block-cut tree (see
+// incremental.h) and writes the updated tree:
+//
+//   incremental <state.bct> <batch.mtx> <output.bct>
+//
+// The state comes from an engine run with --block-cut-tree or an earlier
+// update, and the batch is any graph file the engines read, with vertex ids
+// in the same numbering. Larger vertex counts in the batch add isolated
+// vertices. Prints a JSON line in the engines' format: "load" reads the
+// state, "parse"/"build" read the batch, "update" applies it and
+// "euler_tour" renumbers the result, with the count of edges that changed the
+// tree ("inserted") and of tree nodes visited ("touched").
+
+int main(int argc, char *argv[]) {
+    ios::sync_with_stdio(false);
+    if (argc != 4) {
+        cerr << "Usage: " << argv[0] << " <state.bct> <batch.mtx> <output.bct>\n";
+        return 1;
+    }
+    PhaseTimer timer;
+    BlockCutTree tree;
+    if (!tree.read(argv[1])) {
+        cerr << "Error: could not read block-cut tree " << argv[1] << endl;
+        return 1;
+    }
+    IncrementalBlockCutTree state;
+    state.load(tree);
+    timer.mark("load");
+
+    CsrGraph batch;
+    if (!loadGraph(argv[2], batch, &timer)) {
+        cerr << "Error: could not open " << argv[2] << endl;
+        return 1;
+    }
+    state.growTo(batch.n);
+    for (int v = 0; v < batch.n; ++v)
+        for (const int32_t *it = batch.begin(v); it != batch.end(v); ++it)
+            if (*it > v) state.insert(v, *it);
+    timer.mark("update");
+
+    state.exportTree(tree);
+    timer.mark("euler_tour");
+    if (!tree.write(argv[3])) {
+        cerr << "Error: could not write " << argv[3] << endl;
+        return 1;
+    }
+    timer.mark("output");
+    string extra = ",\"batch_edges\":" + to_string(batch.nnz() / 2) + ",\"inserted\":" + to_string(state.inserted) +
+                   ",\"touched\":" + to_string(state.touched);
+    cout << timer.json("incremental", tree.n, batch.m, extra) << '\n';
+    return 0;
+}
@@ -0,0 +1,340 @@
+#ifndef INCREMENTAL_H
+#define INCREMENTAL_H
+
+#include <algorithm>
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+#include "block_cut_tree.h"
+
+// Insert-only maintenance of a block-cut tree (block_cut_tree.h) without the
+// graph. The forest is kept as parent pointers over growable node arrays;
+// blocks that merge are joined in a union-find, and the representative holds
+// the merged block's parent and smallest edge. Inserting (u, v):
+//   - inside one block: only that block's smallest edge can change;
+//   - across blocks of one tree: every block on the tree path between u's and
+//     v's nodes merges into one, and a cut node inside the path that has no
+//     other block left stops being an articulation point;
+//   - across trees (or at an isolated vertex): the edge is a new bridge block,
+//     and the smaller tree is re-rooted at its endpoint and hung below it.
+// The path is found by climbing from both ends in lockstep until one side
+// meets a node the other marked, so an insertion costs the length of the
+// paths it touches, not m. export() renumbers the surviving nodes exactly as
+// BlockCutTree::build() numbers a full run, so the result can be compared
+// byte for byte with recomputation from scratch.
+
+// Union-find whose sets can be added one at a time; unite() keeps the first
+// argument's root.
+struct GrowableDSU {
+    std::vector<int32_t> par;
+
+    int32_t add() {
+        par.push_back((int32_t)par.size());
+        return par.back();
+    }
+
+    int32_t find(int32_t x) {
+        while (par[x] != x) {
+            par[x] = par[par[x]];
+            x = par[x];
+        }
+        return x;
+    }
+
+    int32_t unite(int32_t keep, int32_t other) {
+        keep = find(keep);
+        other = find(other);
+        par[other] = keep;
+        return keep;
+    }
+};
+
+struct IncrementalBlockCutTree {
+    // Per node. up is the parent as stored: a block's parent is a cut node,
+    // a cut node's parent is any block of a merged set (resolved by find).
+    std::vector<char> isBlock, alive;
+    std::vector<int32_t> up, cutOf, cutDegree;
+    std::vector<int64_t> key;  // blocks: smallest edge, (u << 32) | v with u < v
+    GrowableDSU merged;        // blocks merged into one
+    GrowableDSU components;    // nodes of one tree
+    std::vector<int64_t> componentSize;
+    std::vector<int32_t> vertexNode;
+
+    // Lockstep climb state: the path from each end and which side reached a node.
+    std::vector<int32_t> markA, markB, posA, posB, pathA, pathB;
+    int32_t stampID = 0;
+
+    int64_t inserted = 0;  // edges that changed the tree or a block's smallest edge
+    int64_t touched = 0;   // nodes visited by path climbs and re-rooting
+
+    void load(const BlockCutTree &tree) {
+        int64_t nodes = tree.numBlocks + tree.numCuts;
+        isBlock.assign(nodes, 0);
+        alive.assign(nodes, 1);
+        up.assign(tree.parent.begin(), tree.parent.end());
+        cutOf.assign(nodes, -1);
+        cutDegree.assign(nodes, 0);
+        key.assign(nodes, 0);
+        merged.par.resize(nodes);
+        components.par.resize(nodes);
+        componentSize.assign(nodes, 0);
+        for (int64_t x = 0; x < nodes; ++x) {
+            merged.par[x] = (int32_t)x;
+            components.par[x] = tree.root[x];
+            ++componentSize[tree.root[x]];
+            if (x < tree.numBlocks) {
+                isBlock[x] = 1;
+                key[x] = tree.blockEdge[x];
+            } else {
+                cutOf[x] = tree.cutVertex[x - tree.numBlocks];
+            }
+        }
+        for (int64_t x = 0; x < nodes; ++x) {
+            int32_t p = tree.parent[x];
+            if (p < 0) continue;
+            ++cutDegree[isBlock[x] ? p : x];
+        }
+        vertexNode = tree.vertexNode;
+        markA.assign(nodes, 0);
+        markB.assign(nodes, 0);
+        posA.assign(nodes, 0);
+        posB.assign(nodes, 0);
+    }
+
+    int32_t addNode(bool block, int32_t vertex) {
+        isBlock.push_back(block);
+        alive.push_back(1);
+        up.push_back(-1);
+        cutOf.push_back(block ? -1 : vertex);
+        cutDegree.push_back(0);
+        key.push_back(0);
+        merged.add();
+        componentSize.push_back(1);
+        markA.push_back(0);
+        markB.push_back(0);
+        posA.push_back(0);
+        posB.push_back(0);
+        return components.add();
+    }
+
+    // The vertex's node (a cut node or a block's representative), or -1 if isolated.
+    int32_t nodeOf(int32_t v) {
+        int32_t x = vertexNode[v];
+        return x < 0 || !isBlock[x] ? x : merged.find(x);
+    }
+
+    int32_t parentOf(int32_t x) {
+        int32_t p = up[x];
+        return p < 0 || !isBlock[p] ? p : merged.find(p);
+    }
+
+    void join(int32_t a, int32_t b) {
+        a = components.find(a);
+        b = components.find(b);
+        if (a == b) return;
+        if (componentSize[a] < componentSize[b]) std::swap(a, b);
+        components.unite(a, b);
+        componentSize[a] += componentSize[b];
+    }
+
+    // New vertices start isolated.
+    void growTo(int64_t n) {
+        if (n > (int64_t)vertexNode.size()) vertexNode.resize(n, -1);
+    }
+
+    void insert(int32_t u, int32_t v) {
+        if (u == v) return;
+        if (u > v) std::swap(u, v);
+        growTo((int64_t)v + 1);
+        int64_t edge = (int64_t)u << 32 | v;
+        int32_t a = nodeOf(u), b = nodeOf(v);
+        if (a < 0 || b < 0 || components.find(a) != components.find(b)) {
+            link(u, a, v, b, edge);
+        } else if (a == b) {
+            if (edge < key[a]) {
+                key[a] = edge;
+                ++inserted;
+            }
+        } else {
+            mergePath(a, b, edge);
+        }
+    }
+
+    // New bridge block between two trees (or isolated vertices).
+    void link(int32_t u, int32_t a, int32_t v, int32_t b, int64_t edge) {
+        ++inserted;
+        // (x, nx) is the side that gets re-rooted: the smaller tree.
+        int64_t sizeA = a < 0 ? 0 : componentSize[components.find(a)];
+        int64_t sizeB = b < 0 ? 0 : componentSize[components.find(b)];
+        int32_t x = u, nx = a, y = v, ny = b;
+        if (sizeA > sizeB) {
+            std::swap(x, y);
+            std::swap(nx, ny);
+        }
+        int32_t bridge = addNode(true, -1);
+        key[bridge] = edge;
+
+        if (ny < 0) {
+            vertexNode[y] = bridge;
+        } else {
+            up[bridge] = attachCut(y, ny, -1);
+            join(bridge, ny);
+        }
+        if (nx < 0) {
+            vertexNode[x] = bridge;
+        } else {
+            reroot(nx);
+            int32_t cut = attachCut(x, nx, bridge);
+            if (cut != nx) up[nx] = cut;
+            join(bridge, nx);
+        }
+    }
+
+    // The cut node of vertex w (node nw) for a new block, made a child of
+    // parent: an existing cut node gains a block; a vertex in one block
+    // becomes an articulation point with a new cut node below that block
+    // (parent -1) or above it.
+    int32_t attachCut(int32_t w, int32_t nw, int32_t parent) {
+        if (!isBlock[nw]) {
+            ++cutDegree[nw];
+            if (parent >= 0) up[nw] = parent;
+            return nw;
+        }
+        int32_t cut = addNode(false, w);
+        cutDegree[cut] = 2;
+        up[cut] = parent >= 0 ? parent : nw;
+        vertexNode[w] = cut;
+        join(cut, nw);
+        return cut;
+    }
+
+    // Reverses the parent pointers from x to its root, making x the root.
+    void reroot(int32_t x) {
+        int32_t previous = -1;
+        while (x >= 0) {
+            int32_t next = parentOf(x);
+            up[x] = previous;
+            previous = x;
+            x = next;
+            ++touched;
+        }
+    }
+
+    void mergePath(int32_t a, int32_t b, int64_t edge) {
+        ++stampID;
+        pathA.assign(1, a);
+        pathB.assign(1, b);
+        markA[a] = stampID;
+        posA[a] = 0;
+        markB[b] = stampID;
+        posB[b] = 0;
+        // Each side stops short of the lca, which is the first node one side finds marked by the other.
+        int32_t lca = -1;
+        for (int32_t x = a, y = b; lca < 0;) {
+            if (x >= 0 && (x = parentOf(x)) >= 0) {
+                if (markB[x] == stampID) {
+                    lca = x;
+                    pathB.resize(posB[x]);
+                    break;
+                }
+                markA[x] = stampID;
+                posA[x] = (int32_t)pathA.size();
+                pathA.push_back(x);
+            }
+            if (y >= 0 && (y = parentOf(y)) >= 0) {
+                if (markA[y] == stampID) {
+                    lca = y;
+                    pathA.resize(posA[y]);
+                    break;
+                }
+                markB[y] = stampID;
+                posB[y] = (int32_t)pathB.size();
+                pathB.push_back(y);
+            }
+        }
+        touched += pathA.size() + pathB.size() + 1;
+
+        // The path a .. lca .. b; its cut nodes other than a and b are the separators.
+        std::vector<int32_t> &path = pathA;
+        path.push_back(lca);
+        path.insert(path.end(), pathB.rbegin(), pathB.rend());
+        int32_t separators = 0;
+        for (size_t i = 1; i + 1 < path.size(); ++i) separators += !isBlock[path[i]];
+        if (separators == 0) {
+            // u and v already share the one block on the path.
+            for (int32_t x : path)
+                if (isBlock[x] && edge < key[x]) {
+                    key[x] = edge;
+                    ++inserted;
+                }
+            return;
+        }
+
+        ++inserted;
+        int32_t above = isBlock[lca] ? parentOf(lca) : lca;
+        int32_t block = -1;
+        int64_t smallest = edge;
+        for (int32_t x : path) {
+            if (!isBlock[x]) continue;
+            smallest = std::min(smallest, key[x]);
+            block = block < 0 ? x : merged.unite(block, x);
+        }
+        key[block] = smallest;
+        for (size_t i = 1; i + 1 < path.size(); ++i) {
+            int32_t c = path[i];
+            if (isBlock[c] || --cutDegree[c] > 1) continue;
+            // Only the merged block is left: c is no longer an articulation point.
+            alive[c] = 0;
+            vertexNode[cutOf[c]] = block;
+            if (c == above) above = -1;
+        }
+        up[block] = above;
+    }
+
+    // The maintained forest in BlockCutTree's numbering: blocks by smallest
+    // edge, cut nodes by vertex, then the Euler tour.
+    void exportTree(BlockCutTree &tree) {
+        int64_t nodes = isBlock.size();
+        std::vector<std::pair<int64_t, int32_t>> blocks, cuts;
+        for (int64_t x = 0; x < nodes; ++x) {
+            if (isBlock[x] && merged.find((int32_t)x) == x)
+                blocks.emplace_back(key[x], (int32_t)x);
+            else if (!isBlock[x] && alive[x])
+                cuts.emplace_back(cutOf[x], (int32_t)x);
+        }
+        std::sort(blocks.begin(), blocks.end());
+        std::sort(cuts.begin(), cuts.end());
+        std::vector<int32_t> newId(nodes, -1);
+        tree.n = vertexNode.size();
+        tree.numBlocks = blocks.size();
+        tree.numCuts = cuts.size();
+        tree.blockEdge.resize(blocks.size());
+        for (size_t i = 0; i < blocks.size(); ++i) {
+            tree.blockEdge[i] = blocks[i].first;
+            newId[blocks[i].second] = (int32_t)i;
+        }
+        tree.cutVertex.resize(cuts.size());
+        for (size_t i = 0; i < cuts.size(); ++i) {
+            tree.cutVertex[i] = cuts[i].first;
+            newId[cuts[i].second] = (int32_t)(blocks.size() + i);
+        }
+        tree.vertexNode.resize(vertexNode.size());
+        for (size_t v = 0; v < vertexNode.size(); ++v) {
+            int32_t x = nodeOf((int32_t)v);
+            tree.vertexNode[v] = x < 0 ? -1 : newId[x];
+        }
+
+        std::vector<std::vector<int32_t>> cutBlocks(cuts.size());
+        for (int32_t x = 0; x < nodes; ++x) {
+            int32_t p = newId[x] < 0 ? -1 : parentOf(x);
+            if (p < 0) continue;
+            int32_t cut = isBlock[x] ? p : x, block = isBlock[x] ? x : p;
+            cutBlocks[newId[cut] - blocks.size()].push_back(newId[block]);
+        }
+        for (auto &list : cutBlocks) std::sort(list.begin(), list.end());
+        tree.linkCuts(cutBlocks);
+    }
+};
+
+#endif
@@ -0,0 +1,486 @@
+#ifndef MTX_READER_H
+#define MTX_READER_H
+
+#include <algorithm>
+#include <atomic>
+#include <cctype>
+#include <cerrno>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <sstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "csr_graph.h"
+#include "parallel_util.h"
+#include "phase_timer.h"
+
+#ifdef __linux__
+#include <fcntl.h>
+#include <spawn.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <sys/wait.h>
+#include <unistd.h>
+extern char **environ;
+#endif
+
+// Parallel Matrix Market reader. The file is mapped read-only and the data
+// lines are split at newline boundaries into one chunk per thread. Each thread
+// scans its chunk with a hand-written index scanner that ignores everything
+// after the first two columns (real, integer or complex values), and the
+// entries are bucketed by row range. The symmetric CSR is then built in two
+// parallel passes, degree counts and fill, where each thread owns a range of
+// rows and so needs no atomics. Rows are sorted and deduplicated in parallel.
+//
+// Compressed inputs (.mtx.gz, .mtx.zst, and .tar.gz/.tar.zst archives) are
+// streamed from a gzip, zstd or tar child process. Decompression in the child
+// overlaps with parsing: one thread reads fixed-size blocks from the pipe and
+// cuts them at a newline, and each block becomes an OpenMP task that scans it.
+// Nothing is extracted to disk.
+
+// "%%MatrixMarket matrix coordinate <field> <symmetry>" plus the size line.
+// Files without a banner are read as "coordinate real general".
+struct MatrixMarketHeader {
+    std::string format = "coordinate";
+    std::string field = "real";
+    std::string symmetry = "general";
+    long long rows = 0, cols = 0, entries = 0;
+    size_t dataStart = 0;  // byte offset of the first line after the size line
+};
+
+// A whole file as one read-only byte range: mapped on Linux, read elsewhere.
+struct FileBytes {
+    const char *data = nullptr;
+    size_t size = 0;
+    void *mapBase = nullptr;
+    std::vector<char> buffer;
+
+    FileBytes() = default;
+    FileBytes(const FileBytes &) = delete;
+    FileBytes &operator=(const FileBytes &) = delete;
+    ~FileBytes() {
+#ifdef __linux__
+        if (mapBase) munmap(mapBase, size);
+#endif
+    }
+
+    bool open(const std::string &filename) {
+#ifdef __linux__
+        int fd = ::open(filename.c_str(), O_RDONLY);
+        if (fd < 0) return false;
+        struct stat st;
+        if (fstat(fd, &st) != 0) {
+            close(fd);
+            return false;
+        }
+        size = (size_t)st.st_size;
+        if (size > 0) {
+            void *base = mmap(nullptr, size, PROT_READ, MAP_PRIVATE, fd, 0);
+            if (base == MAP_FAILED) {
+                close(fd);
+                return false;
+            }
+            mapBase = base;
+            data = static_cast<const char *>(base);
+        }
+        close(fd);
+        return true;
+#else
+        std::ifstream file(filename, std::ios::binary);
+        if (!file) return false;
+        buffer.assign(std::istreambuf_iterator<char>(file), std::istreambuf_iterator<char>());
+        data = buffer.data();
+        size = buffer.size();
+        return true;
+#endif
+    }
+};
+
+inline std::string lowercase(std::string s) {
+    for (char &c : s) c = (char)std::tolower((unsigned char)c);
+    return s;
+}
+
+// Parses the banner, comments and size line. Returns false for array files,
+// unknown fields or symmetries, and a missing size line.
+inline bool parseMatrixMarketHeader(const char *data, size_t size, MatrixMarketHeader &header) {
+    size_t pos = 0;
+    bool first = true;
+    while (pos < size) {
+        const char *eol = static_cast<const char *>(memchr(data + pos, '\n', size - pos));
+        size_t next = eol ? (size_t)(eol - data) + 1 : size;
+        std::string line(data + pos, next - pos);
+        pos = next;
+        if (first && line.compare(0, 14, "%%MatrixMarket") == 0) {
+            std::stringstream ss(line.substr(14));
+            std::string object;
+            ss >> object >> header.format >> header.field >> header.symmetry;
+            header.format = lowercase(header.format);
+            header.field = lowercase(header.field);
+            header.symmetry = lowercase(header.symmetry);
+            if (lowercase(object) != "matrix" || header.format != "coordinate") return false;
+            if (header.field != "real" && header.field != "integer" && header.field != "pattern" &&
+                header.field != "complex")
+                return false;
+            if (header.symmetry != "general" && header.symmetry != "symmetric" && header.symmetry != "skew-symmetric" &&
+                header.symmetry != "hermitian")
+                return false;
+        }
+        first = false;
+        if (line.find_first_not_of(" \t\r\n") == std::string::npos || line[0] == '%') continue;
+        std::stringstream ss(line);
+        if (!(ss >> header.rows >> header.cols >> header.entries)) return false;
+        header.dataStart = pos;
+        return true;
+    }
+    return false;
+}
+
+// Reads a decimal index at p after skipping blanks. Leaves p after the digits.
+inline bool scanIndex(const char *&p, const char *end, int64_t &value) {
+    while (p < end && (*p == ' ' || *p == '\t')) ++p;
+    if (p == end || *p < '0' || *p > '9') return false;
+    value = 0;
+    while (p < end && *p >= '0' && *p <= '9') value = value * 10 + (*p++ - '0');
+    return true;
+}
+
+// Parsed entries in both directions, split by row range so that each build
+// thread owns whole rows: lists[t * count + b] holds the entries thread t read
+// whose row falls in bucket b.
+struct EdgeBuckets {
+    int n = 0;
+    int count = 1;
+    std::vector<std::vector<std::pair<int32_t, int32_t>>> lists;
+
+    EdgeBuckets(int n, int threads) : n(n), count(threads), lists((size_t)threads * threads) {}
+
+    int bucketOf(int v) const { return (int)((int64_t)v * count / n); }
+    int rowStart(int b) const { return (int)(((int64_t)b * n + count - 1) / count); }
+
+    void add(int t, int u, int v) {
+        lists[(size_t)t * count + bucketOf(u)].emplace_back(u, v);
+        lists[(size_t)t * count + bucketOf(v)].emplace_back(v, u);
+    }
+};
+
+// Scans the data lines in [begin, end) into thread t's buckets, skipping blank
+// and comment lines and dropping self-loops. Returns false on a malformed
+// line or an index outside [1, n].
+inline bool scanEntries(const char *begin, const char *end, EdgeBuckets &buckets, int t) {
+    const char *p = begin;
+    while (p < end) {
+        const char *eol = static_cast<const char *>(memchr(p, '\n', end - p));
+        const char *lineEnd = eol ? eol : end;
+        const char *q = p;
+        while (q < lineEnd && (*q == ' ' || *q == '\t' || *q == '\r')) ++q;
+        if (q < lineEnd && *q != '%') {
+            int64_t u, v;
+            if (!scanIndex(q, lineEnd, u) || !scanIndex(q, lineEnd, v)) return false;
+            if (u < 1 || u > buckets.n || v < 1 || v > buckets.n) return false;
+            if (u != v) buckets.add(t, (int)(u - 1), (int)(v - 1));
+        }
+        p = lineEnd + 1;
+    }
+    return true;
+}
+
+// Builds a symmetric, deduplicated CSR from the buckets in two parallel
+// passes, degree counts then fill, with each thread writing only its own rows.
+// The buckets are emptied on the way.
+inline void buildCsrParallel(int n, long long m, EdgeBuckets &buckets, CsrGraph &graph) {
+    graph.release();
+    graph.n = n;
+    graph.m = m;
+    int count = buckets.count;
+
+    std::vector<int64_t> base(count + 1, 0);
+    for (int b = 0; b < count; ++b)
+        for (int t = 0; t < count; ++t) base[b + 1] += buckets.lists[(size_t)t * count + b].size();
+    for (int b = 0; b < count; ++b) base[b + 1] += base[b];
+
+    std::vector<int64_t> &offsets = graph.ownedOffsets;
+    offsets.assign(n + 1, 0);
+    std::vector<int32_t> adj(base[count]);
+    std::vector<int64_t> fill(n);
+#pragma omp parallel for schedule(dynamic, 1)
+    for (int b = 0; b < count; ++b) {
+        int lo = buckets.rowStart(b), hi = buckets.rowStart(b + 1);
+        for (int t = 0; t < count; ++t)
+            for (const auto &entry : buckets.lists[(size_t)t * count + b]) ++offsets[entry.first];
+        int64_t running = base[b];
+        for (int v = lo; v < hi; ++v) {
+            int64_t degree = offsets[v];
+            offsets[v] = fill[v] = running;
+            running += degree;
+        }
+        for (int t = 0; t < count; ++t) {
+            auto &list = buckets.lists[(size_t)t * count + b];
+            for (const auto &entry : list) adj[fill[entry.first]++] = entry.second;
+            std::vector<std::pair<int32_t, int32_t>>().swap(list);
+        }
+    }
+    offsets[n] = base[count];
+
+    // Sort and compact each row where it is, then pack the rows together.
+    std::vector<int64_t> &kept = fill;
+    kept.resize(n + 1);
+#pragma omp parallel for schedule(dynamic, 1024)
+    for (int v = 0; v < n; ++v) {
+        int32_t *lo = adj.data() + offsets[v], *hi = adj.data() + offsets[v + 1];
+        std::sort(lo, hi);
+        kept[v] = std::unique(lo, hi) - lo;
+    }
+    kept[n] = 0;
+    int64_t total = exclusiveScan(kept);
+
+    std::vector<int32_t> &packed = graph.ownedAdj;
+    packed.resize(total);
+#pragma omp parallel for schedule(dynamic, 1024)
+    for (int v = 0; v < n; ++v)
+        std::copy(adj.begin() + offsets[v], adj.begin() + offsets[v] + (kept[v + 1] - kept[v]), packed.begin() + kept[v]);
+    offsets.swap(kept);
+
+    graph.offsets = offsets.data();
+    graph.adj = packed.data();
+}
+
+// Parse a Matrix Market coordinate file (1-based indices, any value field).
+// The storage type does not matter: every entry becomes an undirected edge.
+inline bool readMatrixMarket(const std::string &filename, CsrGraph &graph, PhaseTimer *timer = nullptr) {
+    FileBytes file;
+    MatrixMarketHeader header;
+    if (!file.open(filename) || !parseMatrixMarketHeader(file.data, file.size, header)) return false;
+    int64_t n = std::max(header.rows, header.cols);
+
+    // Chunk t starts at the first line beginning at or after its even split point.
+    int threads = omp_get_max_threads();
+    size_t dataBytes = file.size - header.dataStart;
+    std::vector<size_t> bounds(threads + 1);
+    for (int t = 0; t <= threads; ++t) {
+        size_t pos = header.dataStart + dataBytes * t / threads;
+        if (t > 0 && t < threads && file.data[pos - 1] != '\n') {
+            const char *eol = static_cast<const char *>(memchr(file.data + pos, '\n', file.size - pos));
+            pos = eol ? (size_t)(eol - file.data) + 1 : file.size;
+        }
+        bounds[t] = pos;
+    }
+
+    EdgeBuckets buckets((int)n, threads);
+    bool ok = true;
+#pragma omp parallel for schedule(static, 1) reduction(&& : ok)
+    for (int t = 0; t < threads; ++t) {
+        size_t lo = bounds[t], hi = std::max(bounds[t], bounds[t + 1]);
+        // Assumes rows are spread evenly; a skewed graph only pays for regrowth.
+        size_t expected = dataBytes ? (size_t)(2 * header.entries * ((double)(hi - lo) / dataBytes) / threads) : 0;
+        for (int b = 0; b < threads; ++b) buckets.lists[(size_t)t * threads + b].reserve(expected);
+        ok = scanEntries(file.data + lo, file.data + hi, buckets, t) && ok;
+    }
+    if (!ok) return false;
+    if (timer) timer->mark("parse");
+    buildCsrParallel((int)n, header.entries, buckets, graph);
+    if (timer) timer->mark("build");
+    return true;
+}
+
+inline bool endsWith(const std::string &s, const std::string &suffix) {
+    return s.size() >= suffix.size() && s.compare(s.size() - suffix.size(), suffix.size(), suffix) == 0;
+}
+
+// Command that writes a compressed input's Matrix Market text to stdout, or
+// empty for a plain file. An archive yields the member named after it, as
+// SuiteSparse ships Name/Name.mtx inside Name.tar.gz; tar detects the compression.
+inline std::vector<std::string> decompressCommand(const std::string &filename) {
+    std::string base = filename.substr(filename.find_last_of('/') + 1);
+    for (const char *suffix : {".tar.gz", ".tgz", ".tar.zst", ".tar"}) {
+        if (endsWith(base, suffix)) {
+            std::string member = base.substr(0, base.size() - strlen(suffix)) + ".mtx";
+            return {"tar", "-xOf", filename, "--wildcards", "--no-anchored", member};
+        }
+    }
+    if (endsWith(base, ".gz")) return {"gzip", "-dc", "--", filename};
+    if (endsWith(base, ".zst")) return {"zstd", "-dcq", "--", filename};
+    return {};
+}
+
+// The stdout of a child process, read through a pipe.
+struct DecompressorPipe {
+    int pid = -1;
+    int fd = -1;
+
+    DecompressorPipe() = default;
+    DecompressorPipe(const DecompressorPipe &) = delete;
+    DecompressorPipe &operator=(const DecompressorPipe &) = delete;
+    ~DecompressorPipe() { finish(); }
+
+    bool open(const std::vector<std::string> &command) {
+#ifdef __linux__
+        int fds[2];
+        if (pipe(fds) != 0) return false;
+        posix_spawn_file_actions_t actions;
+        posix_spawn_file_actions_init(&actions);
+        posix_spawn_file_actions_adddup2(&actions, fds[1], STDOUT_FILENO);
+        posix_spawn_file_actions_addclose(&actions, fds[0]);
+        posix_spawn_file_actions_addclose(&actions, fds[1]);
+        std::vector<char *> argv;
+        for (const std::string &arg : command) argv.push_back(const_cast<char *>(arg.c_str()));
+        argv.push_back(nullptr);
+        pid_t child;
+        int rc = posix_spawnp(&child, argv[0], &actions, nullptr, argv.data(), environ);
+        posix_spawn_file_actions_destroy(&actions);
+        close(fds[1]);
+        if (rc != 0) {
+            close(fds[0]);
+            return false;
+        }
+        pid = child;
+        fd = fds[0];
+        return true;
+#else
+        (void)command;
+        return false;
+#endif
+    }
+
+    // Fills buf unless the stream ends first; returns the byte count, or -1 on error.
+    long long read(char *buf, size_t size) {
+        size_t got = 0;
+#ifdef __linux__
+        while (got < size) {
+            ssize_t r = ::read(fd, buf + got, size - got);
+            if (r < 0 && errno == EINTR) continue;
+            if (r < 0) return -1;
+            if (r == 0) break;
+            got += (size_t)r;
+        }
+#else
+        (void)buf;
+        (void)size;
+#endif
+        return (long long)got;
+    }
+
+    // Closes the pipe and reaps the child; true if it exited with status 0.
+    bool finish() {
+#ifdef __linux__
+        if (fd >= 0) close(fd);
+        fd = -1;
+        if (pid < 0) return false;
+        int status = 0;
+        while (waitpid(pid, &status, 0) < 0 && errno == EINTR) {
+        }
+        pid = -1;
+        return WIFEXITED(status) && WEXITSTATUS(status) == 0;
+#else
+        return false;
+#endif
+    }
+};
+
+// Byte offset just past the size line, or 0 while it is not complete yet.
+inline size_t sizeLineEnd(const char *data, size_t size) {
+    size_t pos = 0;
+    while (const char *eol = static_cast<const char *>(memchr(data + pos, '\n', size - pos))) {
+        size_t next = (size_t)(eol - data) + 1;
+        size_t first = pos;
+        while (first < next && (data[first] == ' ' || data[first] == '\t' || data[first] == '\r')) ++first;
+        if (data[first] != '\n' && data[pos] != '%') return next;
+        pos = next;
+    }
+    return 0;
+}
+
+// Parse a compressed Matrix Market file streamed from command's stdout. The
+// compressed and decompressed sizes and the seconds until the stream ended are
+// noted on the timer.
+inline bool readMatrixMarketStream(const std::string &filename, const std::vector<std::string> &command, CsrGraph &graph,
+                                   PhaseTimer *timer = nullptr) {
+    const size_t blockBytes = 4 << 20;
+    PhaseTimer::Clock::time_point started = PhaseTimer::Clock::now();
+    DecompressorPipe pipe;
+    if (!pipe.open(command)) return false;
+
+    std::string head;
+    while (!sizeLineEnd(head.data(), head.size())) {
+        size_t old = head.size();
+        head.resize(old + (1 << 16));
+        long long got = pipe.read(&head[old], 1 << 16);
+        head.resize(old + std::max(got, 0LL));
+        if (got <= 0) break;
+    }
+    MatrixMarketHeader header;
+    if (!parseMatrixMarketHeader(head.data(), head.size(), header)) return false;
+    int64_t n = std::max(header.rows, header.cols);
+
+    int threads = omp_get_max_threads();
+    EdgeBuckets buckets((int)n, threads);
+    std::atomic<bool> ok(true);
+    long long decompressed = (long long)head.size();
+    std::string carry = head.substr(header.dataStart);
+#pragma omp parallel
+#pragma omp single
+    {
+        int inFlight = 0;
+        bool done = false;
+        while (!done && ok) {
+            std::string *block = new std::string(std::move(carry));
+            size_t old = block->size();
+            block->resize(old + blockBytes);
+            long long got = pipe.read(&(*block)[old], blockBytes);
+            if (got < 0) ok = false;
+            got = std::max(got, 0LL);
+            decompressed += got;
+            block->resize(old + got);
+            done = got < (long long)blockBytes;
+            carry.clear();
+            if (!done) {
+                // The partial last line goes to the next block.
+                size_t cut = block->rfind('\n') + 1;
+                carry.assign(*block, cut, std::string::npos);
+                block->resize(cut);
+            }
+#pragma omp task firstprivate(block)
+            {
+                if (!scanEntries(block->data(), block->data() + block->size(), buckets, omp_get_thread_num())) ok = false;
+                delete block;
+            }
+            // Bound the decompressed text held in memory.
+            if (++inFlight >= 4 * threads) {
+#pragma omp taskwait
+                inFlight = 0;
+            }
+        }
+    }
+    double seconds = std::chrono::duration<double>(PhaseTimer::Clock::now() - started).count();
+    if (!pipe.finish() || !ok) return false;
+
+    if (timer) {
+        std::ifstream file(filename, std::ios::binary | std::ios::ate);
+        timer->note("compressed_bytes", (double)file.tellg());
+        timer->note("decompressed_bytes", (double)decompressed);
+        timer->note("stream_seconds", seconds);
+        timer->mark("parse");
+    }
+    buildCsrParallel((int)n, header.entries, buckets, graph);
+    if (timer) timer->mark("build");
+    return true;
+}
+
+// Load a binary CSR cache (by magic), a compressed Matrix Market file (by
+// suffix) or a plain one. Mapping a cache file is charged to the "parse" phase.
+inline bool loadGraph(const std::string &filename, CsrGraph &graph, PhaseTimer *timer = nullptr) {
+    if (isCsrFile(filename)) {
+        bool ok = mapCsrFile(filename, graph);
+        if (timer) timer->mark("parse");
+        return ok;
+    }
+    std::vector<std::string> command = decompressCommand(filename);
+    if (!command.empty()) return readMatrixMarketStream(filename, command, graph, timer);
+    return readMatrixMarket(filename, graph, timer);
+}
+
+#endif
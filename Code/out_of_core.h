@@ -0,0 +1,274 @@
+#ifndef OUT_OF_CORE_H
+#define OUT_OF_CORE_H
+
+#include <algorithm>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <vector>
+
+#include "csr_graph.h"
+#include "phase_timer.h"
+
+// Memory-capped Tarjan-Vishkin for graphs whose per-edge arrays do not fit in
+// RAM. Only compact per-vertex int32 arrays are held in memory; the adjacency
+// stays in the mapped CSR file and is read in sequential passes, one window at
+// a time, with each window's pages dropped from the process once the pass has
+// moved on. Nothing is stored per edge:
+//   - the spanning forest comes from a union-find pass over the edges, so it
+//     needs no random access to adjacency, and is rooted and numbered in
+//     preorder in memory (pre, nd, parent);
+//   - a pass over the non-tree edges gives each vertex's own low/high, which
+//     are then folded into subtree minima/maxima in reverse preorder;
+//   - the auxiliary graph only links tree edges, so its union-find is indexed
+//     by each tree edge's child vertex. A non-tree edge belongs to the block of
+//     the tree edge above its endpoint with the larger preorder number.
+// The per-edge labels are then streamed to a file in edge id order, numbered
+// by first appearance, as the other engines number BCCs.
+
+// Resident set size of this process, in bytes.
+inline int64_t currentRssBytes() {
+#ifdef __linux__
+    long pages = 0, resident = 0;
+    FILE *statm = fopen("/proc/self/statm", "r");
+    if (!statm) return 0;
+    if (fscanf(statm, "%ld %ld", &pages, &resident) != 2) resident = 0;
+    fclose(statm);
+    return (int64_t)resident * sysconf(_SC_PAGESIZE);
+#else
+    return 0;
+#endif
+}
+
+// Sequential passes over a graph in windows of about windowBytes of offsets
+// and adjacency. For a mapped graph the pages of each finished window are
+// dropped with MADV_DONTNEED; they are clean file pages, so a later pass
+// faults them back in from the page cache or the disk.
+struct CsrWindows {
+    const CsrGraph &g;
+    int64_t windowBytes;
+
+    CsrWindows(const CsrGraph &graph, int64_t bytes) : g(graph), windowBytes(std::max<int64_t>(bytes, 1 << 16)) {
+#ifdef __linux__
+        if (g.mapBase) madvise(g.mapBase, g.mapSize, MADV_SEQUENTIAL);
+#endif
+    }
+
+    // Calls visit(v) for every vertex in order.
+    template <class Visit>
+    void scan(Visit visit) const {
+        const char *offsetsDone = reinterpret_cast<const char *>(g.offsets);
+        const char *adjDone = reinterpret_cast<const char *>(g.adj);
+        int64_t maxEntries = windowBytes / 2 / sizeof(int32_t), maxVertices = windowBytes / 2 / sizeof(int64_t);
+        for (int lo = 0; lo < g.n;) {
+            const int64_t *limit = std::upper_bound(g.offsets + lo + 1, g.offsets + g.n + 1, g.offsets[lo] + maxEntries);
+            int hi = (int)std::min<int64_t>(std::min<int64_t>(limit - g.offsets - 1, lo + maxVertices), g.n);
+            hi = std::max(hi, lo + 1);
+            for (int v = lo; v < hi; ++v) visit(v);
+            release(offsetsDone, reinterpret_cast<const char *>(g.offsets + hi));
+            release(adjDone, reinterpret_cast<const char *>(g.adj + g.offsets[hi]));
+            lo = hi;
+        }
+    }
+
+    // Drops the whole pages in [done, end) and advances done past them.
+    void release(const char *&done, const char *end) const {
+#ifdef __linux__
+        if (!g.mapBase) return;
+        uintptr_t page = sysconf(_SC_PAGESIZE);
+        uintptr_t from = (reinterpret_cast<uintptr_t>(done) + page - 1) & ~(page - 1);
+        uintptr_t to = reinterpret_cast<uintptr_t>(end) & ~(page - 1);
+        if (to <= from) return;
+        madvise(reinterpret_cast<void *>(from), to - from, MADV_DONTNEED);
+        done = reinterpret_cast<const char *>(to);
+#else
+        (void)done;
+        (void)end;
+#endif
+    }
+};
+
+struct TarjanVishkinCapped {
+    // Upper bound on the bytes per vertex the arrays below hold at any one time.
+    static const int64_t BYTES_PER_VERTEX = 32;
+
+    const CsrGraph &g;
+    CsrWindows windows;
+    PhaseTimer *timer = nullptr;
+
+    std::vector<int32_t> parent, pre, nd, low, high;
+    // Union-find over tree edges, each named by its child vertex.
+    std::vector<int32_t> blocks;
+    int64_t numBlocks = 0, numArticulation = 0;
+
+    TarjanVishkinCapped(const CsrGraph &graph, int64_t windowBytes) : g(graph), windows(graph, windowBytes) {}
+
+    static int32_t find(std::vector<int32_t> &par, int32_t x) {
+        while (par[x] != x) {
+            par[x] = par[par[x]];
+            x = par[x];
+        }
+        return x;
+    }
+
+    bool isTreeEdge(int v, int u) const { return parent[u] == v || parent[v] == u; }
+
+    // The union-find set holding edge {v, u}.
+    int32_t blockOf(int v, int u) {
+        if (parent[u] == v) return find(blocks, u);
+        if (parent[v] == u) return find(blocks, v);
+        return find(blocks, pre[u] > pre[v] ? u : v);
+    }
+
+    void mark(const char *phase) {
+        if (timer) timer->mark(phase);
+    }
+
+    void run() {
+        int n = g.n;
+        spanningForest();
+        mark("spanning_tree");
+
+        // Each vertex's own low/high over its non-tree edges, then subtree
+        // sizes and low/high folded up in reverse preorder.
+        low = pre;
+        high = pre;
+        windows.scan([&](int v) {
+            for (const int32_t *u = g.begin(v); u != g.end(v); ++u) {
+                if (isTreeEdge(v, *u)) continue;
+                low[v] = std::min(low[v], pre[*u]);
+                high[v] = std::max(high[v], pre[*u]);
+            }
+        });
+        {
+            std::vector<int32_t> order(n);
+            for (int v = 0; v < n; ++v) order[pre[v]] = v;
+            nd.assign(n, 1);
+            for (int i = n - 1; i >= 0; --i) {
+                int v = order[i], p = parent[v];
+                if (p < 0) continue;
+                nd[p] += nd[v];
+                low[p] = std::min(low[p], low[v]);
+                high[p] = std::max(high[p], high[v]);
+            }
+        }
+
+        blocks.resize(n);
+        for (int v = 0; v < n; ++v) blocks[v] = v;
+        // Unrelated endpoints of a non-tree edge join their parent edges.
+        windows.scan([&](int v) {
+            for (const int32_t *p = std::upper_bound(g.begin(v), g.end(v), v); p != g.end(v); ++p) {
+                int u = *p;
+                if (isTreeEdge(v, u) || isAncestor(v, u) || isAncestor(u, v)) continue;
+                blocks[find(blocks, u)] = find(blocks, v);
+            }
+        });
+        // A tree edge {v, w} joins v's parent edge when w's subtree reaches outside v's.
+        for (int w = 0; w < n; ++w) {
+            int v = parent[w];
+            if (v < 0 || parent[v] < 0) continue;
+            if (low[w] < pre[v] || high[w] >= pre[v] + nd[v]) blocks[find(blocks, w)] = find(blocks, v);
+        }
+        std::vector<int32_t>().swap(low);
+        std::vector<int32_t>().swap(high);
+        mark("connectivity");
+    }
+
+    bool isAncestor(int a, int b) const { return pre[a] <= pre[b] && pre[b] < pre[a] + nd[a]; }
+
+    // Union-find spanning forest in one pass over the edges, then a preorder
+    // numbering of each tree from its smallest vertex.
+    void spanningForest() {
+        int n = g.n;
+        std::vector<int32_t> treeEnds;
+        treeEnds.reserve(2 * (int64_t)std::max(n - 1, 0));
+        {
+            std::vector<int32_t> forest(n);
+            for (int v = 0; v < n; ++v) forest[v] = v;
+            windows.scan([&](int v) {
+                for (const int32_t *p = std::upper_bound(g.begin(v), g.end(v), v); p != g.end(v); ++p) {
+                    int32_t a = find(forest, v), b = find(forest, *p);
+                    if (a == b) continue;
+                    forest[a] = b;
+                    treeEnds.push_back(v);
+                    treeEnds.push_back(*p);
+                }
+            });
+        }
+
+        std::vector<int64_t> treeOffsets(n + 1, 0);
+        for (int32_t v : treeEnds) ++treeOffsets[v + 1];
+        for (int v = 0; v < n; ++v) treeOffsets[v + 1] += treeOffsets[v];
+        std::vector<int32_t> treeAdj(treeEnds.size());
+        {
+            std::vector<int64_t> fill(treeOffsets.begin(), treeOffsets.end() - 1);
+            for (size_t i = 0; i < treeEnds.size(); i += 2) {
+                treeAdj[fill[treeEnds[i]]++] = treeEnds[i + 1];
+                treeAdj[fill[treeEnds[i + 1]]++] = treeEnds[i];
+            }
+        }
+        treeEnds.clear();
+
+        // A stack DFS numbers each subtree contiguously; treeEnds' space, 2(n - 1) entries, is reused as the stack.
+        parent.assign(n, -1);
+        pre.assign(n, -1);
+        int32_t next = 0;
+        std::vector<int32_t> &stack = treeEnds;
+        for (int r = 0; r < n; ++r) {
+            if (pre[r] >= 0) continue;
+            stack.push_back(r);
+            while (!stack.empty()) {
+                int v = stack.back();
+                stack.pop_back();
+                pre[v] = next++;
+                for (int64_t i = treeOffsets[v]; i < treeOffsets[v + 1]; ++i) {
+                    int u = treeAdj[i];
+                    if (u == parent[v]) continue;
+                    parent[u] = v;
+                    stack.push_back(u);
+                }
+            }
+        }
+    }
+
+    // Streams one int32 block label per edge, in edge id order (entries (v, u)
+    // with v < u in CSR order), to out if it is not null. Blocks are numbered
+    // by first appearance; articulation points are counted on the way.
+    bool writeLabels(FILE *out) {
+        std::vector<int32_t> blockId(g.n, -1);
+        std::vector<int32_t> buffer;
+        buffer.reserve(1 << 16);
+        bool ok = true;
+        auto flush = [&]() {
+            if (out && !buffer.empty() && fwrite(buffer.data(), sizeof(int32_t), buffer.size(), out) != buffer.size())
+                ok = false;
+            buffer.clear();
+        };
+        numBlocks = numArticulation = 0;
+        windows.scan([&](int v) {
+            int32_t first = -1;
+            bool articulation = false;
+            for (const int32_t *p = g.begin(v); p != g.end(v); ++p) {
+                int32_t &id = blockId[blockOf(v, *p)];
+                if (id < 0) id = (int32_t)numBlocks++;
+                if (*p > v) {
+                    buffer.push_back(id);
+                    if (buffer.size() == buffer.capacity()) flush();
+                }
+                if (first < 0) first = id;
+                articulation |= id != first;
+            }
+            numArticulation += articulation;
+        });
+        flush();
+        mark("component_labeling");
+        return ok;
+    }
+
+    size_t memoryBytes() const {
+        return (parent.capacity() + pre.capacity() + nd.capacity() + low.capacity() + high.capacity() +
+                blocks.capacity()) * sizeof(int32_t);
+    }
+};
+
+#endif
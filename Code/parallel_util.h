@@ -0,0 +1,129 @@
+#ifndef PARALLEL_UTIL_H
+#define PARALLEL_UTIL_H
+
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+#include "csr_graph.h"
+
+// Building blocks for the OpenMP engines. Without -fopenmp the pragmas are
+// ignored and the stubs below make everything run on one thread.
+#ifdef _OPENMP
+#include <omp.h>
+#else
+inline int omp_get_thread_num() { return 0; }
+inline int omp_get_num_threads() { return 1; }
+inline int omp_get_max_threads() { return 1; }
+inline void omp_set_num_threads(int) {}
+#endif
+
+// In-place exclusive prefix sum over a, returning the total. Each thread sums
+// one contiguous block, the block totals are scanned, then each block is
+// rewritten with its offset.
+template <class T>
+T exclusiveScan(std::vector<T> &a) {
+    int64_t size = (int64_t)a.size();
+    std::vector<T> blockSum(omp_get_max_threads() + 1, 0);
+    T total = 0;
+#pragma omp parallel
+    {
+        int tid = omp_get_thread_num();
+        int threads = omp_get_num_threads();
+        int64_t lo = size * tid / threads, hi = size * (tid + 1) / threads;
+        T sum = 0;
+        for (int64_t i = lo; i < hi; ++i) sum += a[i];
+        blockSum[tid + 1] = sum;
+#pragma omp barrier
+#pragma omp single
+        {
+            for (int t = 0; t < threads; ++t) blockSum[t + 1] += blockSum[t];
+            total = blockSum[threads];
+        }
+        T running = blockSum[tid];
+        for (int64_t i = lo; i < hi; ++i) {
+            T value = a[i];
+            a[i] = running;
+            running += value;
+        }
+    }
+    return total;
+}
+
+// Lock-free union-find. Roots are only ever linked below a smaller root with a
+// CAS, so parent pointers decrease and no cycle can form; find() does path
+// halving with relaxed CASes that may lose races harmlessly. The root of a set
+// is always its smallest element.
+struct ConcurrentDSU {
+    std::vector<std::atomic<int>> par;
+
+    explicit ConcurrentDSU(int size) : par(size) {
+#pragma omp parallel for
+        for (int i = 0; i < size; ++i) par[i].store(i, std::memory_order_relaxed);
+    }
+
+    int find(int x) {
+        while (true) {
+            int p = par[x].load(std::memory_order_relaxed);
+            if (p == x) return x;
+            int gp = par[p].load(std::memory_order_relaxed);
+            if (gp != p) par[x].compare_exchange_weak(p, gp, std::memory_order_relaxed);
+            x = gp;
+        }
+    }
+
+    // Returns true if a and b were in different sets.
+    bool unite(int a, int b) {
+        while (true) {
+            a = find(a);
+            b = find(b);
+            if (a == b) return false;
+            if (a < b) std::swap(a, b);
+            int expected = a;
+            if (par[a].compare_exchange_strong(expected, b, std::memory_order_acq_rel)) return true;
+        }
+    }
+
+    size_t memoryBytes() const { return sizeof(*this) + par.capacity() * sizeof(std::atomic<int>); }
+};
+
+// Edge ids by CSR position, assigned in parallel: edgeOf[p] is the id of the
+// undirected edge stored at g.adj[p], and both directions share one id. The
+// entry with the larger endpoint is numbered by a prefix count, so ids follow
+// (smaller endpoint, larger endpoint) order; the twin entry finds it by binary
+// search in the sorted neighbour list. edgeU/edgeV hold each edge's endpoints.
+inline int buildEdgeIdsParallel(const CsrGraph &g, std::vector<int32_t> &edgeOf, std::vector<int> &edgeU,
+                                std::vector<int> &edgeV) {
+    int n = g.n;
+    std::vector<int64_t> upperBefore(n);
+#pragma omp parallel for schedule(dynamic, 1024)
+    for (int v = 0; v < n; ++v)
+        upperBefore[v] = g.end(v) - std::upper_bound(g.begin(v), g.end(v), v);
+    int numEdges = (int)exclusiveScan(upperBefore);
+
+    edgeOf.assign(g.nnz(), -1);
+    edgeU.resize(numEdges);
+    edgeV.resize(numEdges);
+#pragma omp parallel for schedule(dynamic, 1024)
+    for (int v = 0; v < n; ++v) {
+        int64_t first = std::upper_bound(g.begin(v), g.end(v), v) - g.adj;
+        for (int64_t p = first; p < g.offsets[v + 1]; ++p) {
+            int id = (int)(upperBefore[v] + (p - first));
+            edgeOf[p] = id;
+            edgeU[id] = v;
+            edgeV[id] = g.adj[p];
+        }
+    }
+#pragma omp parallel for schedule(dynamic, 1024)
+    for (int v = 0; v < n; ++v) {
+        for (int64_t p = g.offsets[v]; p < g.offsets[v + 1] && g.adj[p] < v; ++p) {
+            int u = g.adj[p];
+            edgeOf[p] = edgeOf[std::lower_bound(g.begin(u), g.end(u), v) - g.adj];
+        }
+    }
+    return numEdges;
+}
+
+#endif
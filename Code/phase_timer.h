@@ -0,0 +1,92 @@
+#ifndef PHASE_TIMER_H
+#define PHASE_TIMER_H
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+// Peak resident set size of this process, in bytes: VmHWM, since getrusage's
+// maximum carries the forking parent's high-water mark over exec.
+inline long long peakRssBytes() {
+#ifdef __linux__
+    std::ifstream status("/proc/self/status");
+    std::string line;
+    while (std::getline(status, line))
+        if (line.compare(0, 6, "VmHWM:") == 0) return std::atoll(line.c_str() + 6) * 1024;
+#endif
+    return 0;
+}
+
+// Resets VmHWM to the current RSS, so peakRssBytes() covers only what follows.
+// Returns false where that is not supported.
+inline bool resetPeakRss() {
+#ifdef __linux__
+    FILE *refs = fopen("/proc/self/clear_refs", "w");
+    if (!refs) return false;
+    bool ok = fputs("5", refs) >= 0;
+    return fclose(refs) == 0 && ok;
+#else
+    return false;
+#endif
+}
+
+// Accumulates monotonic-clock durations per named phase. mark(name) charges the
+// time since the previous mark to that phase, so repeated marks add up.
+struct PhaseTimer {
+    using Clock = std::chrono::steady_clock;
+
+    Clock::time_point start = Clock::now();
+    Clock::time_point last = start;
+    std::vector<std::pair<std::string, double>> phases;
+    // Facts about how the input was read (e.g. compressed size), reported under "input".
+    std::vector<std::pair<std::string, double>> input;
+
+    void mark(const std::string &name) {
+        Clock::time_point now = Clock::now();
+        double seconds = std::chrono::duration<double>(now - last).count();
+        last = now;
+        for (auto &phase : phases) {
+            if (phase.first == name) {
+                phase.second += seconds;
+                return;
+            }
+        }
+        phases.emplace_back(name, seconds);
+    }
+
+    double total() const { return std::chrono::duration<double>(last - start).count(); }
+
+    void note(const std::string &name, double value) { input.emplace_back(name, value); }
+
+    // One-line JSON record: {"engine":...,"n":...,"m":...,"peak_rss":...,"phases":{...},"total":...}
+    // with "input":{...} before "total" when anything was noted. peak_rss is
+    // the process's VmHWM when the record is written.
+    // extra is spliced in after m and must start with a comma, e.g. ",\"memory\":123".
+    std::string json(const std::string &engine, long long n, long long m, const std::string &extra = "") const {
+        std::string out = "{\"engine\":\"" + engine + "\",\"n\":" + std::to_string(n) + ",\"m\":" + std::to_string(m) + extra +
+                          ",\"peak_rss\":" + std::to_string(peakRssBytes()) + ",\"phases\":{";
+        char buf[64];
+        for (size_t i = 0; i < phases.size(); ++i) {
+            snprintf(buf, sizeof(buf), "%s\"%s\":%.9f", i ? "," : "", phases[i].first.c_str(), phases[i].second);
+            out += buf;
+        }
+        out += "}";
+        if (!input.empty()) {
+            out += ",\"input\":{";
+            for (size_t i = 0; i < input.size(); ++i) {
+                snprintf(buf, sizeof(buf), "%s\"%s\":%.9g", i ? "," : "", input[i].first.c_str(), input[i].second);
+                out += buf;
+            }
+            out += "}";
+        }
+        snprintf(buf, sizeof(buf), ",\"total\":%.9f}", total());
+        out += buf;
+        return out;
+    }
+};
+
+#endif
@@ -5,6 +5,11 @@ using namespace std;
 #include <sys/resource.h>
 #endif
 
+#include "batch.h"
+#include "block_cut_tree.h"
+#include "mtx_reader.h"
+#include "slota.h"
+
 size_t memoryUsage(const vector<vector<int>> &graph)
 {
     size_t total = sizeof(graph);
@@ -15,11 +20,11 @@ size_t memoryUsage(const vector<vector<int>> &graph)
     return total;
 }
 
-bool bfsExcludingNode(const vector<vector<int>> &graph, const vector<int> &level,
+bool bfsExcludingNode(const CsrGraph &graph, const vector<int> &level,
                       vector<int> &visited, const vector<int> &parent, vector<bool> &done,
                       int excluded, int start, int excludedLevel, int stampID, int root = -1)
 {
-    if (excluded == root && graph[excluded].size() == 1)
+    if (excluded == root && graph.degree(excluded) == 1)
         return false;
 
     queue<int> q;
@@ -33,8 +38,9 @@ bool bfsExcludingNode(const vector<vector<int>> &graph, const vector<int> &level
         if ((level[node] <= excludedLevel && node != excluded) || (done[node] && parent[node] == excluded))
             return true;
 
-        for (int neighbor : graph[node])
+        for (const int32_t *it = graph.begin(node); it != graph.end(node); ++it)
         {
+            int neighbor = *it;
             if (neighbor != excluded && visited[neighbor] != stampID)
             {
                 visited[neighbor] = stampID;
@@ -46,11 +52,11 @@ bool bfsExcludingNode(const vector<vector<int>> &graph, const vector<int> &level
     return false;
 }
 
-bool isCycleGraph(const vector<vector<int>> &graph, int n)
+bool isCycleGraph(const CsrGraph &graph, int n)
 {
     for (int i = 0; i < n; ++i)
     {
-        if (graph[i].size() != 2)
+        if (graph.degree(i) != 2)
             return false;
     }
 
@@ -64,8 +70,9 @@ bool isCycleGraph(const vector<vector<int>> &graph, int n)
     {
         int node = q.front();
         q.pop();
-        for (int neighbor : graph[node])
+        for (const int32_t *it = graph.begin(node); it != graph.end(node); ++it)
         {
+            int neighbor = *it;
             if (!visited[neighbor])
             {
                 visited[neighbor] = true;
@@ -78,66 +85,68 @@ bool isCycleGraph(const vector<vector<int>> &graph, int n)
     return visitedCount == n;
 }
 
-int main(int argc, char *argv[])
+// Buffers kept across graphs in batch mode; assign() reuses their capacity.
+struct SlotaScratch
 {
-    ios::sync_with_stdio(false);
-    cin.tie(nullptr);
-
-    string filename = (argc > 1) ? argv[1] : "graph.txt";
-    ifstream file(filename);
-    if (!file)
-    {
-        cerr << "Error: Cannot open file " << filename << "\n";
-        return 1;
-    }
+    CsrGraph graph;
+    vector<int> parent, level, stamp;
+    vector<bool> visited, isArticulation, done;
 
-    string line;
-    int n = 0, m = 0;
-    bool gotHeader = false;
+    // Parallel mode state: one stamp array and queue per thread, and per
+    // non-root vertex the result of the check against its BFS parent.
+    vector<vector<int>> threadStamps;
+    vector<vector<int>> threadQueues;
+    vector<int> threadStampIDs;
+    vector<int> childRank, cutOff, groupLeader;
+};
 
-    while (getline(file, line))
-    {
-        if (line.empty() || line[0] == '%')
-            continue;
-        if (!gotHeader)
-        {
-            stringstream ss(line);
-            int dummy;
-            ss >> n >> dummy >> m;
-            gotHeader = true;
-            break;
-        }
-    }
-
-    vector<vector<int>> graph(n);
-    int u, v;
-    double val;
-    while (file >> u >> v >> val)
-    {
-        --u;
-        --v;
-        graph[u].push_back(v);
-        graph[v].push_back(u);
-    }
-    file.close();
+// Runs the engine on one graph, charging phases to timer. Returns false if the
+// graph cannot be loaded; otherwise totalMemory is the engine's memory figure.
+bool solve(const string &filename, SlotaScratch &scratch, int threads, PhaseTimer &timer, size_t &totalMemory)
+{
+    CsrGraph &graph = scratch.graph;
+    if (!loadGraph(filename, graph, &timer))
+        return false;
+    int n = graph.n;
 
-    vector<int> parent(n, -2), level(n, -1), stamp(n, 0);
-    vector<bool> visited(n, false), isArticulation(n, false);
+    vector<int> &parent = scratch.parent, &level = scratch.level, &stamp = scratch.stamp;
+    vector<bool> &visited = scratch.visited, &isArticulation = scratch.isArticulation, &done = scratch.done;
+    parent.assign(n, -2);
+    level.assign(n, -1);
+    stamp.assign(n, 0);
+    visited.assign(n, false);
+    isArticulation.assign(n, false);
+    done.assign(n, false);
     stack<pair<int, int>> edgeStack;
     vector<vector<int>> bccs;
-    vector<bool> done(n, false);
 
     int stampID = 1;
 
+    vector<vector<int>> &threadStamps = scratch.threadStamps, &threadQueues = scratch.threadQueues;
+    vector<int> &threadStampIDs = scratch.threadStampIDs;
+    vector<int> &childRank = scratch.childRank, &cutOff = scratch.cutOff, &groupLeader = scratch.groupLeader;
+    if (threads > 1)
+    {
+        threadStamps.resize(threads);
+        for (auto &localStamp : threadStamps)
+            localStamp.assign(n, 0);
+        threadQueues.resize(threads);
+        threadStampIDs.assign(threads, 0);
+        childRank.assign(n, 0);
+        cutOff.assign(n, 0);
+        groupLeader.assign(n, 0);
+    }
+    timer.mark("build");
+
     if (isCycleGraph(graph, n))
     {
         for (int i = 0; i < n; ++i)
         {
             bccs.push_back({i});
         }
-        cout << n << " " << m << " " ; 
-        cout << memoryUsage(graph) << "\n";
-        return 0;
+        timer.mark("component_labeling");
+        totalMemory = graph.memoryBytes();
+        return true;
     }
 
     for (int root = 0; root < n; ++root)
@@ -157,8 +166,9 @@ int main(int argc, char *argv[])
         {
             int node = q.front();
             q.pop();
-            for (int neighbor : graph[node])
+            for (const int32_t *it = graph.begin(node); it != graph.end(node); ++it)
             {
+                int neighbor = *it;
                 if (!visited[neighbor])
                 {
                     visited[neighbor] = true;
@@ -169,12 +179,85 @@ int main(int argc, char *argv[])
                 }
             }
         }
+        timer.mark("spanning_tree");
+
+        if (threads > 1)
+        {
+            for (int node : component)
+            {
+                int rank = 0;
+                for (const int32_t *it = graph.begin(node); it != graph.end(node); ++it)
+                    if (parent[*it] == node)
+                        childRank[*it] = rank++;
+            }
+
+            // One work item per tree edge (parent[child], child), so a hub's
+            // children spread over all threads; dynamic scheduling lets idle
+            // threads take the next chunk when some subtrees are much larger.
+            long long items = (long long)component.size();
+#pragma omp parallel
+            {
+                int tid = omp_get_thread_num();
+                vector<int> &localStamp = threadStamps[tid];
+                vector<int> &localQueue = threadQueues[tid];
+                int &localStampID = threadStampIDs[tid];
+#pragma omp for schedule(dynamic, 16)
+                for (long long k = 1; k < items; ++k)
+                {
+                    int child = component[k];
+                    int node = parent[child];
+                    int sibling = child;
+                    bool cut = (node == root && graph.degree(node) == 1) ||
+                               !reachesAboveExcluded(graph, level, parent, childRank, localStamp, localQueue,
+                                                     node, child, level[node], ++localStampID, sibling);
+                    cutOff[child] = cut;
+                    groupLeader[child] = cut && sibling == child;
+                }
+            }
+            timer.mark("articulation");
+
+            // Replay the serial order: only the first child of each cut-off
+            // sibling group opens a BCC, as the done[] shortcut does serially.
+            for (int node : component)
+            {
+                bool isArt = false;
+                for (const int32_t *it = graph.begin(node); it != graph.end(node); ++it)
+                {
+                    int child = *it;
+                    if (parent[child] != node)
+                        continue;
+                    edgeStack.push({node, child});
+                    if (cutOff[child] && groupLeader[child])
+                    {
+                        isArt = true;
+                        done[child] = true;
+                        vector<int> currentBCC;
+                        while (!edgeStack.empty())
+                        {
+                            auto [x, y] = edgeStack.top();
+                            edgeStack.pop();
+                            currentBCC.push_back(x);
+                            currentBCC.push_back(y);
+                            if ((x == node && y == child) || (x == child && y == node))
+                                break;
+                        }
+                        bccs.push_back(currentBCC);
+                    }
+                }
+
+                if (isArt)
+                    isArticulation[node] = true;
+            }
+            timer.mark("component_labeling");
+            continue;
+        }
 
         for (int node : component)
         {
             vector<int> children;
-            for (int neighbor : graph[node])
+            for (const int32_t *it = graph.begin(node); it != graph.end(node); ++it)
             {
+                int neighbor = *it;
                 if (parent[neighbor] == node)
                     children.push_back(neighbor);
             }
@@ -207,10 +290,90 @@ int main(int argc, char *argv[])
             if (isArt)
                 isArticulation[node] = true;
         }
+        timer.mark("articulation");
+    }
+
+    totalMemory = graph.memoryBytes() + sizeof(parent) + parent.capacity() * sizeof(int) + sizeof(level) + level.capacity() * sizeof(int) + sizeof(stamp) + stamp.capacity() * sizeof(int) + sizeof(visited) + visited.capacity() * sizeof(bool) + sizeof(isArticulation) + isArticulation.capacity() * sizeof(bool) + memoryUsage(bccs);
+    if (threads > 1)
+    {
+        totalMemory += memoryUsage(threadStamps) + memoryUsage(threadQueues) + (childRank.capacity() + cutOff.capacity() + groupLeader.capacity()) * sizeof(int);
+    }
+    return true;
+}
+
+// The engine above keeps no per-edge labels, so --block-cut-tree relabels the
+// graph with the parallel checks of slota.h (SlotaBlocks) and writes the
+// result, charged to "block_cut_tree". In batch mode the option names a
+// directory that gets one <graph file name>.bct per graph.
+bool writeBlocks(const CsrGraph &graph, const string &path, PhaseTimer &timer)
+{
+    SlotaBlocks blocks(graph);
+    blocks.labelEdges();
+    BlockCutTree tree;
+    tree.build(graph, blocks.numEdges, [&](int64_t p) { return blocks.blocks.find(blocks.edgeOf[p]); });
+    bool ok = tree.write(path);
+    timer.mark("block_cut_tree");
+    return ok;
+}
+
+int main(int argc, char *argv[])
+{
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+
+    string filename = "graph.txt";
+    string manifest;
+    string treeOutput;
+    int threads = 1;
+    for (int i = 1; i < argc; ++i)
+    {
+        string arg = argv[i];
+        if (arg == "--threads" && i + 1 < argc)
+            threads = max(1, atoi(argv[++i]));
+        else if (arg == "--batch" && i + 1 < argc)
+            manifest = argv[++i];
+        else if (arg == "--block-cut-tree" && i + 1 < argc)
+            treeOutput = argv[++i];
+        else
+            filename = arg;
+    }
+#ifdef _OPENMP
+    omp_set_num_threads(threads);
+#else
+    threads = 1;
+#endif
+
+    SlotaScratch scratch;
+    if (!manifest.empty())
+    {
+        return runManifest(manifest, [&](const string &path) {
+            PhaseTimer timer;
+            size_t totalMemory = 0;
+            if (!solve(path, scratch, threads, timer, totalMemory))
+                return batchError("slota", path, "could not open file");
+            if (!treeOutput.empty() && !writeBlocks(scratch.graph, blockCutTreeFile(treeOutput, path), timer))
+                return batchError("slota", path, "could not write block-cut tree");
+            timer.mark("output");
+            string extra = ",\"file\":" + jsonQuote(path) + ",\"memory\":" + to_string(totalMemory);
+            return timer.json("slota", scratch.graph.n, scratch.graph.m, extra);
+        });
     }
 
-    size_t totalMemory = memoryUsage(graph) + sizeof(parent) + parent.capacity() * sizeof(int) + sizeof(level) + level.capacity() * sizeof(int) + sizeof(stamp) + stamp.capacity() * sizeof(int) + sizeof(visited) + visited.capacity() * sizeof(bool) + sizeof(isArticulation) + isArticulation.capacity() * sizeof(bool) + memoryUsage(bccs);
-    cout << n << " " << m << " " ; 
+    PhaseTimer timer;
+    size_t totalMemory = 0;
+    if (!solve(filename, scratch, threads, timer, totalMemory))
+    {
+        cerr << "Error: Cannot open file " << filename << "\n";
+        return 1;
+    }
+    if (!treeOutput.empty() && !writeBlocks(scratch.graph, treeOutput, timer))
+    {
+        cerr << "Error: could not write " << treeOutput << "\n";
+        return 1;
+    }
+    timer.mark("output");
+    cout << timer.json("slota", scratch.graph.n, scratch.graph.m) << "\n";
+    cout << scratch.graph.n << " " << scratch.graph.m << " " ; 
     cout << totalMemory << "\n";
     return 0;
-}
\ No newline at end of file
+}
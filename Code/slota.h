@@ -0,0 +1,172 @@
+#ifndef SLOTA_H
+#define SLOTA_H
+
+#include <cstdint>
+#include <queue>
+#include <vector>
+
+#include "csr_graph.h"
+#include "parallel_util.h"
+
+// Parallel form of the Slota-Madduri exclusion check for one (excluded, start)
+// tree edge. It has no done[] shortcut, so checks are independent and can run
+// in any order. When start cannot reach above excluded, firstSibling is set to
+// the child of excluded with the lowest childRank that start reaches (start
+// itself if none comes before it), which identifies its sibling group.
+inline bool reachesAboveExcluded(const CsrGraph &graph, const std::vector<int> &level, const std::vector<int> &parent,
+                                 const std::vector<int> &childRank, std::vector<int> &visited, std::vector<int> &q,
+                                 int excluded, int start, int excludedLevel, int stampID, int &firstSibling)
+{
+    firstSibling = start;
+    q.clear();
+    visited[start] = stampID;
+    q.push_back(start);
+
+    for (size_t head = 0; head < q.size(); ++head)
+    {
+        int node = q[head];
+        if (level[node] <= excludedLevel && node != excluded)
+            return true;
+        if (parent[node] == excluded && childRank[node] < childRank[firstSibling])
+            firstSibling = node;
+
+        for (const int32_t *it = graph.begin(node); it != graph.end(node); ++it)
+        {
+            int neighbor = *it;
+            if (neighbor != excluded && visited[neighbor] != stampID)
+            {
+                visited[neighbor] = stampID;
+                q.push_back(neighbor);
+            }
+        }
+    }
+
+    return false;
+}
+
+// Per-edge BCCs from the Slota-Madduri checks, for callers that need labels
+// rather than the engine's memory figure. On a BFS forest:
+//   - a tree edge (v, w) whose child w is not cut off at v is in the same BCC
+//     as v's parent edge;
+//   - cut-off children of v that reach each other without v share one BCC;
+//   - a non-tree edge is in the BCC of the parent edge of its deeper endpoint.
+// The checks run in parallel over all tree edges; after labelEdges() the root
+// of each edge in blocks is the smallest edge id of its BCC.
+struct SlotaBlocks
+{
+    const CsrGraph &g;
+    int n;
+
+    std::vector<int32_t> edgeOf;
+    std::vector<int> edgeU, edgeV;
+    int numEdges = 0;
+
+    std::vector<int> parent, level, parentEdge, childRank, firstSibling;
+    std::vector<char> cutOff;
+    ConcurrentDSU blocks{0};
+
+    explicit SlotaBlocks(const CsrGraph &graph) : g(graph), n(graph.n) {}
+
+    void labelEdges()
+    {
+        numEdges = buildEdgeIdsParallel(g, edgeOf, edgeU, edgeV);
+        buildBfsForest();
+        runChecks();
+        uniteBlocks();
+    }
+
+    void buildBfsForest()
+    {
+        parent.assign(n, -2);
+        level.assign(n, -1);
+        parentEdge.assign(n, -1);
+        childRank.assign(n, 0);
+        std::vector<int> q;
+        q.reserve(n);
+        for (int root = 0; root < n; ++root)
+        {
+            if (level[root] != -1)
+                continue;
+            parent[root] = -1;
+            level[root] = 0;
+            q.push_back(root);
+            for (size_t head = q.size() - 1; head < q.size(); ++head)
+            {
+                int node = q[head];
+                int rank = 0;
+                for (int64_t p = g.offsets[node]; p < g.offsets[node + 1]; ++p)
+                {
+                    int neighbor = g.adj[p];
+                    if (level[neighbor] == -1)
+                    {
+                        parent[neighbor] = node;
+                        level[neighbor] = level[node] + 1;
+                        parentEdge[neighbor] = edgeOf[p];
+                        childRank[neighbor] = rank++;
+                        q.push_back(neighbor);
+                    }
+                }
+            }
+        }
+    }
+
+    void runChecks()
+    {
+        cutOff.assign(n, 0);
+        firstSibling.assign(n, -1);
+        std::vector<std::vector<int>> threadStamps(omp_get_max_threads());
+        std::vector<std::vector<int>> threadQueues(omp_get_max_threads());
+#pragma omp parallel
+        {
+            std::vector<int> &localStamp = threadStamps[omp_get_thread_num()];
+            std::vector<int> &localQueue = threadQueues[omp_get_thread_num()];
+            localStamp.assign(n, 0);
+            int localStampID = 0;
+#pragma omp for schedule(dynamic, 16)
+            for (int child = 0; child < n; ++child)
+            {
+                int node = parent[child];
+                if (node < 0)
+                    continue;
+                int sibling = child;
+                bool cut = (parent[node] == -1 && g.degree(node) == 1) ||
+                           !reachesAboveExcluded(g, level, parent, childRank, localStamp, localQueue,
+                                                 node, child, level[node], ++localStampID, sibling);
+                cutOff[child] = cut;
+                firstSibling[child] = sibling;
+            }
+        }
+    }
+
+    void uniteBlocks()
+    {
+        blocks = ConcurrentDSU(numEdges);
+#pragma omp parallel for schedule(dynamic, 1024)
+        for (int w = 0; w < n; ++w)
+        {
+            int v = parent[w];
+            if (v < 0)
+                continue;
+            if (!cutOff[w])
+            {
+                if (parent[v] >= 0)
+                    blocks.unite(parentEdge[w], parentEdge[v]);
+            }
+            else if (firstSibling[w] != w)
+            {
+                blocks.unite(parentEdge[w], parentEdge[firstSibling[w]]);
+            }
+        }
+#pragma omp parallel for schedule(dynamic, 4096)
+        for (int e = 0; e < numEdges; ++e)
+        {
+            int u = edgeU[e], v = edgeV[e];
+            if (parentEdge[u] == e || parentEdge[v] == e)
+                continue;
+            int deeper = level[u] >= level[v] ? u : v;
+            blocks.unite(e, parentEdge[deeper]);
+        }
+    }
+};
+
+#endif
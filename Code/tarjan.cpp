@@ -3,14 +3,17 @@
 #include <algorithm>
 #include <sstream>
 #include <fstream>
-#include <map>
 #ifdef __linux__
 #include <sys/resource.h>
 #endif
+#include "batch.h"
+#include "block_cut_tree.h"
+#include "mtx_reader.h"
+#include "out_of_core.h"
 using namespace std;
 
 struct NodeInfo {
-    int pre = 0, low = 0, high = 0, nd = 0, parent = -1;
+    int pre = 0, low = 0, high = 0, nd = 0, parent = -1, parentEdge = -1;
 };
 
 struct DSU {
@@ -34,23 +37,47 @@ size_t calculateVectorMemory(const vector<vector<int>> &vec) {
     return memory;
 }
 
-int n, m, timer = 0;
-vector<vector<int>> g, tree;
-vector<pair<int, int>> edges, backEdges;
+int n, timer = 0;
+long long m;
+CsrGraph g;
+vector<vector<int>> tree;
+vector<pair<int, int>> edges;
+vector<int> backEdges;
 vector<NodeInfo> info;
 vector<int> mark;
 int markId = 0;
-map<pair<int, int>, int> edgeIndex;
+// Edge ids by CSR position: edgeOf[p] is the id of the undirected edge stored
+// at g.adj[p]; both directions of an edge share one id.
+vector<int32_t> edgeOf;
+// Auxiliary-graph union-find over edge ids, kept for --block-cut-tree.
+DSU dsu(0);
+
+void buildEdgeIds() {
+    edgeOf.assign(g.nnz(), -1);
+    // Lists are sorted, so the smaller neighbours of u are met in increasing
+    // order while scanning v upward; cursor[u] is the position of the twin
+    // entry (v in u's list) for the next such edge.
+    vector<int64_t> cursor(g.offsets, g.offsets + n);
+    for (int v = 0; v < n; ++v) {
+        for (int64_t p = g.offsets[v]; p < g.offsets[v + 1]; ++p) {
+            int u = g.adj[p];
+            if (u < v) continue;
+            int64_t q = cursor[u]++;
+            edgeOf[p] = edgeOf[q] = (int)edges.size();
+            edges.emplace_back(v, u);
+        }
+    }
+}
 
 void dfs(int start) {
     struct Frame {
         int v, p;
-        size_t idx;
+        int64_t idx;
         bool resumed;
     };
 
     vector<Frame> stack;
-    stack.push_back({start, -1, 0, false});
+    stack.push_back({start, -1, g.offsets[start], false});
 
     while (!stack.empty()) {
         Frame &frame = stack.back();
@@ -66,17 +93,19 @@ void dfs(int start) {
         }
 
         bool advanced = false;
-        while (frame.idx < g[v].size()) {
-            int u = g[v][frame.idx++];
+        while (frame.idx < g.offsets[v + 1]) {
+            int64_t pos = frame.idx++;
+            int u = g.adj[pos];
             if (u == p) continue;
             if (info[u].pre) {
                 if (info[u].pre < info[v].pre)
-                    backEdges.emplace_back(v, u);
+                    backEdges.push_back(edgeOf[pos]);
                 info[v].low = min(info[v].low, info[u].pre);
                 info[v].high = max(info[v].high, info[u].pre);
             } else {
                 tree[v].push_back(u);
-                stack.push_back({u, v, 0, false});
+                info[u].parentEdge = edgeOf[pos];
+                stack.push_back({u, v, g.offsets[u], false});
                 advanced = true;
                 break;
             }
@@ -93,40 +122,49 @@ void dfs(int start) {
     }
 }
 
+PhaseTimer phaseTimer;
+
+// The serial DFS computes pre/nd together with low/high, so both are charged
+// to the "spanning_tree" phase. Every component gets its own DFS tree, rooted
+// at its smallest vertex, with preorder numbers continuing across trees.
 vector<vector<int>> computeBiconnectedComponents() {
-    dfs(1);
+    for (int v = 0; v < n; ++v)
+        if (info[v].pre == 0) dfs(v);
+    phaseTimer.mark("spanning_tree");
 
     int numEdges = edges.size();
-    DSU dsu(numEdges);
+    dsu = DSU(numEdges);
 
-    // Case (i): back edges
-    for (auto [v, u] : backEdges) {
-        if (info[v].pre < info[u].pre) swap(v, u);
-        int idx = edgeIndex[{v, u}];
-        dsu.unite(idx, idx);  // trivial self-union but keeps consistency
+    // Case (i): a back edge is in the block of the tree edge above its deeper endpoint
+    for (int idx : backEdges) {
+        int a = edges[idx].first, b = edges[idx].second;
+        dsu.unite(idx, info[info[a].pre > info[b].pre ? a : b].parentEdge);
     }
 
     // Case (ii) and (iii)
-    for (int v = 1; v <= n; ++v) {
+    for (int v = 0; v < n; ++v) {
         for (int w : tree[v]) {
-            int edgeVw = edgeIndex[{v, w}];
-            int parentEdgeV = (info[v].parent != -1) ? edgeIndex[{info[v].parent, v}] : edgeVw;
+            int edgeVw = info[w].parentEdge;
+            int parentEdgeV = (info[v].parent != -1) ? info[v].parentEdge : edgeVw;
 
             // Case (iii)
             if (info[w].low < info[v].pre || info[w].high >= info[v].pre + info[v].nd)
                 dsu.unite(edgeVw, parentEdgeV);
 
             // Case (ii)
-            for (int u : g[w]) {
-                if (u == v || info[u].pre == 0) continue;
+            for (int64_t pos = g.offsets[w]; pos < g.offsets[w + 1]; ++pos) {
+                int u = g.adj[pos];
+                if (u == v) continue;
                 bool unrelated1 = info[u].pre < info[v].pre || info[u].pre > info[v].pre + info[v].nd - 1;
                 bool unrelated2 = info[w].pre < info[u].pre || info[w].pre > info[u].pre + info[u].nd - 1;
                 if (unrelated1 && unrelated2)
-                    dsu.unite(parentEdgeV, edgeIndex[{w, u}]);
+                    dsu.unite(parentEdgeV, edgeOf[pos]);
             }
         }
     }
 
+    phaseTimer.mark("connectivity");
+
     vector<vector<int>> blocks(numEdges);
     for (int i = 0; i < numEdges; ++i) {
         int comp = dsu.find(i);
@@ -146,53 +184,28 @@ vector<vector<int>> computeBiconnectedComponents() {
             }
         }
     }
+    phaseTimer.mark("component_labeling");
     return bcc;
 }
 
-int main(int argc, char *argv[]) {
-    ios::sync_with_stdio(false);
-    cin.tie(nullptr);
+// Runs the engine on one graph, reusing the global buffers' capacity from
+// earlier graphs in batch mode. Returns false if the graph cannot be loaded;
+// otherwise totalMemory is the engine's memory figure.
+bool solve(const string &input_file, size_t &totalMemory) {
+    if (!loadGraph(input_file, g, &phaseTimer)) return false;
+    n = g.n;
+    m = g.m;
 
-    string input_file = "graph.txt";
-    if (argc > 1) input_file = argv[1];
-    ifstream fin(input_file);
-    if (!fin) {
-        cerr << "Error: could not open " << input_file << endl;
-        return 1;
-    }
+    for (auto &children : tree) children.clear();
+    tree.resize(n);
+    info.assign(n, NodeInfo());
+    edges.clear();
+    backEdges.clear();
+    timer = 0;
+    markId = 0;
 
-    string line;
-    bool dimensions_read = false;
-    while (getline(fin, line)) {
-        if (line.empty() || line[0] == '%') continue;
-        if (!dimensions_read) {
-            stringstream ss(line);
-            int rows, cols, nnz;
-            ss >> rows >> cols >> nnz;
-            n = rows;
-            m = nnz;
-            dimensions_read = true;
-            break;
-        }
-    }
-
-    g.resize(n + 1);
-    tree.resize(n + 1);
-    info.resize(n + 1);
-
-    int edgeCounter = 0;
-    int u, v;
-    float val;
-    while (fin >> u >> v >> val) {
-        if (u == v) continue;
-        g[u].push_back(v);
-        g[v].push_back(u);
-        edges.emplace_back(u, v);
-        edgeIndex[{u, v}] = edgeCounter;
-        edgeIndex[{v, u}] = edgeCounter;
-        ++edgeCounter;
-    }
-    fin.close();
+    buildEdgeIds();
+    phaseTimer.mark("build");
 
     auto bcc = computeBiconnectedComponents();
 
@@ -205,11 +218,155 @@ int main(int argc, char *argv[]) {
     //    cout << '\n';
     //}
 
-    size_t g_memory = calculateVectorMemory(g);
+    size_t g_memory = g.memoryBytes();
     size_t tree_memory = calculateVectorMemory(tree);
     size_t bcc_memory = calculateVectorMemory(bcc);
-    size_t total_memory = g_memory + tree_memory + bcc_memory;
+    size_t edge_id_memory = edgeOf.capacity() * sizeof(int32_t);
+    totalMemory = g_memory + tree_memory + bcc_memory + edge_id_memory;
+    return true;
+}
+
+// Writes the blocks of the last solved graph as a block-cut tree (see
+// block_cut_tree.h), charged to "block_cut_tree". Returns an error message, or
+// "" on success.
+string writeBlocks(const string &path) {
+    // DSU::find compresses paths, so the labels are resolved before the parallel build reads them.
+    vector<int32_t> edgeBlock(edges.size());
+    for (size_t e = 0; e < edges.size(); ++e) edgeBlock[e] = dsu.find((int)e);
+    BlockCutTree blockCutTree;
+    blockCutTree.build(g, edges.size(), [&](int64_t p) { return edgeBlock[edgeOf[p]]; });
+    bool ok = blockCutTree.write(path);
+    phaseTimer.mark("block_cut_tree");
+    return ok ? "" : "could not write " + path;
+}
+
+// --memory-budget: what the budget leaves after the process's baseline RSS and
+// the capped engine's per-vertex arrays is the adjacency window, capped since
+// larger windows only keep more pages resident. SLACK covers the label buffer,
+// stacks and the kernel's fault-around.
+static const int64_t CAPPED_SLACK = 8 << 20, CAPPED_MIN_WINDOW = 1 << 20, CAPPED_MAX_WINDOW = 64 << 20;
+
+// Runs the memory-capped engine (out_of_core.h) on a binary CSR file, keeping
+// the resident set within budget bytes (0 for no cap), and streams the
+// per-edge labels to labelsPath unless it is empty. Prints the usual two
+// lines; the JSON record adds the budget, the window and the block and
+// articulation point counts. Returns the exit code.
+int solveCapped(const string &input_file, int64_t budget, const string &labelsPath) {
+    if (!isCsrFile(input_file)) {
+        cerr << "Error: --memory-budget needs a binary CSR file (see Scripts/csr_cache.py)" << endl;
+        return 1;
+    }
+    if (!loadGraph(input_file, g, &phaseTimer)) {
+        cerr << "Error: could not open " << input_file << endl;
+        return 1;
+    }
+    n = g.n;
+    m = g.m;
+    int64_t vertexBytes = TarjanVishkinCapped::BYTES_PER_VERTEX * n;
+    int64_t window = budget > 0 ? min(budget - currentRssBytes() - vertexBytes - CAPPED_SLACK, CAPPED_MAX_WINDOW)
+                                : CAPPED_MAX_WINDOW;
+    if (window < CAPPED_MIN_WINDOW) {
+        int64_t needed = (currentRssBytes() + vertexBytes + CAPPED_SLACK + CAPPED_MIN_WINDOW + (1 << 20) - 1) >> 20;
+        cerr << "Error: a memory budget of " << (budget >> 20) << " MB is too small for " << n
+             << " vertices; it needs at least " << needed << " MB" << endl;
+        return 1;
+    }
+
+    string tmp = labelsPath + ".tmp";
+    FILE *labels = nullptr;
+    if (!labelsPath.empty() && !(labels = fopen(tmp.c_str(), "wb"))) {
+        cerr << "Error: could not write " << labelsPath << endl;
+        return 1;
+    }
+    TarjanVishkinCapped engine(g, window);
+    engine.timer = &phaseTimer;
+    engine.run();
+    bool ok = engine.writeLabels(labels);
+    if (labels) ok = fclose(labels) == 0 && ok && rename(tmp.c_str(), labelsPath.c_str()) == 0;
+    if (!ok) {
+        cerr << "Error: could not write " << labelsPath << endl;
+        return 1;
+    }
+    phaseTimer.mark("output");
+
+    size_t total_memory = engine.memoryBytes();
+    string extra = ",\"memory_budget\":" + to_string(budget) + ",\"window\":" + to_string(window) +
+                   ",\"blocks\":" + to_string(engine.numBlocks) +
+                   ",\"articulation_points\":" + to_string(engine.numArticulation);
+    cout << phaseTimer.json("tarjan", n, m, extra) << '\n';
+    cout << n << ' ' << m << ' ' << total_memory << '\n';
+    return 0;
+}
+
+int main(int argc, char *argv[]) {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+
+    string input_file = "graph.txt";
+    string manifest;
+    string treeOutput;
+    string labelsOutput;
+    int64_t memoryBudget = 0;
+    int threads = 1;
+    for (int i = 1; i < argc; ++i) {
+        string arg = argv[i];
+        if (arg == "--threads" && i + 1 < argc)
+            threads = max(1, atoi(argv[++i]));
+        else if (arg == "--batch" && i + 1 < argc)
+            manifest = argv[++i];
+        else if (arg == "--block-cut-tree" && i + 1 < argc)
+            treeOutput = argv[++i];
+        else if (arg == "--memory-budget" && i + 1 < argc)
+            memoryBudget = (int64_t)(atof(argv[++i]) * (1 << 20));
+        else if (arg == "--labels" && i + 1 < argc)
+            labelsOutput = argv[++i];
+        else
+            input_file = arg;
+    }
+    // The DFS is serial; the threads only serve the parser and CSR build.
+#ifdef _OPENMP
+    omp_set_num_threads(threads);
+#else
+    (void)threads;
+#endif
+
+    if (memoryBudget > 0 || !labelsOutput.empty()) {
+        if (!manifest.empty() || !treeOutput.empty()) {
+            cerr << "Error: --memory-budget and --labels run one graph and do not combine with --batch or --block-cut-tree"
+                 << endl;
+            return 1;
+        }
+        // --labels alone runs the capped engine without a cap.
+        return solveCapped(input_file, memoryBudget, labelsOutput);
+    }
+
+    if (!manifest.empty()) {
+        // In batch mode --block-cut-tree names a directory for <graph file name>.bct files.
+        return runManifest(manifest, [&](const string &path) {
+            phaseTimer = PhaseTimer();
+            size_t total_memory = 0;
+            if (!solve(path, total_memory)) return batchError("tarjan", path, "could not open file");
+            string error = treeOutput.empty() ? "" : writeBlocks(blockCutTreeFile(treeOutput, path));
+            if (!error.empty()) return batchError("tarjan", path, error);
+            phaseTimer.mark("output");
+            string extra = ",\"file\":" + jsonQuote(path) + ",\"memory\":" + to_string(total_memory);
+            return phaseTimer.json("tarjan", n, m, extra);
+        });
+    }
+
+    size_t total_memory = 0;
+    if (!solve(input_file, total_memory)) {
+        cerr << "Error: could not open " << input_file << endl;
+        return 1;
+    }
+    string error = treeOutput.empty() ? "" : writeBlocks(treeOutput);
+    if (!error.empty()) {
+        cerr << "Error: " << error << endl;
+        return 1;
+    }
+    phaseTimer.mark("output");
 
+    cout << phaseTimer.json("tarjan", n, m) << '\n';
     cout << n << ' ' << m << ' ' << total_memory << '\n';
     return 0;
 }
@@ -0,0 +1,84 @@
+#include <iostream>
+#include <vector>
+#include <string>
+#include <cstdlib>
+#ifdef __linux__
+#include <sys/resource.h>
+#endif
+#include "batch.h"
+#include "block_cut_tree.h"
+#include "mtx_reader.h"
+#include "tarjan_parallel.h"
+using namespace std;
+
+// Command-line driver for the multicore Tarjan-Vishkin engine in
+// tarjan_parallel.h, with the same output as tarjan.cpp. With
+// --block-cut-tree the blocks are also written as a block-cut tree file (see
+// block_cut_tree.h); in batch mode the option names a directory that gets one
+// <graph file name>.bct per graph.
+
+// Writes engine's blocks of g as a block-cut tree, charged to "block_cut_tree".
+static bool writeBlocks(const CsrGraph &g, TarjanVishkinParallel &engine, const string &path, PhaseTimer &timer) {
+    BlockCutTree tree;
+    tree.build(g, engine.numEdges, [&](int64_t p) { return engine.blocks.find(engine.edgeOf[p]); });
+    bool ok = tree.write(path);
+    timer.mark("block_cut_tree");
+    return ok;
+}
+
+int main(int argc, char *argv[]) {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+
+    string input_file = "graph.txt";
+    string manifest;
+    string treeOutput;
+    for (int i = 1; i < argc; ++i) {
+        string arg = argv[i];
+        if (arg == "--threads" && i + 1 < argc)
+            omp_set_num_threads(max(1, atoi(argv[++i])));
+        else if (arg == "--batch" && i + 1 < argc)
+            manifest = argv[++i];
+        else if (arg == "--block-cut-tree" && i + 1 < argc)
+            treeOutput = argv[++i];
+        else
+            input_file = arg;
+    }
+    // The graph and the engine's arrays are reused across graphs in batch mode.
+    CsrGraph g;
+    TarjanVishkinParallel engine(g);
+
+    if (!manifest.empty()) {
+        return runManifest(manifest, [&](const string &path) {
+            PhaseTimer phaseTimer;
+            if (!loadGraph(path, g, &phaseTimer)) return batchError("tarjan_parallel", path, "could not open file");
+            engine.timer = &phaseTimer;
+            engine.run();
+            size_t total_memory = g.memoryBytes() + engine.memoryBytes();
+            if (!treeOutput.empty() && !writeBlocks(g, engine, blockCutTreeFile(treeOutput, path), phaseTimer))
+                return batchError("tarjan_parallel", path, "could not write block-cut tree");
+            phaseTimer.mark("output");
+            string extra = ",\"file\":" + jsonQuote(path) + ",\"memory\":" + to_string(total_memory);
+            return phaseTimer.json("tarjan_parallel", g.n, g.m, extra);
+        });
+    }
+
+    PhaseTimer phaseTimer;
+    if (!loadGraph(input_file, g, &phaseTimer)) {
+        cerr << "Error: could not open " << input_file << endl;
+        return 1;
+    }
+    engine.timer = &phaseTimer;
+    engine.run();
+
+    size_t total_memory = g.memoryBytes() + engine.memoryBytes();
+    if (!treeOutput.empty() && !writeBlocks(g, engine, treeOutput, phaseTimer)) {
+        cerr << "Error: could not write " << treeOutput << endl;
+        return 1;
+    }
+    phaseTimer.mark("output");
+
+    cout << phaseTimer.json("tarjan_parallel", g.n, g.m) << '\n';
+    cout << g.n << ' ' << g.m << ' ' << total_memory << '\n';
+    return 0;
+}
@@ -0,0 +1,386 @@
+#ifndef TARJAN_PARALLEL_H
+#define TARJAN_PARALLEL_H
+
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+#include "csr_graph.h"
+#include "parallel_util.h"
+#include "phase_timer.h"
+
+// Multicore Tarjan-Vishkin: the spanning forest comes from a lock-free
+// union-find over the edges, preorder and subtree sizes from an Euler tour
+// ranked by pointer jumping, low/high from range queries over the preorder,
+// and the auxiliary edge graph is contracted with the same union-find.
+// Unlike the serial engine it covers every connected component.
+
+// Range min or max over a fixed array: in-block prefix/suffix values plus a
+// sparse table over blocks of 32, so memory stays O(n) rather than O(n log n).
+template <class Op>
+struct BlockSparseTable {
+    static const int B = 32;
+    std::vector<int> values, prefix, suffix;
+    std::vector<std::vector<int>> table;
+    Op op;
+
+    explicit BlockSparseTable(std::vector<int> v) : values(std::move(v)) {
+        int64_t size = values.size();
+        int64_t blocks = (size + B - 1) / B;
+        prefix.resize(size);
+        suffix.resize(size);
+        table.emplace_back(blocks);
+#pragma omp parallel for
+        for (int64_t b = 0; b < blocks; ++b) {
+            int64_t lo = b * B, hi = std::min(size, lo + B);
+            prefix[lo] = values[lo];
+            for (int64_t i = lo + 1; i < hi; ++i) prefix[i] = op(prefix[i - 1], values[i]);
+            suffix[hi - 1] = values[hi - 1];
+            for (int64_t i = hi - 2; i >= lo; --i) suffix[i] = op(suffix[i + 1], values[i]);
+            table[0][b] = prefix[hi - 1];
+        }
+        for (int k = 1; (int64_t(1) << k) <= blocks; ++k) {
+            const std::vector<int> &prev = table[k - 1];
+            int64_t count = blocks - (int64_t(1) << k) + 1;
+            std::vector<int> level(count);
+#pragma omp parallel for
+            for (int64_t b = 0; b < count; ++b) level[b] = op(prev[b], prev[b + (int64_t(1) << (k - 1))]);
+            table.push_back(std::move(level));
+        }
+    }
+
+    // Op over values[l..r], inclusive.
+    int query(int64_t l, int64_t r) const {
+        int64_t bl = l / B, br = r / B;
+        if (bl == br) {
+            int result = values[l];
+            for (int64_t i = l + 1; i <= r; ++i) result = op(result, values[i]);
+            return result;
+        }
+        int result = op(suffix[l], prefix[r]);
+        if (br - bl > 1) {
+            int k = 63 - __builtin_clzll(br - bl - 1);
+            result = op(result, op(table[k][bl + 1], table[k][br - (int64_t(1) << k)]));
+        }
+        return result;
+    }
+};
+
+struct MinOp {
+    int operator()(int a, int b) const { return a < b ? a : b; }
+};
+struct MaxOp {
+    int operator()(int a, int b) const { return a > b ? a : b; }
+};
+
+struct TarjanVishkinParallel {
+    const CsrGraph &g;
+    PhaseTimer *timer;
+    int n;
+
+    std::vector<int32_t> edgeOf;
+    std::vector<int> edgeU, edgeV;
+    int numEdges = 0;
+
+    std::vector<char> isTreeEdge;
+    std::vector<int> pre, nd, parent, parentEdge, vertexAtPre;
+    std::vector<int> low, high;
+
+    // Auxiliary graph connectivity over edge ids; after labelEdges() the root
+    // of each edge is the smallest edge id of its BCC.
+    ConcurrentDSU blocks{0};
+
+    // BCCs as a CSR of distinct vertices per block, numbered by smallest edge id.
+    std::vector<int64_t> bccOffsets;
+    std::vector<int> bccVertices;
+
+    TarjanVishkinParallel(const CsrGraph &graph, PhaseTimer *phaseTimer = nullptr)
+        : g(graph), timer(phaseTimer), n(graph.n) {}
+
+    void mark(const char *phase) {
+        if (timer) timer->mark(phase);
+    }
+
+    // Edge ids, spanning forest, low/high and the auxiliary-graph unions.
+    void labelEdges() {
+        n = g.n;
+        numEdges = buildEdgeIdsParallel(g, edgeOf, edgeU, edgeV);
+        mark("build");
+        buildSpanningForest();
+        mark("spanning_tree");
+        computeLowHigh();
+        uniteBlocks();
+        mark("connectivity");
+    }
+
+    void run() {
+        labelEdges();
+        collectBlocks();
+        mark("component_labeling");
+    }
+
+    static int64_t findNeighbor(const int32_t *lo, const int32_t *hi, int target) {
+        return std::lower_bound(lo, hi, target) - lo;
+    }
+
+    void buildSpanningForest() {
+        // Every union that joins two sets contributes one forest edge.
+        ConcurrentDSU components(n);
+        isTreeEdge.assign(numEdges, 0);
+#pragma omp parallel for schedule(dynamic, 4096)
+        for (int e = 0; e < numEdges; ++e)
+            if (components.unite(edgeU[e], edgeV[e])) isTreeEdge[e] = 1;
+
+        // Tree adjacency in CSR form with sorted lists; arc a is the a-th entry.
+        std::vector<int64_t> treeOffsets(n + 1, 0);
+        std::vector<std::atomic<int>> treeDegree(n);
+#pragma omp parallel for
+        for (int v = 0; v < n; ++v) treeDegree[v].store(0, std::memory_order_relaxed);
+#pragma omp parallel for schedule(dynamic, 4096)
+        for (int e = 0; e < numEdges; ++e) {
+            if (!isTreeEdge[e]) continue;
+            treeDegree[edgeU[e]].fetch_add(1, std::memory_order_relaxed);
+            treeDegree[edgeV[e]].fetch_add(1, std::memory_order_relaxed);
+        }
+#pragma omp parallel for
+        for (int v = 0; v < n; ++v) treeOffsets[v] = treeDegree[v].load(std::memory_order_relaxed);
+        int64_t arcs = exclusiveScan(treeOffsets);
+        treeOffsets[n] = arcs;
+
+        std::vector<int> treeAdj(arcs);
+#pragma omp parallel for
+        for (int v = 0; v < n; ++v) treeDegree[v].store(0, std::memory_order_relaxed);
+#pragma omp parallel for schedule(dynamic, 4096)
+        for (int e = 0; e < numEdges; ++e) {
+            if (!isTreeEdge[e]) continue;
+            int u = edgeU[e], v = edgeV[e];
+            treeAdj[treeOffsets[u] + treeDegree[u].fetch_add(1, std::memory_order_relaxed)] = v;
+            treeAdj[treeOffsets[v] + treeDegree[v].fetch_add(1, std::memory_order_relaxed)] = u;
+        }
+#pragma omp parallel for schedule(dynamic, 1024)
+        for (int v = 0; v < n; ++v) std::sort(treeAdj.begin() + treeOffsets[v], treeAdj.begin() + treeOffsets[v + 1]);
+
+        // Euler tour successor: after arriving at u from v, leave u by the arc
+        // following v in u's list. The tour of each tree starts at its root's
+        // first arc, so the arc that would wrap back there ends the list.
+        std::vector<int64_t> next(arcs), rankToEnd(arcs), twin(arcs);
+        std::vector<int> arcSource(arcs);
+#pragma omp parallel for schedule(dynamic, 1024)
+        for (int v = 0; v < n; ++v) {
+            for (int64_t a = treeOffsets[v]; a < treeOffsets[v + 1]; ++a) {
+                int u = treeAdj[a];
+                int64_t degree = treeOffsets[u + 1] - treeOffsets[u];
+                int64_t j = findNeighbor(treeAdj.data() + treeOffsets[u], treeAdj.data() + treeOffsets[u + 1], v);
+                int64_t succ = treeOffsets[u] + (j + 1) % degree;
+                arcSource[a] = v;
+                twin[a] = treeOffsets[u] + j;
+                bool closesTour = components.find(u) == u && succ == treeOffsets[u];
+                next[a] = closesTour ? -1 : succ;
+                rankToEnd[a] = closesTour ? 0 : 1;
+            }
+        }
+
+        // List ranking by pointer jumping: rankToEnd becomes the distance from
+        // each arc to the end of its tour.
+        std::vector<int64_t> nextBuffer(arcs), rankBuffer(arcs);
+        bool jumping = arcs > 0;
+        while (jumping) {
+            jumping = false;
+#pragma omp parallel for reduction(|| : jumping)
+            for (int64_t a = 0; a < arcs; ++a) {
+                int64_t succ = next[a];
+                if (succ == -1) {
+                    nextBuffer[a] = -1;
+                    rankBuffer[a] = rankToEnd[a];
+                } else {
+                    nextBuffer[a] = next[succ];
+                    rankBuffer[a] = rankToEnd[a] + rankToEnd[succ];
+                    jumping = jumping || next[succ] != -1;
+                }
+            }
+            next.swap(nextBuffer);
+            rankToEnd.swap(rankBuffer);
+        }
+
+        // Trees in order of their root (the smallest vertex of each component).
+        std::vector<int64_t> rootIndex(n);
+#pragma omp parallel for
+        for (int v = 0; v < n; ++v) rootIndex[v] = components.find(v) == v;
+        int64_t trees = exclusiveScan(rootIndex);
+        std::vector<int> roots(trees);
+        std::vector<int64_t> tourStart(trees + 1), downBefore(trees + 1);
+#pragma omp parallel for
+        for (int v = 0; v < n; ++v) {
+            if (components.find(v) != v) continue;
+            int64_t tourLength = treeOffsets[v + 1] > treeOffsets[v] ? rankToEnd[treeOffsets[v]] + 1 : 0;
+            roots[rootIndex[v]] = v;
+            tourStart[rootIndex[v]] = tourLength;
+            downBefore[rootIndex[v]] = tourLength / 2;
+        }
+        tourStart[trees] = downBefore[trees] = 0;
+        exclusiveScan(tourStart);
+        exclusiveScan(downBefore);
+
+        // Lay the tours out end to end; arc a sits at its tree's start plus its
+        // distance from the tree's first arc. An arc is a down arc if it comes
+        // before its twin.
+        std::vector<int64_t> tourPosition(arcs), downCount(arcs), arcAt(arcs);
+#pragma omp parallel for schedule(dynamic, 4096)
+        for (int64_t a = 0; a < arcs; ++a) {
+            int root = components.find(arcSource[a]);
+            int64_t tree = rootIndex[root];
+            tourPosition[a] = tourStart[tree] + rankToEnd[treeOffsets[root]] - rankToEnd[a];
+            arcAt[tourPosition[a]] = a;
+        }
+#pragma omp parallel for
+        for (int64_t i = 0; i < arcs; ++i) {
+            int64_t a = arcAt[i];
+            downCount[i] = tourPosition[a] < tourPosition[twin[a]];
+        }
+        exclusiveScan(downCount);
+
+        // pre is 1-based like the serial DFS. Tree k's root is numbered after the
+        // k earlier roots and their down arcs; a vertex entered by a down arc is
+        // numbered after the root and the down arcs before it in its tour.
+        pre.assign(n, 0);
+        nd.assign(n, 1);
+        parent.assign(n, -1);
+        parentEdge.assign(n, -1);
+#pragma omp parallel for
+        for (int64_t k = 0; k < trees; ++k) {
+            int r = roots[k];
+            pre[r] = (int)(1 + k + downBefore[k]);
+            nd[r] = (int)((tourStart[k + 1] - tourStart[k]) / 2 + 1);
+        }
+#pragma omp parallel for
+        for (int64_t i = 0; i < arcs; ++i) {
+            int64_t a = arcAt[i];
+            if (tourPosition[a] > tourPosition[twin[a]]) continue;
+            int v = arcSource[a], u = treeAdj[a];
+            int64_t tree = rootIndex[components.find(v)];
+            pre[u] = (int)(1 + tree + downCount[i] + 1);
+            nd[u] = (int)((tourPosition[twin[a]] - tourPosition[a] + 1) / 2);
+            parent[u] = v;
+            parentEdge[u] = edgeOf[g.offsets[v] + findNeighbor(g.begin(v), g.end(v), u)];
+        }
+
+        vertexAtPre.assign(n, 0);
+#pragma omp parallel for
+        for (int v = 0; v < n; ++v) vertexAtPre[pre[v] - 1] = v;
+    }
+
+    // low(v)/high(v): smallest/largest preorder number reachable from v's subtree
+    // by at most one non-tree edge. The subtree is a contiguous preorder range, so
+    // each is one range query over per-vertex values.
+    void computeLowHigh() {
+        std::vector<int> localLow(n), localHigh(n);
+#pragma omp parallel for schedule(dynamic, 1024)
+        for (int i = 0; i < n; ++i) {
+            int v = vertexAtPre[i];
+            int lo = pre[v], hi = pre[v];
+            for (int64_t p = g.offsets[v]; p < g.offsets[v + 1]; ++p) {
+                if (isTreeEdge[edgeOf[p]]) continue;
+                int u = g.adj[p];
+                lo = std::min(lo, pre[u]);
+                hi = std::max(hi, pre[u]);
+            }
+            localLow[i] = lo;
+            localHigh[i] = hi;
+        }
+        BlockSparseTable<MinOp> lowTable(std::move(localLow));
+        BlockSparseTable<MaxOp> highTable(std::move(localHigh));
+
+        low.assign(n, 0);
+        high.assign(n, 0);
+#pragma omp parallel for
+        for (int v = 0; v < n; ++v) {
+            low[v] = lowTable.query(pre[v] - 1, pre[v] + nd[v] - 2);
+            high[v] = highTable.query(pre[v] - 1, pre[v] + nd[v] - 2);
+        }
+    }
+
+    bool isAncestor(int a, int b) const {
+        return pre[a] <= pre[b] && pre[b] < pre[a] + nd[a];
+    }
+
+    // Non-tree edge {u, w} with pre(u) < pre(w): joined with w's parent edge,
+    // and u's and w's parent edges are joined when neither is an ancestor of
+    // the other. Tree edge (v, w) with v = parent(w) not a root: joined with
+    // v's parent edge when w's subtree reaches outside v's subtree.
+    void uniteBlocks() {
+        blocks = ConcurrentDSU(numEdges);
+#pragma omp parallel for schedule(dynamic, 4096)
+        for (int e = 0; e < numEdges; ++e) {
+            if (isTreeEdge[e]) {
+                int w = pre[edgeU[e]] > pre[edgeV[e]] ? edgeU[e] : edgeV[e];
+                int v = parent[w];
+                if (parent[v] != -1 && (low[w] < pre[v] || high[w] >= pre[v] + nd[v]))
+                    blocks.unite(parentEdge[w], parentEdge[v]);
+            } else {
+                int u = edgeU[e], w = edgeV[e];
+                if (pre[u] > pre[w]) std::swap(u, w);
+                blocks.unite(e, parentEdge[w]);
+                if (!isAncestor(u, w))
+                    blocks.unite(parentEdge[u], parentEdge[w]);
+            }
+        }
+    }
+
+    void collectBlocks() {
+        std::vector<int64_t> blockIndex(numEdges);
+#pragma omp parallel for
+        for (int e = 0; e < numEdges; ++e) blockIndex[e] = blocks.find(e) == e;
+        int64_t numBlocks = exclusiveScan(blockIndex);
+
+        std::vector<std::atomic<int64_t>> fill(numBlocks);
+        bccOffsets.assign(numBlocks + 1, 0);
+#pragma omp parallel for
+        for (int64_t b = 0; b < numBlocks; ++b) fill[b].store(0, std::memory_order_relaxed);
+#pragma omp parallel for
+        for (int e = 0; e < numEdges; ++e) fill[blockIndex[blocks.find(e)]].fetch_add(2, std::memory_order_relaxed);
+#pragma omp parallel for
+        for (int64_t b = 0; b < numBlocks; ++b) bccOffsets[b] = fill[b].exchange(0, std::memory_order_relaxed);
+        int64_t entries = exclusiveScan(bccOffsets);
+        bccOffsets[numBlocks] = entries;
+
+        std::vector<int> endpoints(entries);
+#pragma omp parallel for
+        for (int e = 0; e < numEdges; ++e) {
+            int64_t b = blockIndex[blocks.find(e)];
+            int64_t slot = bccOffsets[b] + fill[b].fetch_add(2, std::memory_order_relaxed);
+            endpoints[slot] = edgeU[e];
+            endpoints[slot + 1] = edgeV[e];
+        }
+
+        // Deduplicate each block, then compact.
+        std::vector<int64_t> distinct(numBlocks + 1, 0);
+#pragma omp parallel for schedule(dynamic, 64)
+        for (int64_t b = 0; b < numBlocks; ++b) {
+            auto first = endpoints.begin() + bccOffsets[b], last = endpoints.begin() + bccOffsets[b + 1];
+            std::sort(first, last);
+            distinct[b] = std::unique(first, last) - first;
+        }
+        int64_t total = exclusiveScan(distinct);
+        distinct[numBlocks] = total;
+        bccVertices.resize(total);
+#pragma omp parallel for schedule(dynamic, 64)
+        for (int64_t b = 0; b < numBlocks; ++b)
+            std::copy(endpoints.begin() + bccOffsets[b], endpoints.begin() + bccOffsets[b] + (distinct[b + 1] - distinct[b]),
+                      bccVertices.begin() + distinct[b]);
+        bccOffsets.swap(distinct);
+    }
+
+    // Bytes held after run(), excluding the graph.
+    size_t memoryBytes() const {
+        size_t edge_memory = edgeOf.capacity() * sizeof(int32_t) + (edgeU.capacity() + edgeV.capacity()) * sizeof(int) +
+                             isTreeEdge.capacity();
+        size_t tree_memory = (pre.capacity() + nd.capacity() + parent.capacity() + parentEdge.capacity() +
+                              vertexAtPre.capacity() + low.capacity() + high.capacity()) * sizeof(int);
+        size_t bcc_memory = bccOffsets.capacity() * sizeof(int64_t) + bccVertices.capacity() * sizeof(int);
+        return edge_memory + tree_memory + blocks.memoryBytes() + bcc_memory;
+    }
+};
+
+#endif
@@ -0,0 +1,560 @@
+"""Summaries and figures for every engine's results, loaded in one pass.
+
+Results come from results.db (the latest build of each engine, trials
+aggregated per graph) or from the text result files script.py writes. Either
+way they land in one pandas frame with a row per (engine, graph), sorted by
+edge count once. Engines are paired by graph key (the content hash in
+results.db, the file name in text files), never by position. Summaries are
+grouped aggregations over that frame. Each figure is handed to a worker
+process as plain NumPy arrays and rendered there.
+
+Runs a resource limit stopped (script.py --timeout and friends) are kept as
+censored rows: status names the limit and time is how long the run lasted, a
+lower bound. The summaries count them apart from the aggregates, and the
+figures draw them as hollow markers and hatched bars.
+
+Graphs are split in two classes, sparse and dense by default. With the
+feature index graph_features.py keeps (--features), they can be split on any
+stored feature instead, e.g. --split-by diameter_estimate.
+
+    python Scripts/analytics.py                       # results.db if present
+    python Scripts/analytics.py --results slota=slota_result.txt tarjan=tarjan_result.txt
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+import numpy as np
+import pandas as pd
+from bench_stats import median_ci_rank
+from results_store import ResultsStore
+
+DENSITY_THRESHOLD = 0.005
+MB = 1024 * 1024
+
+RESULT_PATTERN = (r'^(?P<matrix>.*): (?P<time>[\d.]+) seconds, Memory : (?P<memory>\d+) Bytes, '
+                  r'Integers: (?P<vertices>\d+), (?P<edges>\d+)')
+RUSAGE_PATTERN = (r'MaxRSS : (?:(?P<max_rss>\d+) Bytes|unknown(?: Bytes)?)'
+                  r'(?:, RSS bound : (?:(?P<rss_upper_bound>\d+) Bytes|unknown))?, User : (?P<user_time>[\d.]+) seconds, '
+                  r'Sys : (?P<sys_time>[\d.]+) seconds, Faults : (?P<major_faults>\d+) major (?P<minor_faults>\d+) minor, '
+                  r'Switches : (?P<voluntary_switches>\d+) voluntary (?P<involuntary_switches>\d+) involuntary')
+TRIALS_PATTERN = (r'Trials : (?P<trials>\d+) \((?P<kept>\d+) kept\), Median : [\d.]+ seconds, MAD : (?P<mad>[\d.]+) seconds, '
+                  r'CI95 : \[(?P<ci_low>-?[\d.]+|-inf), (?P<ci_high>[\d.]+|inf)\] seconds')
+PHASES_PATTERN = r'Phases : (?P<phases>\{.*\})'
+CENSORED_PATTERN = (r'^(?P<matrix>.*): (?P<time>[\d.]+) seconds, Censored : (?P<status>\w+)'
+                    r'(?:, Integers: (?P<vertices>\d+), (?P<edges>\d+))?')
+
+RUN_COLUMNS = ("graph_hash", "graph_name", "time", "memory", "vertices", "edges", "max_rss", "rss_upper_bound",
+               "user_time", "sys_time", "major_faults", "minor_faults", "voluntary_switches", "involuntary_switches",
+               "phases", "status")
+# How trials of one graph are combined; time gets the outlier-rejected median separately.
+TRIAL_AGGREGATES = {
+    "matrix": "first", "vertices": "first", "edges": "first", "memory": "max", "max_rss": "max", "rss_upper_bound": "max",
+    "user_time": "median", "sys_time": "median", "major_faults": "max", "minor_faults": "median",
+    "voluntary_switches": "median", "involuntary_switches": "median",
+}
+
+ENGINE_LABELS = {"slota": "Slota", "tarjan": "Tarjan", "tarjan_parallel": "Tarjan (parallel)"}
+ENGINE_STYLES = {"slota": ("b", "o"), "tarjan": ("r", "s"), "tarjan_parallel": ("g", "^")}
+METRICS = {
+    "time": ("Time (seconds)", 1.0),
+    "memory": ("Memory (MB)", MB),
+    "max_rss": ("Peak RSS (MB)", MB),
+}
+# Per-graph tick labels are dropped past this many bars; they would only overlap.
+MAX_TICK_LABELS = 80
+
+def engine_label(engine):
+    return ENGINE_LABELS.get(engine, engine)
+
+def engine_style(engine, position):
+    """(color, marker) for an engine; engines without a fixed style take the next colour of the cycle."""
+    return ENGINE_STYLES.get(engine, (f"C{position + 3}", "D"))
+
+def phase_columns(records, index):
+    """Phase timings (JSON text or missing) as phase_<name> columns, in order of first appearance."""
+    parsed = [json.loads(text) if isinstance(text, str) else {} for text in records]
+    return pd.DataFrame.from_records(parsed, index=index).add_prefix("phase_")
+
+def read_result_file(path, engine):
+    """One engine's text result file as a frame, one row per result line (the last line wins for a repeated graph)."""
+    with open(path) as file:
+        lines = pd.Series(file.read().splitlines(), dtype=object)
+    frame = pd.concat([lines.str.extract(pattern) for pattern in (RESULT_PATTERN, RUSAGE_PATTERN, TRIALS_PATTERN)],
+                      axis=1)
+    frame = frame.combine_first(lines.str.extract(CENSORED_PATTERN))
+    phases = lines.str.extract(PHASES_PATTERN)["phases"]
+    matched = frame["time"].notna()
+    frame, phases = frame[matched], phases[matched]
+    numeric = frame.columns.drop(["matrix", "status"])
+    frame[numeric] = frame[numeric].apply(pd.to_numeric)
+    frame["matrix"] = frame["matrix"].str.strip()
+    frame = frame.assign(engine=engine, graph=frame["matrix"]).join(phase_columns(phases, frame.index))
+    return frame.drop_duplicates("graph", keep="last")
+
+def load_text_results(paths):
+    """Frame for {engine: result file path}."""
+    return finish_frame(pd.concat([read_result_file(path, engine) for engine, path in paths.items()],
+                                  ignore_index=True))
+
+def aggregate_trials(runs, k=3.0):
+    """Combine trials into one row per (engine, graph), as bench_stats.summarize_samples does per graph.
+
+    Time is the median after rejecting trials more than k scaled MADs away,
+    with the MAD and a 95% CI of the median from order statistics. The CI is
+    unbounded below 6 kept trials and missing for single runs.
+    """
+    keys = ["engine", "graph"]
+    by_graph = runs.groupby(keys)
+    deviation = (runs["time"] - by_graph["time"].transform("median")).abs()
+    spread = 1.4826 * deviation.groupby([runs["engine"], runs["graph"]]).transform("median")
+    kept = runs.loc[(spread == 0) | (deviation <= k * spread), keys + ["time"]].sort_values(keys + ["time"])
+
+    kept_times = kept.groupby(keys)["time"]
+    median = kept_times.transform("median")
+    count = kept_times.transform("size")
+    rank = kept_times.cumcount() + 1
+    ci_rank = count.map({n: median_ci_rank(n) for n in count.unique()})
+
+    stats = pd.DataFrame({
+        "time": kept_times.median(),
+        "trials": by_graph.size(),
+        "kept": kept_times.size(),
+        "mad": (kept["time"] - median).abs().groupby([kept["engine"], kept["graph"]]).median(),
+    })
+    # Rank 0 (too few trials) never matches, which leaves that bound unbounded
+    for column, selected, unbounded in (("ci_low", rank == ci_rank, -np.inf),
+                                        ("ci_high", rank == count - ci_rank + 1, np.inf)):
+        bound = kept.loc[selected].set_index(keys)["time"]
+        stats[column] = bound.reindex(stats.index).fillna(unbounded)
+    stats.loc[stats["trials"] == 1, ["ci_low", "ci_high"]] = np.nan
+
+    phase_names = [column for column in runs.columns if column.startswith("phase_")]
+    other = by_graph.agg({**TRIAL_AGGREGATES, **{name: "median" for name in phase_names}})
+    return stats.join(other).reset_index()
+
+def censored_runs(runs):
+    """One row per (engine, graph) whose every trial was censored: the longest, its time a lower bound."""
+    keys = ["engine", "graph"]
+    completed = pd.MultiIndex.from_frame(runs.loc[runs["status"] == "ok", keys])
+    stopped = runs[~pd.MultiIndex.from_frame(runs[keys]).isin(completed)]
+    return stopped.sort_values("time").groupby(keys).tail(1).assign(trials=1, kept=0)
+
+def load_db_results(db_path, engines, compiler_flags=None, host=None, variant=None):
+    """Frame for the most recent build of each engine in results.db (optionally a flag set, host or build variant)."""
+    store = ResultsStore(db_path)
+    try:
+        frames = []
+        for engine in engines:
+            build = store.latest_build(engine, compiler_flags, host, variant)
+            if build is None:
+                continue
+            runs = pd.DataFrame.from_records(store.build_runs(engine, build, RUN_COLUMNS), columns=RUN_COLUMNS)
+            frames.append(runs.assign(engine=engine))
+    finally:
+        store.close()
+    if not frames:
+        return finish_frame(pd.DataFrame(columns=["engine", "graph", "matrix", "time", "memory", "vertices", "edges",
+                                                  "status"]))
+    runs = pd.concat(frames, ignore_index=True).rename(columns={"graph_hash": "graph", "graph_name": "matrix"})
+    runs = runs.drop(columns="phases").join(phase_columns(runs["phases"], runs.index))
+    runs["status"] = runs["status"].fillna("ok")
+    completed = runs[runs["status"] == "ok"]
+    parts = [aggregate_trials(completed).assign(status="ok")] if len(completed) else []
+    parts.append(censored_runs(runs))
+    return finish_frame(pd.concat(parts, ignore_index=True))
+
+def finish_frame(frame):
+    """Add density (edges / vertices^2) and the sparse/dense class, then sort by edge count once.
+
+    A censored run that did not learn its graph's size takes it from another
+    engine's run of the same graph. A run whose engine reported no peak RSS
+    (censored, or a later graph of a batch worker) is plotted at its
+    rss_upper_bound instead.
+    """
+    frame["status"] = frame["status"].fillna("ok") if "status" in frame else "ok"
+    if "rss_upper_bound" in frame:
+        frame["max_rss"] = frame["max_rss"].fillna(frame["rss_upper_bound"])
+    for column in ("vertices", "edges"):
+        frame[column] = frame[column].astype(float).fillna(frame.groupby("graph")[column].transform("first"))
+    vertices = frame["vertices"].astype(float)
+    frame["density"] = (frame["edges"] / vertices.pow(2)).where(vertices > 0, 0.0)
+    frame = frame.sort_values(["edges", "graph"], kind="stable").reset_index(drop=True)
+    return classify(frame)
+
+def classify(frame, feature="density", threshold=None):
+    """Set graph_class by splitting graphs in two at threshold on one column.
+
+    Density splits into sparse and dense (at 0.005 by default). Any other
+    feature splits into "feature < t" and "feature >= t", at the median over
+    graphs by default. Graphs without a value for the feature are dropped.
+    The classes are the ordered categories of graph_class.
+    """
+    frame = frame[frame[feature].notna()].copy()
+    if feature == "density":
+        threshold = DENSITY_THRESHOLD if threshold is None else threshold
+        labels = ("sparse", "dense")
+    else:
+        if threshold is None:
+            values = frame.drop_duplicates("graph")[feature].astype(float)
+            threshold = float(values.median()) if len(values) else 0.0
+        labels = (f"{feature} < {threshold:g}", f"{feature} >= {threshold:g}")
+    split = np.where(frame[feature].astype(float) < threshold, labels[0], labels[1])
+    frame["graph_class"] = pd.Categorical(split, categories=labels, ordered=True)
+    return frame
+
+def graph_classes(frame):
+    return tuple(frame["graph_class"].cat.categories)
+
+def class_title(graph_class):
+    return f"{graph_class.capitalize()} Graphs" if graph_class in ("sparse", "dense") else f"Graphs with {graph_class}"
+
+def load_features(index_path):
+    """The graph_features.py sidecar index as a frame indexed by content hash, with a name column."""
+    with open(index_path) as f:
+        entries = json.load(f)
+    features = pd.DataFrame.from_dict(entries, orient="index").drop(columns="version", errors="ignore")
+    # The CSR's vertex and edge counts are already in the results under the same names.
+    return features.drop(columns=["vertices", "edges"], errors="ignore")
+
+def attach_features(frame, features):
+    """Join features onto results by content hash, or by file name for rows keyed by name (text results)."""
+    by_hash = features.drop(columns="name").reindex(frame["graph"]).set_axis(frame.index)
+    by_name = features.drop_duplicates("name").set_index("name").reindex(frame["matrix"]).set_axis(frame.index)
+    return frame.join(by_hash.combine_first(by_name)[features.columns.drop("name")])
+
+def summarize(frame, baseline):
+    """Per class and engine: graph count and mean/median time and memory, plus each engine's ratios to baseline.
+
+    mean_ratio and median_ratio divide class aggregates, as the old plots
+    printed them. paired_ratio is the median of per-graph ratios over the
+    graphs both engines ran, which is not skewed by one engine covering more
+    or larger graphs. Censored runs only bound their time from below, so they
+    are left out of the aggregates and counted in censored instead.
+    """
+    stopped = frame["status"] != "ok"
+    censored = frame[stopped].groupby(["graph_class", "engine"], observed=True).size().rename("censored")
+    frame = frame[~stopped]
+    summary = frame.assign(memory_mb=frame["memory"] / MB).groupby(["graph_class", "engine"], observed=True).agg(
+        graphs=("graph", "size"), mean_time=("time", "mean"), median_time=("time", "median"),
+        mean_memory_mb=("memory_mb", "mean"), median_memory_mb=("memory_mb", "median"))
+    summary = summary.join(censored, how="outer").fillna({"graphs": 0, "censored": 0}).astype(
+        {"graphs": int, "censored": int})
+
+    ratios = {}
+    for metric in ("time", "memory"):
+        base = summary.xs(baseline, level="engine")
+        column = metric if metric == "time" else "memory_mb"
+        ratios[f"mean_{metric}_ratio"] = summary[f"mean_{column}"].div(base[f"mean_{column}"], level="graph_class")
+        ratios[f"median_{metric}_ratio"] = summary[f"median_{column}"].div(base[f"median_{column}"], level="graph_class")
+        paired = frame.pivot_table(index=["graph_class", "graph"], columns="engine", values=metric, observed=True)
+        paired = paired.div(paired[baseline], axis=0).stack().rename_axis(["graph_class", "graph", "engine"])
+        ratios[f"paired_{metric}_ratio"] = paired.groupby(level=["graph_class", "engine"], observed=True).median()
+    return summary, pd.DataFrame(ratios).drop(index=baseline, level="engine", errors="ignore")
+
+def paired_values(frame, metric, engines):
+    """Graph info plus one metric column per engine, for graphs every engine ran (inner join on graph key)."""
+    values = frame.pivot(index="graph", columns="engine", values=metric).reindex(columns=engines).dropna()
+    info = frame.drop_duplicates("graph").set_index("graph")[["matrix", "edges", "graph_class"]]
+    return info.join(values, how="inner").sort_values(["edges", "matrix"], kind="stable")
+
+def time_error_bars(rows):
+    """Asymmetric yerr (median to CI bounds) as a 2 x n array, or None when no row carries a CI."""
+    if "ci_low" not in rows or rows["ci_low"].isna().all():
+        return None
+    time = rows["time"].to_numpy()
+    lower = np.clip(time - rows["ci_low"].to_numpy(), 0.0, None)
+    upper = np.clip(rows["ci_high"].to_numpy() - time, 0.0, None)
+    # Clip so bars stay drawable on log axes; an unbounded CI (too few trials) spans [~0, 2x median]
+    lower = np.minimum(np.nan_to_num(lower, nan=0.0), time * 0.999)
+    upper = np.minimum(np.nan_to_num(upper, nan=0.0), time)
+    return np.array([lower, upper])
+
+def class_series(frame, engines, metric, error_bars=False):
+    """{class: [(engine, edges, values, yerr, stopped)]} with NumPy arrays, in edge order, for comparison figures.
+
+    stopped marks censored runs; their values are lower bounds and they get no error bars.
+    """
+    scale = METRICS[metric][1]
+    groups = dict(tuple(frame.groupby(["graph_class", "engine"], sort=False, observed=True)))
+    series = {}
+    for graph_class in graph_classes(frame):
+        series[graph_class] = []
+        for engine in engines:
+            rows = groups.get((graph_class, engine), frame.iloc[:0])
+            rows = rows[rows[metric].notna()]
+            stopped = (rows["status"] != "ok").to_numpy()
+            yerr = time_error_bars(rows[~stopped]) if error_bars else None
+            series[graph_class].append((engine, rows["edges"].to_numpy(), rows[metric].to_numpy() / scale, yerr,
+                                        stopped))
+    return series
+
+def draw_bars(ax, x, heights, width, bottom=0.0, **style):
+    """Vertical bars as one PolyCollection, which draws far faster than a Rectangle patch per bar."""
+    bottom = np.broadcast_to(np.asarray(bottom, dtype=float), np.shape(heights))
+    top = bottom + heights
+    left, right = x - width / 2, x + width / 2
+    corners = [(left, bottom), (left, top), (right, top), (right, bottom)]
+    bars = PolyCollection(np.stack([np.column_stack(corner) for corner in corners], axis=1), **style)
+    ax.add_collection(bars)
+    return bars
+
+def plot_comparison(series, title, ylabel, style="line"):
+    """Metric vs edges on log axes, sparse and dense side by side, one line or point cloud per engine.
+
+    Censored runs are drawn apart as hollow markers at their lower bound.
+    """
+    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+    fig.suptitle(title, fontsize=16)
+    for ax, graph_class in zip(axes, series):
+        counts = []
+        for position, (engine, edges, values, yerr, stopped) in enumerate(series[graph_class]):
+            color, marker = engine_style(engine, position)
+            if stopped.any():
+                ax.scatter(edges[stopped], values[stopped], marker=marker, s=60, facecolors="none", edgecolors=color,
+                           linewidths=1.5, label=f"{engine_label(engine)} (stopped, lower bound)")
+                counts.append(f"{engine_label(engine)} stopped={stopped.sum()}")
+            edges, values = edges[~stopped], values[~stopped]
+            if style == "scatter":
+                ax.scatter(edges, values, color=color, label=engine_label(engine), alpha=0.7)
+                if yerr is not None:
+                    ax.errorbar(edges, values, yerr=yerr, fmt="none", ecolor=color, capsize=2, alpha=0.5)
+            else:
+                ax.errorbar(edges, values, yerr=yerr, fmt="-", color=color, marker=marker, markersize=4, capsize=2, alpha=0.7, label=engine_label(engine))
+            counts.append(f"{engine_label(engine)} n={len(edges)}")
+        ax.set_xlabel("Number of Edges")
+        ax.set_ylabel(ylabel)
+        ax.set_title(f"{class_title(graph_class)} ({', '.join(counts)})")
+        ax.grid(True, linestyle="--", alpha=0.7)
+        ax.legend(loc="upper left")
+        # An empty class has nothing to put on a log axis
+        if any(len(edges) for _, edges, _, _, _ in series[graph_class]):
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+    plt.tight_layout(rect=[0, 0, 1, 0.95])  # Adjust to make room for the title
+    return fig
+
+def plot_double_bar(labels, first, second, engines, title, ylabel, first_stopped=None, second_stopped=None):
+    """Overlapping bars per graph for two engines on a log axis, the smaller value drawn narrower in front.
+
+    Bars of censored runs (first_stopped, second_stopped) are hatched; their height is a lower bound.
+    """
+    x = np.arange(len(labels))
+    width = 0.4
+    fig, ax = plt.subplots(figsize=(16, 8))
+    ax.set_title(title, fontsize=16)
+    # Log axis: bars start just below the smallest value instead of at zero
+    floor = min(first.min(), second.min()) / 2
+    first_in_front = first <= second
+    no_stops = np.zeros(len(labels), dtype=bool)
+    for engine, values, other, in_front, stopped, position in (
+            (engines[0], first, second, first_in_front, first_stopped, 0),
+            (engines[1], second, first, ~first_in_front, second_stopped, 1)):
+        color = engine_style(engine, position)[0]
+        draw_bars(ax, x[~in_front], values[~in_front] - floor, width, floor, color=color, alpha=0.4, zorder=1,
+                  label=engine_label(engine))
+        draw_bars(ax, x[in_front], values[in_front] - floor, width * 0.7, floor, color=color, alpha=0.9, zorder=2)
+        stopped = no_stops if stopped is None else stopped
+        # A bar behind is only hatched above the other engine's bar in front of it
+        label = f"{engine_label(engine)} stopped (lower bound)"
+        for front, bar_width, bottom in ((False, width, other), (True, width * 0.7, np.full(len(labels), floor))):
+            hatched = stopped & (in_front == front)
+            if hatched.any():
+                draw_bars(ax, x[hatched], values[hatched] - bottom[hatched], bar_width, bottom[hatched],
+                          facecolor="none", edgecolor="k", hatch="//", zorder=3, label=label)
+                label = None
+    ax.set_yscale("log")
+    ax.set_xlim(-0.5, len(labels) - 0.5)
+    ax.set_ylim(floor, max(first.max(), second.max()) * 1.5)
+    ax.set_xlabel("Graph Dataset")
+    ax.set_ylabel(ylabel)
+    if len(labels) <= MAX_TICK_LABELS:
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.legend(loc="upper left")
+    ax.grid(True, linestyle="--", alpha=0.5, axis="y")
+    plt.tight_layout()
+    return fig
+
+def plot_phase_breakdown(labels, phases, title):
+    """Stacked per-phase time bars, one bar per graph in edge order."""
+    x = np.arange(len(labels))
+    fig, ax = plt.subplots(figsize=(16, 8))
+    ax.set_title(title, fontsize=16)
+    bottom = np.zeros(len(labels))
+    for name, values in phases.items():
+        draw_bars(ax, x, values, 0.6, bottom.copy(), color=f"C{len(ax.collections)}", label=name)
+        bottom += values
+    ax.set_xlim(-0.5, len(labels) - 0.5)
+    ax.set_ylim(0, bottom.max() * 1.05 if len(labels) else 1)
+    ax.set_xlabel("Graph Dataset")
+    ax.set_ylabel("Time (seconds)")
+    if len(labels) <= MAX_TICK_LABELS:
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.legend(loc="upper left")
+    ax.grid(True, linestyle="--", alpha=0.5, axis="y")
+    plt.tight_layout()
+    return fig
+
+def plot_average_degree(vertices, edges):
+    """Average degree proxy E / V against V on log axes, one point per graph."""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.scatter(vertices, edges / vertices, color="blue", edgecolors="k")
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Number of Vertices (log scale)")
+    ax.set_ylabel("Graph Density = E / V (log scale)")
+    ax.set_title("Scatter Plot of Graph Density vs Number of Vertices")
+    ax.grid(True, which="both", ls="--", linewidth=0.5)
+    return fig
+
+def render_figure(job):
+    """Worker entry point: draw one figure from its arrays and save it."""
+    path, function, kwargs, dpi = job
+    fig = function(**kwargs)
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+def figure_jobs(frame, engines, output_dir, styles=("line", "scatter"), dpi=300):
+    """(path, plot function, arrays, dpi) for every figure; all slicing happens here, once."""
+    versus = " vs ".join(engine_label(engine) for engine in engines)
+    jobs = []
+
+    def add(name, function, **kwargs):
+        jobs.append((os.path.join(output_dir, name), function, kwargs, dpi))
+
+    for style in styles:
+        suffix = "" if style == "line" else f"_{style}"
+        add(f"time_comparison{suffix}.png", plot_comparison, series=class_series(frame, engines, "time", True),
+            title=f"Time Analysis: {versus}", ylabel=METRICS["time"][0], style=style)
+        add(f"memory_comparison{suffix}.png", plot_comparison, series=class_series(frame, engines, "memory"),
+            title=f"Memory Analysis: {versus}", ylabel=METRICS["memory"][0], style=style)
+        if frame["max_rss"].notna().any():
+            add(f"memory_comparison_rss{suffix}.png", plot_comparison, series=class_series(frame, engines, "max_rss"),
+                title=f"Memory Analysis: {versus} (peak RSS)", ylabel=METRICS["max_rss"][0], style=style)
+
+    if len(engines) >= 2:
+        pair = engines[:2]
+        stopped = frame.pivot(index="graph", columns="engine", values="status").reindex(columns=pair) != "ok"
+        for metric, (ylabel, scale) in METRICS.items():
+            if frame[metric].isna().all():
+                continue
+            paired = paired_values(frame, metric, pair)
+            for position, graph_class in enumerate(graph_classes(frame)):
+                rows = paired[paired["graph_class"] == graph_class]
+                if rows.empty:
+                    continue
+                name = "rss" if metric == "max_rss" else metric
+                suffix = graph_class if graph_class in ("sparse", "dense") else ("low", "high")[position]
+                add(f"double_bar_{name}_{suffix}.png", plot_double_bar, labels=rows["matrix"].to_numpy(),
+                    first=rows[pair[0]].to_numpy() / scale, second=rows[pair[1]].to_numpy() / scale, engines=pair,
+                    first_stopped=stopped.loc[rows.index, pair[0]].to_numpy(),
+                    second_stopped=stopped.loc[rows.index, pair[1]].to_numpy(),
+                    title=f"{name.capitalize()} Comparison: {engine_label(pair[0])} vs {engine_label(pair[1])} "
+                          f"({class_title(graph_class)})", ylabel=ylabel)
+
+    phase_names = [column for column in frame.columns if column.startswith("phase_")]
+    for engine, rows in frame.groupby("engine", sort=False):
+        rows = rows.dropna(subset=phase_names, how="all")
+        if rows.empty:
+            continue
+        phases = {name[len("phase_"):]: rows[name].fillna(0.0).to_numpy()
+                  for name in phase_names if rows[name].notna().any()}
+        add(f"phases_{engine}.png", plot_phase_breakdown, labels=rows["matrix"].to_numpy(), phases=phases,
+            title=f"Per-Phase Time Breakdown: {engine_label(engine)}")
+
+    graphs = frame.drop_duplicates("graph")
+    graphs = graphs[graphs["vertices"] > 1]
+    add("degree_vs_vertices.png", plot_average_degree, vertices=graphs["vertices"].to_numpy(float),
+        edges=graphs["edges"].to_numpy(float))
+    return jobs
+
+def render_figures(jobs, workers=None):
+    """Render every job, in parallel worker processes unless workers is 1; returns the saved paths."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [render_figure(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(render_figure, jobs))
+
+def print_summary(frame, engines):
+    counts = frame.groupby(["engine", "graph_class"], observed=False).size().unstack(fill_value=0)
+    counts = counts.reindex(engines, fill_value=0)
+    print(f"Total graphs: {frame['graph'].nunique()}")
+    for engine, row in counts.iterrows():
+        print(f"{engine_label(engine)} - " + ", ".join(f"{class_title(c)}: {row[c]}" for c in graph_classes(frame)))
+    summary, ratios = summarize(frame, engines[0])
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print("\nPerformance Summary (time in seconds, memory in MB):")
+        print(summary.round(4).to_string())
+        if not ratios.empty:
+            print(f"\nRelative Performance (engine / {engine_label(engines[0])}):")
+            print(ratios.round(2).to_string())
+
+def parse_result_paths(items):
+    paths = {}
+    for item in items:
+        engine, sep, path = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"expected ENGINE=FILE, got {item}")
+        paths[engine] = path
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize results and draw the comparison figures.")
+    parser.add_argument("--db", default="results.db", help="results database, used when it exists")
+    parser.add_argument("--results", nargs="+", metavar="ENGINE=FILE",
+                        help="read text result files instead of the database")
+    parser.add_argument("--engines", nargs="+", default=["slota", "tarjan"],
+                        help="engines to load from the database; the first is the ratio baseline")
+    parser.add_argument("--variant", help="only use builds of this variant (e.g. O3-pgo)")
+    parser.add_argument("--host", help="only use results from this host")
+    parser.add_argument("--style", choices=["line", "scatter", "both"], default="both")
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--workers", type=int, help="figure rendering processes (default: one per CPU)")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--no-figures", action="store_true", help="print the summary only")
+    parser.add_argument("--features", default="graph_features.json",
+                        help="graph_features.py index joined onto the results when it exists")
+    parser.add_argument("--split-by", default="density",
+                        help="column to split graphs into two classes on, e.g. a feature such as degree_max")
+    parser.add_argument("--split-at", type=float,
+                        help="split threshold (default 0.005 for density, otherwise the median over graphs)")
+    args = parser.parse_args()
+
+    if args.results:
+        paths = parse_result_paths(args.results)
+        frame, engines = load_text_results(paths), list(paths)
+    elif os.path.exists(args.db):
+        frame = load_db_results(args.db, args.engines, host=args.host, variant=args.variant)
+        engines = args.engines
+    else:
+        paths = {engine: f"{engine}_result.txt" for engine in args.engines}
+        frame, engines = load_text_results(paths), args.engines
+    if os.path.exists(args.features):
+        frame = attach_features(frame, load_features(args.features))
+    if args.split_by not in frame.columns:
+        raise SystemExit(f"Unknown column {args.split_by}; features come from --features ({args.features})")
+    if args.split_by != "density" or args.split_at is not None:
+        frame = classify(frame, args.split_by, args.split_at)
+    engines = [engine for engine in engines if (frame["engine"] == engine).any()]
+    if not engines:
+        print("No results found.")
+        return
+
+    print_summary(frame, engines)
+    if args.no_figures:
+        return
+    os.makedirs(args.output_dir, exist_ok=True)
+    styles = ("line", "scatter") if args.style == "both" else (args.style,)
+    saved = render_figures(figure_jobs(frame, engines, args.output_dir, styles, args.dpi), args.workers)
+    print(f"\nSaved {len(saved)} figures to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
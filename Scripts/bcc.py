@@ -0,0 +1,54 @@
+"""In-process biconnected components through the engines' C++ code.
+
+Both functions take a symmetric CSR adjacency without self-loops whose rows
+are sorted and duplicate-free, e.g. a SciPy matrix A prepared with
+A = (A + A.T).tocsr(); A.setdiag(0); A.eliminate_zeros(); A.sort_indices()
+and called as slota_bcc(A.indptr, A.indices). int32 indices and int64 or
+int32 indptr are read in place. They return (articulation_points, labels):
+sorted int32 vertex ids, and an int32 BCC label per entry of indices, with
+both directions of an edge sharing a label. Labels are numbered 0.. in order
+of each BCC's first edge, so both engines return identical arrays. The GIL is
+released during the computation, so threads can run graphs concurrently.
+block_cut_tree() returns the serialized block-cut tree of the same input,
+which block_cut_tree.BlockCutTree loads and queries.
+
+The extension is compiled from Code/bcc_module.cpp on first use and cached in
+$BCC_BUILD_DIR (default: builds/ at the repository root).
+"""
+import importlib.util
+import os
+import numpy as np
+from build_engines import build_extension
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_extension = None
+
+def _load_extension():
+    global _extension
+    if _extension is None:
+        build_dir = os.environ.get("BCC_BUILD_DIR", os.path.join(REPO_ROOT, "builds"))
+        library = build_extension(os.path.join(REPO_ROOT, "Code", "bcc_module.cpp"), build_dir)
+        spec = importlib.util.spec_from_file_location("_bcc", library)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _extension = module
+    return _extension
+
+def _as_arrays(result):
+    articulation, labels = result
+    return np.frombuffer(articulation, dtype=np.int32), np.frombuffer(labels, dtype=np.int32)
+
+def slota_bcc(indptr, indices, threads=0):
+    """BCCs by the Slota-Madduri BFS exclusion checks; threads=0 uses the OpenMP default."""
+    return _as_arrays(_load_extension().slota_bcc(indptr, indices, threads))
+
+def tarjan_vishkin_bcc(indptr, indices, threads=0):
+    """BCCs by the parallel Tarjan-Vishkin engine; threads=0 uses the OpenMP default."""
+    return _as_arrays(_load_extension().tarjan_vishkin_bcc(indptr, indices, threads))
+
+def block_cut_tree(indptr, indices, engine="tarjan_vishkin", threads=0):
+    """Block-cut tree file contents (layout in Code/block_cut_tree.h) from engine "slota" or "tarjan_vishkin"."""
+    if engine not in ("slota", "tarjan_vishkin"):
+        raise ValueError(f"Unknown engine: {engine}")
+    return getattr(_load_extension(), f"{engine}_block_cut_tree")(indptr, indices, threads)
@@ -0,0 +1,515 @@
+"""Local BCC job server that keeps hot graphs resident in memory.
+
+Services that ask for the BCCs of the same few large graphs many times a
+minute pay for a process start and a full parse on every engine run. The
+server loads each graph once, keeps it in an LRU cache under a memory budget
+and answers over a Unix socket or localhost HTTP:
+
+  POST /bcc    {"graph": path, "engine": "tarjan_vishkin", "articulation_points": false}
+               vertices, edges, blocks and the articulation point count (and ids)
+  POST /query  {"graph": path, "engine": "tarjan_vishkin", "query": "same_block", "pairs": [[u, v], ...]}
+               one answer per pair: connected, same_block, separator_counts or separators
+  GET  /stats  latency p50/p99 per endpoint, throughput, cache hit rates, evictions and queue depth
+
+Jobs run on a thread pool through the bcc extension, which releases the GIL,
+so every worker reads the one resident copy of a graph. Results (BCC labels,
+block-cut trees with their query index) are kept with their graph and count
+against the budget; the least recently used graphs are evicted with their
+results. A request for a graph that is still loading, or for a result that
+is still being computed, waits on that job instead of starting another. A
+graph file that changed on disk (size or mtime) is loaded again.
+
+    python Scripts/bcc_server.py serve --socket bcc.sock --memory-budget-mb 4096
+    python Scripts/bcc_server.py stats --socket bcc.sock
+    python Scripts/bcc_server.py bench --socket bcc.sock graph1.csr graph2.csr --requests 2000 --concurrency 16
+    curl --unix-socket bcc.sock http://localhost/stats
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import bcc
+from block_cut_tree import BlockCutTree
+from csr_cache import csr_from_entries, read_csr_header, read_entries
+from graph_features import map_csr
+from scheduler import graph_size
+
+ENGINES = ("slota", "tarjan_vishkin")
+QUERIES = ("connected", "same_block", "separator_counts", "separators")
+# Latencies kept per endpoint for the percentiles, and the window recent throughput is measured over.
+LATENCY_SAMPLES = 10000
+THROUGHPUT_WINDOW = 10.0
+MAX_BODY = 1 << 30
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+def load_csr(path):
+    """(indptr, indices) of a graph file in memory, with sorted duplicate-free rows as bcc.py needs them."""
+    if read_csr_header(path) is not None:
+        _n, _m, offsets, neighbors = map_csr(path)
+        return np.array(offsets), np.array(neighbors)
+    offsets, neighbors, _, _ = csr_from_entries(*read_entries(path))
+    return offsets, neighbors
+
+def graph_identity(path):
+    """(real path, size, mtime) of a graph file; a different identity means the file changed."""
+    path = os.path.realpath(path)
+    info = os.stat(path)
+    return path, info.st_size, info.st_mtime_ns
+
+def array_bytes(value):
+    """Bytes held by the NumPy arrays of a result (a tuple of arrays or a BlockCutTree)."""
+    items = vars(value).values() if isinstance(value, BlockCutTree) else value
+    total = 0
+    for item in items:
+        if isinstance(item, np.ndarray):
+            total += item.nbytes
+        elif isinstance(item, list):
+            total += sum(part.nbytes for part in item if isinstance(part, np.ndarray))
+    if isinstance(value, BlockCutTree):
+        total += value.data.nbytes
+    return total
+
+def compute_bcc(indptr, indices, engine, threads):
+    """(articulation points, labels, block count) of a resident graph."""
+    articulation, labels = getattr(bcc, f"{engine}_bcc")(indptr, indices, threads)
+    return articulation, labels, int(labels.max()) + 1 if len(labels) else 0
+
+def compute_tree(indptr, indices, engine, threads):
+    return BlockCutTree.from_csr(indptr, indices, engine, threads)
+
+def answer_query(tree, query, pairs):
+    """One JSON-ready answer per (u, v) row of pairs."""
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    u, v = pairs[:, 0], pairs[:, 1]
+    if query == "separators":
+        offsets, vertices = tree.separators(u, v)
+        return [vertices[offsets[i]:offsets[i + 1]].tolist() for i in range(len(u))]
+    return getattr(tree, query)(u, v).tolist()
+
+def percentiles(samples):
+    if not samples:
+        return {"count": 0}
+    values = np.fromiter(samples, dtype=float)
+    p50, p99 = np.percentile(values, [50, 99])
+    return {"count": len(values), "p50": p50, "p99": p99, "mean": float(values.mean())}
+
+class GraphEntry:
+    """A resident graph and the results computed on it, keyed by (kind, engine)."""
+
+    def __init__(self, identity, indptr, indices):
+        self.identity = identity
+        self.indptr, self.indices = indptr, indices
+        self.results = {}
+        self.nbytes = indptr.nbytes + indices.nbytes
+
+class BccServer:
+    """The cache, the worker pool and the counters behind the HTTP endpoints.
+
+    Everything except the job functions runs on the event loop, so the cache
+    needs no lock. A graph larger than the whole budget is still served, and
+    stays cached alone until another graph is requested.
+    """
+
+    def __init__(self, memory_budget, workers=4, threads=0):
+        self.memory_budget = memory_budget
+        self.threads = threads
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.cache = OrderedDict()
+        self.cached_bytes = 0
+        self.in_flight = {}
+        self.started = time.time()
+        self.counts = {"graph_hits": 0, "graph_misses": 0, "result_hits": 0, "result_misses": 0, "coalesced": 0,
+                       "loads": 0, "evictions": 0}
+        self.errors = 0
+        self.latencies = {}
+        self.requests = {}
+        self.completions = deque(maxlen=LATENCY_SAMPLES * 10)
+        self._job_lock = threading.Lock()
+        self.queued = self.running = 0
+
+    async def run_job(self, function, *args):
+        """Run function(*args) on the pool, counting it as queued until a worker picks it up."""
+        def job():
+            with self._job_lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return function(*args)
+            finally:
+                with self._job_lock:
+                    self.running -= 1
+
+        with self._job_lock:
+            self.queued += 1
+        return await asyncio.get_running_loop().run_in_executor(self.executor, job)
+
+    async def shared(self, key, make):
+        """The result of the job for key, started with make() unless the same job is already in flight."""
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(make())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        else:
+            self.counts["coalesced"] += 1
+        # One client going away must not cancel the job for the others.
+        return await asyncio.shield(task)
+
+    async def graph(self, path):
+        identity = graph_identity(path)
+        entry = self.cache.get(identity[0])
+        if entry is not None and entry.identity == identity:
+            self.cache.move_to_end(identity[0])
+            self.counts["graph_hits"] += 1
+            return entry
+        self.counts["graph_misses"] += 1
+
+        async def load():
+            indptr, indices = await self.run_job(load_csr, identity[0])
+            entry = GraphEntry(identity, indptr, indices)
+            self.counts["loads"] += 1
+            stale = self.cache.pop(identity[0], None)
+            if stale is not None:
+                self.cached_bytes -= stale.nbytes
+            self.cache[identity[0]] = entry
+            self.cached_bytes += entry.nbytes
+            self.evict()
+            return entry
+        return await self.shared(("graph", *identity), load)
+
+    async def result(self, entry, kind, engine):
+        key = (kind, engine)
+        if key in entry.results:
+            self.counts["result_hits"] += 1
+            return entry.results[key]
+        self.counts["result_misses"] += 1
+
+        async def compute():
+            function = compute_bcc if kind == "bcc" else compute_tree
+            value = await self.run_job(function, entry.indptr, entry.indices, engine, self.threads)
+            entry.results[key] = value
+            size = array_bytes(value)
+            entry.nbytes += size
+            # An entry evicted while its job ran keeps the result for this request only.
+            if self.cache.get(entry.identity[0]) is entry:
+                self.cached_bytes += size
+                self.evict()
+            return value
+        return await self.shared((kind, engine, *entry.identity), compute)
+
+    def evict(self):
+        """Drop least recently used graphs until the cache fits the budget, always keeping the newest."""
+        while self.cached_bytes > self.memory_budget and len(self.cache) > 1:
+            _, entry = self.cache.popitem(last=False)
+            self.cached_bytes -= entry.nbytes
+            self.counts["evictions"] += 1
+
+    async def handle_bcc(self, request):
+        engine = request.get("engine", "tarjan_vishkin")
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+        entry = await self.graph(request["graph"])
+        articulation, labels, blocks = await self.result(entry, "bcc", engine)
+        response = {"graph": entry.identity[0], "engine": engine, "vertices": len(entry.indptr) - 1,
+                    "edges": len(entry.indices) // 2, "blocks": blocks, "articulation_point_count": len(articulation)}
+        if request.get("articulation_points"):
+            response["articulation_points"] = articulation.tolist()
+        return response
+
+    async def handle_query(self, request):
+        engine = request.get("engine", "tarjan_vishkin")
+        query = request.get("query", "same_block")
+        if engine not in ENGINES or query not in QUERIES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)} and query one of {', '.join(QUERIES)}")
+        entry = await self.graph(request["graph"])
+        tree = await self.result(entry, "tree", engine)
+        return {"query": query, "results": await self.run_job(answer_query, tree, query, request.get("pairs", []))}
+
+    def stats(self):
+        now = time.time()
+        uptime = now - self.started
+        recent = sum(1 for t in self.completions if t >= now - THROUGHPUT_WINDOW)
+        counts = self.counts
+        graph_lookups = counts["graph_hits"] + counts["graph_misses"]
+        result_lookups = counts["result_hits"] + counts["result_misses"]
+        with self._job_lock:
+            queued, running = self.queued, self.running
+        return {
+            "uptime": uptime,
+            "requests": dict(self.requests),
+            "errors": self.errors,
+            "throughput": {"overall": sum(self.requests.values()) / uptime if uptime else 0.0,
+                           "recent": recent / min(THROUGHPUT_WINDOW, uptime) if uptime else 0.0},
+            "latency": {endpoint: percentiles(samples) for endpoint, samples in self.latencies.items()},
+            "cache": {"graphs": len(self.cache), "bytes": self.cached_bytes, "budget": self.memory_budget,
+                      "graph_hit_rate": counts["graph_hits"] / graph_lookups if graph_lookups else None,
+                      "result_hit_rate": counts["result_hits"] / result_lookups if result_lookups else None,
+                      **counts},
+            "queue": {"queued": queued, "running": running, "in_flight": len(self.in_flight)},
+        }
+
+    async def dispatch(self, method, target, body):
+        """(status, response dict) for one request."""
+        routes = {"/bcc": self.handle_bcc, "/query": self.handle_query}
+        if target == "/stats":
+            return (200, self.stats()) if method == "GET" else (405, {"error": "use GET"})
+        if target not in routes:
+            return 404, {"error": f"no endpoint {target}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        start = time.perf_counter()
+        try:
+            request = json.loads(body or b"{}")
+            status, response = 200, await routes[target](request)
+        except (ValueError, KeyError, TypeError, OSError) as error:
+            status, response = 400, {"error": f"{type(error).__name__}: {error}"}
+        except Exception as error:  # keep serving; the client gets the message
+            status, response = 500, {"error": f"{type(error).__name__}: {error}"}
+        if status != 200:
+            self.errors += 1
+        self.latencies.setdefault(target, deque(maxlen=LATENCY_SAMPLES)).append(time.perf_counter() - start)
+        self.requests[target] = self.requests.get(target, 0) + 1
+        self.completions.append(time.time())
+        return status, response
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                request = await read_http(reader, request=True, writer=writer)
+                if request is None:
+                    break
+                (method, target), headers, body = request
+                status, response = await self.dispatch(method, target.split("?", 1)[0], body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(format_http(f"HTTP/1.1 {status} {REASONS[status]}", json.dumps(response).encode(),
+                                         keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host="127.0.0.1", port=8642):
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle_connection, socket_path)
+            where = socket_path
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            where = f"http://{host}:{port}"
+        print(f"Serving on {where} with a {self.memory_budget / 2**20:.0f} MB cache")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+async def read_http(reader, request, writer=None):
+    """((method, target) or (status,), headers, body) of the next HTTP message, or None at end of stream.
+
+    A request that expects 100-continue (curl sends that for larger bodies) gets it on writer.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) < 2:
+        raise ValueError(f"malformed start line {line!r}")
+    start = (parts[0], parts[1]) if request else (int(parts[1]),)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise ValueError("body too large")
+    if writer is not None and headers.get("expect", "").lower() == "100-continue":
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        await writer.drain()
+    return start, headers, await reader.readexactly(length)
+
+def format_http(start_line, body, keep_alive=True, extra=""):
+    return (f"{start_line}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n{extra}\r\n").encode("latin-1") + body
+
+class BccClient:
+    """One keep-alive connection to a BccServer."""
+
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+
+    @classmethod
+    async def connect(cls, socket_path=None, host="127.0.0.1", port=8642):
+        if socket_path:
+            return cls(*await asyncio.open_unix_connection(socket_path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, method, target, payload=None):
+        """(status, response dict) of one request."""
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(format_http(f"{method} {target} HTTP/1.1", body, extra="Host: localhost\r\n"))
+        await self.writer.drain()
+        response = await read_http(self.reader, request=False)
+        if response is None:
+            raise ConnectionError("server closed the connection")
+        (status,), _headers, body = response
+        return status, json.loads(body)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def load_test(address, graphs, requests, concurrency, query_fraction=0.8, pairs_per_query=64,
+                    engine="tarjan_vishkin", seed=1):
+    """Send requests from concurrency connections, each a /bcc or a /query of random pairs on a random graph.
+
+    Returns (latencies per endpoint in seconds, elapsed seconds, error count,
+    the server's stats afterwards).
+    """
+    rng = np.random.default_rng(seed)
+    sizes = [graph_size(graph)[0] for graph in graphs]
+    plan = deque()
+    for _ in range(requests):
+        index = int(rng.integers(len(graphs)))
+        if rng.random() < query_fraction:
+            pairs = rng.integers(sizes[index], size=(pairs_per_query, 2)).tolist()
+            plan.append(("/query", {"graph": graphs[index], "engine": engine, "query": "same_block", "pairs": pairs}))
+        else:
+            plan.append(("/bcc", {"graph": graphs[index], "engine": engine}))
+
+    latencies = {"/bcc": [], "/query": []}
+    errors = 0
+
+    async def client_loop():
+        nonlocal errors
+        client = await BccClient.connect(**address)
+        try:
+            while plan:
+                target, payload = plan.popleft()
+                start = time.perf_counter()
+                status, response = await client.request("POST", target, payload)
+                latencies[target].append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+                    print(f"{target} failed: {response.get('error')}")
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    client = await BccClient.connect(**address)
+    try:
+        _, stats = await client.request("GET", "/stats")
+    finally:
+        await client.close()
+    return latencies, elapsed, errors, stats
+
+def subprocess_baseline(graphs, engine, runs, build_dir):
+    """Median wall time per graph of running a script.py engine once per request, as services do without the server."""
+    from build_engines import build_engine
+    from incremental import ENGINE_SOURCES
+    from script import run_cpp_with_input_file
+    executable = build_engine(ENGINE_SOURCES[engine], "O3", build_dir)
+    return {graph: statistics.median(run_cpp_with_input_file(executable, graph)[1] for _ in range(runs))
+            for graph in graphs}
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve BCC jobs on resident graphs, or load-test such a server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("serve", "run the server"), ("stats", "print a running server's stats"),
+                            ("bench", "load-test a running server")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--socket", help="Unix socket path (default: localhost TCP)")
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=8642)
+        if name == "serve":
+            command.add_argument("--memory-budget-mb", type=float, default=4096,
+                                 help="bytes of graphs and results kept resident before LRU eviction")
+            command.add_argument("--workers", type=int, default=4, help="jobs computed concurrently")
+            command.add_argument("--threads", type=int, default=0,
+                                 help="OpenMP threads per job (default: the OpenMP default)")
+        elif name == "bench":
+            command.add_argument("graphs", nargs="+")
+            command.add_argument("--requests", type=int, default=1000)
+            command.add_argument("--concurrency", type=int, default=16)
+            command.add_argument("--query-fraction", type=float, default=0.8,
+                                 help="share of /query requests; the rest are /bcc")
+            command.add_argument("--pairs", type=int, default=64, help="vertex pairs per /query")
+            command.add_argument("--engine", choices=ENGINES, default="tarjan_vishkin")
+            command.add_argument("--seed", type=int, default=1)
+            command.add_argument("--baseline", choices=("slota", "tarjan", "tarjan_parallel"),
+                                 help="also time one engine process per request on each graph, for comparison")
+            command.add_argument("--baseline-runs", type=int, default=3)
+            command.add_argument("--build-dir", default="builds")
+            command.add_argument("--output", help="append a summary row to this CSV file")
+    args = parser.parse_args()
+    address = {"socket_path": args.socket, "host": args.host, "port": args.port}
+
+    if args.command == "serve":
+        server = BccServer(int(args.memory_budget_mb * 2**20), args.workers, args.threads)
+        try:
+            asyncio.run(server.serve(**address))
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.command == "stats":
+        async def fetch():
+            client = await BccClient.connect(**address)
+            try:
+                return (await client.request("GET", "/stats"))[1]
+            finally:
+                await client.close()
+        print(json.dumps(asyncio.run(fetch()), indent=2))
+        return
+
+    latencies, elapsed, errors, stats = asyncio.run(load_test(
+        address, args.graphs, args.requests, args.concurrency, args.query_fraction, args.pairs, args.engine, args.seed))
+    done = sum(len(samples) for samples in latencies.values())
+    print(f"{done} requests in {elapsed:.3f}s ({done / elapsed:.1f}/s) over {args.concurrency} connections, "
+          f"{errors} errors")
+    summary = {}
+    for target, samples in latencies.items():
+        summary[target] = percentiles(samples)
+        if samples:
+            print(f"{target}: {len(samples)} requests, p50 {summary[target]['p50'] * 1e3:.3f} ms, "
+                  f"p99 {summary[target]['p99'] * 1e3:.3f} ms")
+    cache = stats["cache"]
+    print(f"server: graph hit rate {cache['graph_hit_rate']:.1%}, result hit rate {cache['result_hit_rate']:.1%}, "
+          f"{cache['coalesced']} coalesced, {cache['loads']} loads, {cache['evictions']} evictions, "
+          f"{cache['bytes'] / 2**20:.1f} MB cached")
+    if args.baseline:
+        for graph, seconds in subprocess_baseline(args.graphs, args.baseline, args.baseline_runs,
+                                                  args.build_dir).items():
+            print(f"{os.path.basename(graph)}: {args.baseline} process per request {seconds * 1e3:.3f} ms")
+    if args.output:
+        write_header = not os.path.exists(args.output)
+        with open(args.output, "a") as f:
+            if write_header:
+                f.write("engine,graphs,requests,concurrency,query_fraction,throughput,bcc_p50,bcc_p99,query_p50,"
+                        "query_p99,graph_hit_rate,result_hit_rate,coalesced,evictions\n")
+            bcc_stats, query_stats = summary["/bcc"], summary["/query"]
+            f.write(f"{args.engine},{len(args.graphs)},{done},{args.concurrency},{args.query_fraction},"
+                    f"{done / elapsed:.4f},{bcc_stats.get('p50', float('nan')):.6f},"
+                    f"{bcc_stats.get('p99', float('nan')):.6f},{query_stats.get('p50', float('nan')):.6f},"
+                    f"{query_stats.get('p99', float('nan')):.6f},{cache['graph_hit_rate']:.4f},"
+                    f"{cache['result_hit_rate']:.4f},{cache['coalesced']},{cache['evictions']}\n")
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
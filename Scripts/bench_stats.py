@@ -0,0 +1,60 @@
+import math
+import statistics
+
+def median_abs_deviation(samples, center=None):
+    """Median absolute deviation around the median (unscaled)."""
+    if center is None:
+        center = statistics.median(samples)
+    return statistics.median(abs(x - center) for x in samples)
+
+def reject_outliers(samples, k=3.0):
+    """Drop samples farther than k scaled MADs from the median (MAD scaled by 1.4826 to match sigma)."""
+    center = statistics.median(samples)
+    spread = 1.4826 * median_abs_deviation(samples, center)
+    if spread == 0:
+        return list(samples)
+    return [x for x in samples if abs(x - center) <= k * spread]
+
+def median_ci_rank(n):
+    """1-based rank j such that the j-th and (n + 1 - j)-th order statistics bound a 95% CI of the median.
+
+    Returns 0 for fewer than 6 samples, where the interval is unbounded.
+    """
+    if n < 6:
+        return 0
+    # Largest rank j with P(Binomial(n, 1/2) < j) <= 2.5%
+    cumulative = 0.0
+    j = 0
+    while True:
+        cumulative += math.comb(n, j) / 2 ** n
+        if cumulative > 0.025:
+            break
+        j += 1
+    return max(j, 1)
+
+def median_ci_95(samples):
+    """Distribution-free 95% confidence interval for the median from binomial order statistics.
+
+    Needs at least 6 samples; with fewer the interval is unbounded.
+    """
+    values = sorted(samples)
+    n = len(values)
+    j = median_ci_rank(n)
+    if j == 0:
+        return float("-inf"), float("inf")
+    return values[j - 1], values[n - j]
+
+def summarize_samples(samples, k=3.0):
+    """Median, MAD and a 95% CI of the median, computed after MAD-based outlier rejection."""
+    kept = reject_outliers(samples, k)
+    median = statistics.median(kept)
+    ci_low, ci_high = median_ci_95(kept)
+    return {
+        "trials": len(samples),
+        "kept": len(kept),
+        "median": median,
+        "mad": median_abs_deviation(kept, median),
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "ci_half_width": max(median - ci_low, ci_high - median),
+    }
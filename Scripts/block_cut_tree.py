@@ -0,0 +1,226 @@
+"""Batched biconnectivity queries over a graph's block-cut tree.
+
+The tree is written by an engine run with --block-cut-tree (one .bct file,
+layout in Code/block_cut_tree.h) or built in process from a CSR through the
+bcc extension. Queries take NumPy arrays of vertex pairs (0-based) and are
+answered with whole-array operations:
+
+  connected(u, v)         same connected component
+  same_block(u, v)        u and v lie in a common biconnected component
+  separator_counts(u, v)  how many articulation points separate u from v
+  separators(u, v)        those articulation points, as (offsets, vertices)
+
+The first three cost O(1) per pair. LCAs come from a range minimum over the
+Euler tour's depths, with in-block prefix/suffix minima and a sparse table
+over blocks of 32 positions, as in Code/tarjan_parallel.h, so the index stays
+O(nodes). separators() walks the tree paths, so its cost grows with the
+answer.
+
+    python Scripts/block_cut_tree.py graph.bct pairs.txt
+"""
+import argparse
+import struct
+import numpy as np
+import bcc
+
+# Must match Code/block_cut_tree.h
+BCT_MAGIC = b"BCCBCT\x00\x00"
+BCT_VERSION = 2
+BCT_HEADER = struct.Struct("<8sIIqqqq")
+RMQ_BLOCK = 32
+
+class BlockCutTree:
+    """A loaded block-cut tree with its range-minimum index."""
+
+    def __init__(self, data):
+        """Parse the file contents written by Code/block_cut_tree.h (any bytes-like object)."""
+        data = memoryview(data).cast("B")
+        if len(data) < BCT_HEADER.size:
+            raise ValueError("not a block-cut tree: file too short")
+        magic, version, _flags, n, blocks, cuts, length = BCT_HEADER.unpack_from(data)
+        if magic != BCT_MAGIC or version != BCT_VERSION:
+            raise ValueError("not a block-cut tree of this version")
+        nodes = blocks + cuts
+        sizes = (n, cuts, nodes, nodes, nodes, nodes, length)
+        arrays_at = BCT_HEADER.size + 8 * blocks
+        if len(data) != arrays_at + 4 * sum(sizes):
+            raise ValueError("block-cut tree size does not match its header")
+        self.data = data
+        self.n, self.num_blocks, self.num_cuts = n, blocks, cuts
+        # Smallest edge (u, v), u < v, of each block
+        packed = np.frombuffer(data, dtype="<i8", count=blocks, offset=BCT_HEADER.size)
+        self.block_edges = np.stack([packed >> 32, packed & 0xFFFFFFFF], axis=1).astype(np.int32)
+        arrays = np.frombuffer(data, dtype="<i4", offset=arrays_at)
+        ends = np.cumsum(sizes)
+        (self.vertex_node, self.cut_vertex, self.parent, self.depth, self.root, self.first,
+         self.euler) = np.split(arrays, ends[:-1])
+
+        # Component key per vertex: the tree root, or a unique negative key for an isolated vertex.
+        isolated = self.vertex_node < 0
+        self.vertex_root = np.where(isolated, -1 - np.arange(n, dtype=np.int32),
+                                    self.root[np.where(isolated, 0, self.vertex_node)] if nodes else 0)
+        self._build_rmq()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @classmethod
+    def from_csr(cls, indptr, indices, engine="tarjan_vishkin", threads=0):
+        """Build in process from a CSR adjacency (see bcc.py for the input requirements)."""
+        return cls(bcc.block_cut_tree(indptr, indices, engine, threads))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.data)
+
+    @property
+    def articulation_points(self):
+        return self.cut_vertex
+
+    def _build_rmq(self):
+        # (depth, node) packed into one int64, so a plain minimum picks the shallowest node.
+        keys = self.depth[self.euler].astype(np.int64) << 32 | self.euler
+        padded = -len(keys) % RMQ_BLOCK
+        keys = np.concatenate([keys, np.full(padded, np.iinfo(np.int64).max)]).reshape(-1, RMQ_BLOCK)
+        self._keys = keys.ravel()
+        self._prefix = np.minimum.accumulate(keys, axis=1).ravel()
+        self._suffix = np.minimum.accumulate(keys[:, ::-1], axis=1)[:, ::-1].ravel()
+        self._table = [keys.min(axis=1)]
+        while 2 << (len(self._table) - 1) <= len(self._table[0]):
+            previous, half = self._table[-1], 1 << (len(self._table) - 1)
+            self._table.append(np.minimum(previous[:-half], previous[half:]))
+
+    def _range_min(self, left, right):
+        """Smallest key over tour positions [left, right] for each pair of positions."""
+        block_left, block_right = left // RMQ_BLOCK, right // RMQ_BLOCK
+        result = np.minimum(self._suffix[left], self._prefix[right])
+        inner = block_right - block_left > 1
+        if inner.any():
+            lo, hi = block_left[inner] + 1, block_right[inner] - 1
+            level = np.log2(hi - lo + 1).astype(np.int64)
+            spans = np.minimum(self._gather(level, lo), self._gather(level, hi - (1 << level) + 1))
+            result[inner] = np.minimum(result[inner], spans)
+        same = block_left == block_right
+        if same.any():
+            lo, hi = left[same], right[same]
+            within = self._keys[lo]
+            for step in range(1, RMQ_BLOCK):
+                within = np.minimum(within, self._keys[np.minimum(lo + step, hi)])
+            result[same] = within
+        return result
+
+    def _gather(self, level, index):
+        out = np.empty(len(index), dtype=np.int64)
+        for k in np.unique(level):
+            chosen = level == k
+            out[chosen] = self._table[k][index[chosen]]
+        return out
+
+    def _pairs(self, u, v):
+        u, v = np.broadcast_arrays(np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64))
+        u, v = u.ravel(), v.ravel()
+        if len(u) and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= self.n):
+            raise ValueError(f"vertex ids must be in [0, {self.n})")
+        return u, v
+
+    def _distances(self, u, v):
+        """(connected, tree distance between the vertices' nodes, lca node); distance and lca are 0 when not connected."""
+        connected = self.vertex_root[u] == self.vertex_root[v]
+        node_u, node_v = self.vertex_node[u], self.vertex_node[v]
+        linked = connected & (node_u >= 0)
+        distance = np.zeros(len(u), dtype=np.int64)
+        lca = np.zeros(len(u), dtype=np.int64)
+        if linked.any():
+            first_u, first_v = self.first[node_u[linked]], self.first[node_v[linked]]
+            lca[linked] = self._range_min(np.minimum(first_u, first_v), np.maximum(first_u, first_v)) & 0xFFFFFFFF
+            distance[linked] = (self.depth[node_u[linked]].astype(np.int64) + self.depth[node_v[linked]]
+                                - 2 * self.depth[lca[linked]])
+        return connected, distance, lca
+
+    def _is_cut(self, u):
+        return self.vertex_node[u] >= self.num_blocks
+
+    def connected(self, u, v):
+        """Whether each pair lies in one connected component."""
+        u, v = self._pairs(u, v)
+        return self.vertex_root[u] == self.vertex_root[v]
+
+    def same_block(self, u, v):
+        """Whether each pair shares a biconnected component (a vertex always shares one with itself).
+
+        Blocks and cut nodes alternate along tree paths, so two vertices share
+        a block exactly when their nodes are as far apart as the number of
+        articulation points among the two.
+        """
+        u, v = self._pairs(u, v)
+        connected, distance, _ = self._distances(u, v)
+        expected = self._is_cut(u).astype(np.int64) + self._is_cut(v)
+        return (u == v) | (connected & (self.vertex_node[u] >= 0) & (distance == expected))
+
+    def separator_counts(self, u, v):
+        """Number of articulation points other than u and v on every u-v path; 0 for disconnected pairs."""
+        u, v = self._pairs(u, v)
+        connected, distance, _ = self._distances(u, v)
+        return self._separator_counts(u, v, connected, distance)
+
+    def _separator_counts(self, u, v, connected, distance):
+        cut_u, cut_v = self._is_cut(u), self._is_cut(v)
+        # Cut nodes on the whole path, endpoints included, then the endpoints removed
+        counts = (distance + 1 + cut_u + cut_v) // 2 - cut_u - cut_v
+        return np.where(connected & (u != v), counts, 0)
+
+    def separators(self, u, v):
+        """(offsets, vertices): the articulation points separating pair i, in path order from u to v,
+        are vertices[offsets[i]:offsets[i + 1]]."""
+        u, v = self._pairs(u, v)
+        connected, distance, lca = self._distances(u, v)
+        counts = self._separator_counts(u, v, connected, distance)
+        offsets = np.zeros(len(u) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        vertices = np.empty(offsets[-1], dtype=np.int32)
+
+        # Node i of the path (0 = u's node, distance = v's node) is a cut node iff i + cut_u is odd, and then
+        # the (i - 1 - cut_u) // 2-th separator. u's side climbs from u's node to the lca inclusive, v's side
+        # from v's node to just below it.
+        queries = np.flatnonzero(counts > 0)
+        node_u, node_v = self.vertex_node[u[queries]], self.vertex_node[v[queries]]
+        climb_u = self.depth[node_u] - self.depth[lca[queries]]
+        climb_v = self.depth[node_v] - self.depth[lca[queries]]
+        cut_u = self._is_cut(u[queries]).astype(np.int64)
+        for start, climb, from_u in ((node_u, climb_u, True), (node_v, climb_v - 1, False)):
+            active = np.flatnonzero(climb > 0)
+            node, step = start[active].astype(np.int64), 1
+            while len(active):
+                node = self.parent[node].astype(np.int64)
+                q = queries[active]
+                index = step if from_u else distance[q] - step
+                write = (node >= self.num_blocks) & (index < distance[q])
+                slots = offsets[q] + (index - 1 - cut_u[active]) // 2
+                vertices[slots[write]] = self.cut_vertex[node[write] - self.num_blocks]
+                keep = climb[active] > step
+                active, node, step = active[keep], node[keep], step + 1
+        return offsets, vertices
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer biconnectivity queries from a block-cut tree file.")
+    parser.add_argument("tree", help=".bct file written by an engine's --block-cut-tree")
+    parser.add_argument("pairs", nargs="?", help="text file of 0-based 'u v' pairs, one per line")
+    args = parser.parse_args()
+
+    tree = BlockCutTree.load(args.tree)
+    if args.pairs is None:
+        trees = int((tree.parent < 0).sum())
+        print(f"{tree.n} vertices, {tree.num_blocks} blocks, {tree.num_cuts} articulation points, {trees} trees")
+        return
+    pairs = np.loadtxt(args.pairs, dtype=np.int64, ndmin=2)
+    u, v = pairs[:, 0], pairs[:, 1]
+    same = tree.same_block(u, v)
+    offsets, vertices = tree.separators(u, v)
+    for i in range(len(u)):
+        separating = " ".join(map(str, vertices[offsets[i]:offsets[i + 1]]))
+        print(f"{u[i]} {v[i]} {'same' if same[i] else 'different'} {separating}".rstrip())
+
+if __name__ == "__main__":
+    main()
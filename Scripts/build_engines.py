@@ -0,0 +1,125 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import sysconfig
+from results_store import host_id, source_hash
+
+# Named flag sets an engine can be built with. "O3-pgo" is compiled twice:
+# once instrumented, run on training graphs, then rebuilt with the profile.
+BUILD_VARIANTS = {
+    "O0": ["-O0"],
+    "O2": ["-O2"],
+    "O3": ["-O3"],
+    "O3-native": ["-O3", "-march=native"],
+    "O3-lto": ["-O3", "-flto"],
+    "O3-pgo": ["-O3"],
+}
+
+# Flags every variant is built with; OpenMP enables the engines' --threads mode.
+COMMON_FLAGS = ["-fopenmp"]
+
+def variant_flags(variant):
+    """Full compiler flag list for a build variant."""
+    return [*BUILD_VARIANTS[variant], *COMMON_FLAGS]
+
+def compiler_version(compiler="g++"):
+    """First line of the compiler's --version output, used to tag builds."""
+    result = subprocess.run([compiler, "--version"], check=True, capture_output=True, text=True)
+    return result.stdout.splitlines()[0].strip()
+
+def compile_cpp_code(cpp_file, executable_name, flags=(), compiler="g++"):
+    """Compile the C++ code with the given flags, exiting on failure."""
+    compile_command = [compiler, *flags, cpp_file, "-o", executable_name]
+    try:
+        subprocess.run(compile_command, check=True)
+        print(f"Compilation of {cpp_file} {' '.join(flags)} successful.")
+    except subprocess.CalledProcessError:
+        print(f"Compilation of {cpp_file} {' '.join(flags)} failed.")
+        exit(1)
+
+def variant_tag(variant, compiler="g++"):
+    """Label stored with each result: compiler version, variant name and flags."""
+    return f"{compiler_version(compiler)} | {variant}: {' '.join(variant_flags(variant))}"
+
+def build_key(cpp_file, variant, compiler="g++", training_inputs=()):
+    """Cache key over engine source (with the headers it includes), flags, compiler version and, for PGO, the training set.
+
+    -march=native binaries are also keyed by host, since they may not run elsewhere.
+    """
+    digest = hashlib.sha256()
+    digest.update(source_hash(cpp_file).encode())
+    digest.update(" ".join(variant_flags(variant)).encode())
+    digest.update(variant.encode())
+    digest.update(compiler_version(compiler).encode())
+    if "-march=native" in BUILD_VARIANTS[variant]:
+        digest.update(host_id().encode())
+    if variant.endswith("-pgo"):
+        for path in sorted(training_inputs):
+            digest.update(f"{os.path.basename(path)}:{os.path.getsize(path)}".encode())
+    return digest.hexdigest()
+
+def run_training(executable, training_inputs):
+    """Run an instrumented binary over the training graphs to collect a profile."""
+    for input_file in training_inputs:
+        print(f"PGO training on {input_file}...")
+        subprocess.run([executable, input_file], check=True, capture_output=True)
+
+def build_engine(cpp_file, variant, build_dir, compiler="g++", training_inputs=()):
+    """Return the path of a cached binary for (source, variant, compiler), building it if missing."""
+    if variant not in BUILD_VARIANTS:
+        raise ValueError(f"Unknown build variant: {variant}")
+    engine = os.path.splitext(os.path.basename(cpp_file))[0]
+    key = build_key(cpp_file, variant, compiler, training_inputs)
+    os.makedirs(build_dir, exist_ok=True)
+    executable = os.path.abspath(os.path.join(build_dir, f"{engine}-{variant}-{key[:16]}"))
+    if os.path.exists(executable):
+        print(f"Using cached build {executable}")
+        return executable
+
+    flags = variant_flags(variant)
+    tmp_executable = f"{executable}.tmp.{os.getpid()}"
+    if variant.endswith("-pgo"):
+        if not training_inputs:
+            raise ValueError("PGO builds need at least one training input")
+        profile_dir = os.path.abspath(os.path.join(build_dir, f"profile-{engine}-{key[:16]}"))
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        compile_cpp_code(cpp_file, tmp_executable, [*flags, f"-fprofile-generate={profile_dir}"], compiler)
+        run_training(tmp_executable, training_inputs)
+        compile_cpp_code(cpp_file, tmp_executable, [*flags, f"-fprofile-use={profile_dir}", "-fprofile-correction"], compiler)
+        shutil.rmtree(profile_dir, ignore_errors=True)
+    else:
+        compile_cpp_code(cpp_file, tmp_executable, flags, compiler)
+    os.replace(tmp_executable, executable)
+    return executable
+
+def build_extension(cpp_file, build_dir, compiler="g++"):
+    """Return the path of a cached CPython extension built from cpp_file, building it if missing.
+
+    Keyed like build_engine, plus the Python version's extension suffix.
+    """
+    suffix = sysconfig.get_config_var("EXT_SUFFIX")
+    flags = ["-O3", *COMMON_FLAGS, "-shared", "-fPIC", f"-I{sysconfig.get_paths()['include']}"]
+    digest = hashlib.sha256()
+    digest.update(source_hash(cpp_file).encode())
+    digest.update(" ".join(flags).encode())
+    digest.update(suffix.encode())
+    digest.update(compiler_version(compiler).encode())
+    name = os.path.splitext(os.path.basename(cpp_file))[0]
+    os.makedirs(build_dir, exist_ok=True)
+    library = os.path.abspath(os.path.join(build_dir, f"{name}-{digest.hexdigest()[:16]}{suffix}"))
+    if not os.path.exists(library):
+        tmp_library = f"{library}.tmp.{os.getpid()}"
+        compile_cpp_code(cpp_file, tmp_library, flags, compiler)
+        os.replace(tmp_library, library)
+    return library
+
+def pick_training_inputs(input_files, count):
+    """Pick count inputs spread evenly over the corpus sorted by file size."""
+    ordered = sorted(input_files, key=os.path.getsize)
+    if count <= 0 or not ordered:
+        return []
+    if count >= len(ordered):
+        return ordered
+    step = (len(ordered) - 1) / max(count - 1, 1)
+    return [ordered[round(i * step)] for i in range(count)]
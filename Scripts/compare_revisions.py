@@ -0,0 +1,81 @@
+import argparse
+import os
+import subprocess
+import tempfile
+from build_engines import BUILD_VARIANTS, build_engine, pick_training_inputs
+from script import ENGINES, benchmark_input_file
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def export_code_dir(revision, dest):
+    """Write the Code/ directory as of a git revision into dest and return its path."""
+    names = subprocess.run(["git", "-C", REPO_ROOT, "ls-tree", "--name-only", f"{revision}:Code"],
+                           check=True, capture_output=True, text=True).stdout.split()
+    code_dir = os.path.join(dest, "Code")
+    os.makedirs(code_dir, exist_ok=True)
+    for name in names:
+        content = subprocess.run(["git", "-C", REPO_ROOT, "show", f"{revision}:Code/{name}"],
+                                 check=True, capture_output=True).stdout
+        with open(os.path.join(code_dir, name), "wb") as f:
+            f.write(content)
+    return code_dir
+
+def compare_revisions(engine, baseline, inputs, variant="O3", build_dir="builds", pgo_train=3, **benchmark):
+    """Benchmark an engine at a baseline revision against the working tree on the same inputs.
+
+    A PGO variant trains both builds on the same pgo_train inputs, spread
+    over the inputs by size.
+
+    Returns rows of (input, baseline stats, current stats), where each stats
+    entry is a (median seconds, peak RSS bytes, RSS upper bound bytes) triple,
+    or None if the run failed. The peak is None for a baseline whose engine
+    does not report peak_rss.
+    """
+    training_inputs = pick_training_inputs(inputs, pgo_train) if variant.endswith("-pgo") else []
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_cpp = os.path.join(export_code_dir(baseline, tmp), f"{engine}.cpp")
+        baseline_exe = build_engine(baseline_cpp, variant, build_dir, training_inputs=training_inputs)
+    current_exe = build_engine(os.path.join(REPO_ROOT, "Code", f"{engine}.cpp"), variant, build_dir,
+                               training_inputs=training_inputs)
+
+    rows = []
+    for input_file in inputs:
+        measured = []
+        for executable in (baseline_exe, current_exe):
+            _, median, _, usage, _, _ = benchmark_input_file(executable, input_file, **benchmark)
+            measured.append((median, usage["max_rss"], usage["rss_upper_bound"]) if median is not None else None)
+        rows.append((input_file, *measured))
+    return rows
+
+def print_comparison(rows, baseline):
+    print(f"{'input':<32} {baseline[:12] + ' time':>18} {'current time':>14} {'speedup':>8} "
+          f"{'base RSS MB':>12} {'curr RSS MB':>12}")
+    for input_file, before, after in rows:
+        name = os.path.basename(input_file)
+        if before is None or after is None:
+            print(f"{name:<32} failed")
+            continue
+        rss = [f"{peak / 2**20:>12.1f}" if peak is not None else f"{'<=' + format(bound / 2**20, '.1f'):>12}"
+               for _, peak, bound in (before, after)]
+        print(f"{name:<32} {before[0]:>18.4f} {after[0]:>14.4f} {before[0] / after[0]:>7.2f}x {rss[0]} {rss[1]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one engine's time and peak RSS between a git revision and the working tree.")
+    parser.add_argument("inputs", nargs="+", help=".mtx or CSR cache files, e.g. TSOPF_RS_b2383.mtx human_gene1.mtx")
+    parser.add_argument("--engine", choices=ENGINES[:-1], default="tarjan")
+    parser.add_argument("--baseline", default="HEAD", help="git revision to compare against")
+    parser.add_argument("--variant", choices=sorted(BUILD_VARIANTS), default="O3")
+    parser.add_argument("--build-dir", default="builds")
+    parser.add_argument("--pgo-train", type=int, default=3, help="number of inputs used to train O3-pgo builds")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--min-reps", type=int, default=6)
+    parser.add_argument("--max-reps", type=int, default=20)
+    parser.add_argument("--ci-target", type=float, default=0.02)
+    args = parser.parse_args()
+
+    rows = compare_revisions(args.engine, args.baseline, args.inputs, args.variant, args.build_dir, args.pgo_train,
+                             warmup=args.warmup, min_reps=args.min_reps, max_reps=args.max_reps, ci_target=args.ci_target)
+    print_comparison(rows, args.baseline)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Per-engine runtime and peak-memory models for picking an engine per graph.
+
+Each engine gets two ridge-regularized log-linear fits: log(time) and
+log(peak RSS), each against log(1 + feature) for the graph_features.py
+features in FEATURES. Training data is the engine's stored trials in
+results.db, one sample per graph (median time, peak RSS over trials), joined
+to the feature index by content hash. script.py's "auto" engine refits the
+model at startup, runs each graph on the engine with the lowest predicted
+time whose predicted memory fits, except for a seeded share of graphs that
+go to the runner-up so that engine keeps getting samples, and appends
+prediction and outcome to a JSON-lines log, which "report" summarizes:
+
+    python Scripts/cost_model.py fit --db results.db --features graph_features.json --output cost_model.json
+    python Scripts/cost_model.py report auto_predictions.jsonl
+"""
+import argparse
+import json
+import math
+import statistics
+import time
+import numpy as np
+from graph_features import FeatureIndex
+from results_store import ResultsStore
+
+FEATURES = ("vertices", "edges", "degree_mean", "degree_std", "degree_max", "degree_one_vertices", "components",
+            "bfs_depth")
+TARGETS = ("time", "memory")
+# An engine needs a few samples per coefficient before its fit is trusted.
+MIN_SAMPLES = 2 * (len(FEATURES) + 1)
+RIDGE = 1e-2
+
+def design_row(features):
+    """Regression inputs for one graph: an intercept and log(1 + value) of each feature."""
+    return [1.0] + [math.log1p(max(float(features[name]), 0.0)) for name in FEATURES]
+
+def fit_log_linear(rows, targets, ridge=RIDGE):
+    """Ridge least squares of log(targets) on rows; returns (weights, RMS residual in log space).
+
+    The intercept is not penalized.
+    """
+    x = np.asarray(rows, dtype=np.float64)
+    y = np.log(np.asarray(targets, dtype=np.float64))
+    penalty = ridge * len(y) * np.eye(x.shape[1])
+    penalty[0, 0] = 0.0
+    weights = np.linalg.solve(x.T @ x + penalty, x.T @ y)
+    residual = y - x @ weights
+    return weights.tolist(), float(np.sqrt(np.mean(residual ** 2)))
+
+class CostModel:
+    """Fitted weights per engine and target, saved as JSON."""
+
+    def __init__(self, engines=None, fitted_at=None):
+        # engine -> {"samples": n, "memory_samples": n, "time": {"weights": [...], "rmse": r}, "memory": {...}}
+        self.engines = engines or {}
+        self.fitted_at = fitted_at
+
+    @classmethod
+    def fit(cls, samples, ridge=RIDGE, min_samples=MIN_SAMPLES):
+        """Fit from {engine: [(features, time, peak_rss or None)]}; engines with too few samples are left out.
+
+        Each target is fitted on the graphs that have it, so a graph without a
+        measured peak still trains the time model.
+        """
+        engines = {}
+        for engine, rows in samples.items():
+            targets = {"time": [(features, t) for features, t, _ in rows if t > 0],
+                       "memory": [(features, rss) for features, _, rss in rows if rss]}
+            usable = min(len(pairs) for pairs in targets.values())
+            if usable < min_samples:
+                print(f"Cost model: {engine} has {len(targets['time'])} graphs with a time and "
+                      f"{len(targets['memory'])} with a peak RSS, needs {min_samples} of each; not modeled.")
+                continue
+            entry = {"samples": len(targets["time"]), "memory_samples": len(targets["memory"])}
+            for target in TARGETS:
+                weights, rmse = fit_log_linear([design_row(features) for features, _ in targets[target]],
+                                               [value for _, value in targets[target]], ridge)
+                entry[target] = {"weights": weights, "rmse": rmse}
+            engines[engine] = entry
+        return cls(engines, time.time())
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("features") != list(FEATURES):
+            raise ValueError(f"{path} was fitted on other features; refit it")
+        return cls(data["engines"], data.get("fitted_at"))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"features": list(FEATURES), "fitted_at": self.fitted_at, "engines": self.engines}, f, indent=1)
+
+    def predict(self, features):
+        """{engine: {"time": seconds, "memory": bytes}} for one graph's features."""
+        row = np.asarray(design_row(features))
+        return {engine: {target: float(np.exp(row @ np.asarray(entry[target]["weights"]))) for target in TARGETS}
+                for engine, entry in self.engines.items()}
+
+    def rank(self, features, candidates, memory_limit=None):
+        """(engines, predictions): the modeled candidates, best first.
+
+        Candidates whose predicted memory fits come first, by predicted time,
+        then the rest by predicted memory.
+        """
+        predictions = {engine: p for engine, p in self.predict(features).items() if engine in candidates}
+        fits = {engine: memory_limit is None or p["memory"] <= memory_limit for engine, p in predictions.items()}
+        order = sorted(predictions, key=lambda engine: (not fits[engine],
+                                                       predictions[engine]["time" if fits[engine] else "memory"]))
+        return order, predictions
+
+    def choose(self, features, candidates, memory_limit=None):
+        """(engine, predictions): the candidate with the lowest predicted time whose predicted memory fits.
+
+        If none fits, the one with the lowest predicted memory. Returns
+        (None, {}) when no candidate is modeled.
+        """
+        order, predictions = self.rank(features, candidates, memory_limit)
+        return (order[0] if order else None), predictions
+
+def training_samples(store, index, builds):
+    """{engine: [(features, median time, peak RSS)]} from the stored trials of each engine's build.
+
+    builds maps engine -> (source_hash, compiler_flags, host). Graphs missing
+    from the feature index are skipped, and so are censored trials, whose
+    time is only a lower bound. The peak RSS is the largest engine-reported
+    peak over the trials, or None when no trial has one (batch workers
+    after their first graph).
+    """
+    samples = {}
+    for engine, build in builds.items():
+        by_graph = {}
+        for graph_hash, run_time, max_rss, status in store.build_runs(engine, build,
+                                                                     ("graph_hash", "time", "max_rss", "status")):
+            if status is not None:
+                continue
+            by_graph.setdefault(graph_hash, []).append((run_time, max_rss))
+        rows = []
+        for graph_hash, trials in by_graph.items():
+            features = index.get(graph_hash)
+            if features is not None:
+                peak = max((rss for _, rss in trials if rss), default=None)
+                rows.append((features, statistics.median(t for t, _ in trials), peak))
+        samples[engine] = rows
+    return samples
+
+def fit_from_results(db_path, features_path, engines, compiler_flags=None, host=None):
+    """Fit on the latest build of each engine in results.db (optionally of one flag set and host)."""
+    store = ResultsStore(db_path)
+    try:
+        builds = {}
+        for engine in engines:
+            build = store.latest_build(engine, compiler_flags, host)
+            if build is not None:
+                builds[engine] = build
+        return CostModel.fit(training_samples(store, FeatureIndex(features_path), builds))
+    finally:
+        store.close()
+
+def report(log_path):
+    """Per engine run: runs, median absolute error of the log predictions, and the median actual/predicted ratio.
+
+    Censored runs, whose time is only a lower bound, are left out of the errors.
+    """
+    by_engine = {}
+    with open(log_path) as f:
+        for line in f:
+            record = json.loads(line)
+            by_engine.setdefault(record["engine"], []).append(record)
+    for engine, records in sorted(by_engine.items()):
+        explored = sum(1 for r in records if r.get("explored"))
+        predicted = [(r["predicted"][engine], r["actual"]) for r in records
+                     if engine in r["predicted"] and "status" not in r["actual"]]
+        if not predicted:
+            print(f"{engine}: {len(records)} runs ({explored} explored), none predicted (fallback)")
+            continue
+        time_error = statistics.median(abs(math.log(a["time"] / p["time"])) for p, a in predicted)
+        memory_errors = [abs(math.log(a["max_rss"] / p["memory"])) for p, a in predicted if a.get("max_rss")]
+        memory_error = f"{statistics.median(memory_errors):.3f}" if memory_errors else "n/a"
+        time_ratio = statistics.median(a["time"] / p["time"] for p, a in predicted)
+        print(f"{engine}: {len(records)} runs ({explored} explored), median |log error| time {time_error:.3f}, "
+              f"memory {memory_error}, median actual/predicted time {time_ratio:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit or evaluate the per-engine cost models used by the auto engine.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    fit = commands.add_parser("fit", help="fit on results.db and the feature index")
+    fit.add_argument("--db", default="results.db")
+    fit.add_argument("--features", default="graph_features.json")
+    fit.add_argument("--engines", nargs="+", default=["slota", "tarjan"])
+    fit.add_argument("--output", default="cost_model.json")
+    evaluate = commands.add_parser("report", help="summarize prediction errors from an auto run log")
+    evaluate.add_argument("log", nargs="?", default="auto_predictions.jsonl")
+    args = parser.parse_args()
+
+    if args.command == "report":
+        report(args.log)
+        return
+    model = fit_from_results(args.db, args.features, args.engines)
+    model.save(args.output)
+    for engine, entry in model.engines.items():
+        print(f"{engine}: {entry['samples']} graphs ({entry['memory_samples']} with a peak RSS), "
+              f"log RMSE time {entry['time']['rmse']:.3f}, memory {entry['memory']['rmse']:.3f}")
+    print(f"Model saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
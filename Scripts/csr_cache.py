@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import struct
+import subprocess
+import time
+from contextlib import contextmanager
+import numpy as np
+
+# Must match Code/csr_graph.h
+CSR_MAGIC = b"BCCCSR\x00\x00"
+CSR_VERSION = 1
+CSR_HEADER = struct.Struct("<8sIIqqq32s")
+
+# Inputs the engines read: Matrix Market text, compressed text streamed through
+# the tools in decompress_command (as Code/mtx_reader.h does), and binary CSR
+# files such as those written by Code/generate.cpp.
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar.zst")
+COMPRESSED_SUFFIXES = (".mtx.gz", ".mtx.zst") + ARCHIVE_SUFFIXES
+GRAPH_SUFFIXES = (".mtx", ".csr") + COMPRESSED_SUFFIXES
+# Characters of Matrix Market text parsed per NumPy block.
+BLOCK_CHARS = 1 << 26
+
+def is_graph_file(filename):
+    return filename.endswith(GRAPH_SUFFIXES)
+
+def is_compressed(filename):
+    return filename.endswith(COMPRESSED_SUFFIXES)
+
+def decompress_command(path):
+    """Command writing a compressed input's Matrix Market text to stdout, or None for a plain file.
+
+    An archive yields the member named after it (SuiteSparse's Name/Name.mtx in Name.tar.gz).
+    """
+    base = os.path.basename(path)
+    for suffix in ARCHIVE_SUFFIXES:
+        if base.endswith(suffix):
+            return ["tar", "-xOf", path, "--wildcards", "--no-anchored", base[:-len(suffix)] + ".mtx"]
+    if base.endswith(".gz"):
+        return ["gzip", "-dc", "--", path]
+    if base.endswith(".zst"):
+        return ["zstd", "-dcq", "--", path]
+    return None
+
+@contextmanager
+def open_graph_text(path):
+    """Open a Matrix Market file for reading lines, decompressing in a child process.
+
+    The child runs alongside the reader, so decompression overlaps with
+    parsing. Leaving before the end kills it. A child that fails after the
+    whole stream was read raises OSError.
+    """
+    command = decompress_command(path)
+    if command is None:
+        with open(path, "r") as f:
+            yield f
+        return
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, bufsize=1 << 20)
+    complete = False
+    try:
+        yield proc.stdout
+        complete = proc.stdout.read(1) == ""
+    finally:
+        if not complete:
+            proc.kill()
+        proc.stdout.close()
+        status = proc.wait()
+    if complete and status != 0:
+        raise OSError(f"{' '.join(command)} exited with status {status}")
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Return the raw sha256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+def read_csr_header(csr_path):
+    """Return (version, n, m, nnz, source_hash) of a CSR cache file, or None if it is not one."""
+    try:
+        with open(csr_path, "rb") as f:
+            raw = f.read(CSR_HEADER.size)
+    except OSError:
+        return None
+    if len(raw) != CSR_HEADER.size:
+        return None
+    magic, version, _flags, n, m, nnz, source_hash = CSR_HEADER.unpack(raw)
+    if magic != CSR_MAGIC:
+        return None
+    return version, n, m, nnz, source_hash
+
+def read_entries(path, stream=None):
+    """(n, rows, cols) of a (possibly compressed) Matrix Market file as 0-based int32 arrays, read in blocks.
+
+    A stream dict gets decompressed_bytes (characters read, which are bytes
+    in ASCII Matrix Market) and stream_seconds (until the text ended), as in
+    the engines' "input" record. Raises ValueError naming the file when the
+    numbers do not split into whole entries or an index is outside 1..n.
+    """
+    rows, cols = [], []
+    started = time.perf_counter()
+    with open_graph_text(path) as f:
+        header = f.readline()
+        banner = header.lower().split()
+        field = banner[3] if len(banner) > 3 else "real"
+        width = 2 if field == "pattern" else 4 if field == "complex" else 3
+        line = f.readline()
+        header += line
+        while line.startswith("%") or not line.strip():
+            line = f.readline()
+            header += line
+        n_rows, n_cols, _entries = map(int, line.split()[:3])
+        n = max(n_rows, n_cols)
+        text_chars = len(header)
+        while True:
+            block = f.read(BLOCK_CHARS)
+            if not block:
+                break
+            block += f.readline()
+            text_chars += len(block)
+            values = np.fromstring(block, dtype=np.float64, sep=" ")
+            # Matrix Market has no comments after the size line, so the numbers split evenly into entries
+            if len(values) % width:
+                raise ValueError(f"{path}: entries are not {width} numbers each")
+            values = values.reshape(-1, width)
+            indices = values[:, :2]
+            if len(indices) and (indices.min() < 1 or indices.max() > n):
+                raise ValueError(f"{path}: entry index outside 1..{n}")
+            rows.append(values[:, 0].astype(np.int32) - 1)
+            cols.append(values[:, 1].astype(np.int32) - 1)
+    if stream is not None:
+        stream.update(decompressed_bytes=text_chars, stream_seconds=time.perf_counter() - started)
+    empty = np.empty(0, dtype=np.int32)
+    return n, np.concatenate(rows or [empty]), np.concatenate(cols or [empty])
+
+def csr_from_entries(n, rows, cols):
+    """Symmetric duplicate-free CSR (offsets, neighbors) with sorted rows, plus (self_loops, duplicate_entries) of an entry list."""
+    loops = rows == cols
+    low = np.minimum(rows[~loops], cols[~loops]).astype(np.int64)
+    high = np.maximum(rows[~loops], cols[~loops]).astype(np.int64)
+    # Sort-and-compare rather than np.unique, which is several times slower on int64 keys in NumPy 2
+    pairs = np.sort(low << 32 | high)
+    first = np.ones(len(pairs), dtype=bool)
+    first[1:] = pairs[1:] != pairs[:-1]
+    pairs = pairs[first]
+    # Both directions of every edge, sorted by (source, target)
+    directed = np.sort(np.concatenate([pairs, (pairs & 0xFFFFFFFF) << 32 | pairs >> 32]))
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(directed >> 32, minlength=n), out=offsets[1:])
+    return offsets, (directed & 0xFFFFFFFF).astype(np.int32), int(loops.sum()), int((~loops).sum() - len(pairs))
+
+def write_csr_file(csr_path, n, m, offsets, neighbors, source_hash):
+    """Write the versioned binary CSR file atomically (tmp file + rename)."""
+    if offsets.dtype != np.int64 or neighbors.dtype != np.int32:
+        raise ValueError("CSR arrays must be int64 offsets and int32 neighbors")
+    tmp_path = f"{csr_path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(CSR_HEADER.pack(CSR_MAGIC, CSR_VERSION, 0, n, m, len(neighbors), source_hash))
+        offsets.tofile(f)
+        neighbors.tofile(f)
+    os.replace(tmp_path, csr_path)
+
+def input_stats_path(csr_path):
+    return csr_path + ".input.json"
+
+def read_input_stats(csr_path):
+    """The "input" record saved when a compressed source was converted to csr_path, or None."""
+    try:
+        with open(input_stats_path(csr_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def convert_mtx_to_csr(mtx_path, csr_path, source_hash=None):
+    """Parse an .mtx file once and store it as a binary CSR cache file; m is the number of entries read.
+
+    For a compressed source, the stream's compressed_bytes, decompressed_bytes
+    and stream_seconds are saved next to the cache file (read_input_stats),
+    before it, so a valid cache file never pairs with another source's record.
+    """
+    if source_hash is None:
+        source_hash = file_sha256(mtx_path)
+    stream = {"compressed_bytes": os.path.getsize(mtx_path)}
+    n, rows, cols = read_entries(mtx_path, stream)
+    if is_compressed(mtx_path):
+        print(f"Streamed {mtx_path}: {stream['compressed_bytes']} compressed bytes, "
+              f"{stream['decompressed_bytes'] / stream['stream_seconds'] / 1e6:.1f} MB/s decompressed")
+        tmp_path = f"{input_stats_path(csr_path)}.tmp.{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(stream, f)
+        os.replace(tmp_path, input_stats_path(csr_path))
+    offsets, neighbors, _, _ = csr_from_entries(n, rows, cols)
+    write_csr_file(csr_path, n, len(rows), offsets, neighbors, source_hash)
+    return csr_path
+
+def ensure_csr_cache(mtx_path, cache_dir, source_hash=None):
+    """Return the CSR cache path for a graph file, (re)building it if missing, stale or from an older version.
+
+    A file that already is a CSR file is returned as is.
+    """
+    if read_csr_header(mtx_path) is not None:
+        return mtx_path
+    os.makedirs(cache_dir, exist_ok=True)
+    csr_path = os.path.join(cache_dir, os.path.basename(mtx_path) + ".csr")
+    if source_hash is None:
+        source_hash = file_sha256(mtx_path)
+    header = read_csr_header(csr_path)
+    if header is not None and header[0] == CSR_VERSION and header[4] == source_hash:
+        return csr_path
+    print(f"Converting {mtx_path} -> {csr_path}...")
+    return convert_mtx_to_csr(mtx_path, csr_path, source_hash)
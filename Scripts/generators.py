@@ -0,0 +1,106 @@
+"""Seeded synthetic graph suites for scaling studies.
+
+Graphs come from Code/generate.cpp, compiled once through build_engines and
+cached. It streams Matrix Market files chunk by chunk, or writes binary CSR
+files the engines map directly. No edge list passes through Python. The same
+arguments always give the same file, whatever the thread count.
+
+Families and the knobs they take:
+  rmat     n, degree, rmat=(a, b, c) skew (Kronecker/R-MAT, vertex ids scrambled)
+  er       n, degree (Erdos-Renyi G(n, p))
+  grid2d   n
+  grid3d   n
+  path     n
+  cycle    n
+  cliques  n, block (vertices per block), degree (average degree inside a block)
+
+"cliques" is a chain of blocks where neighbouring blocks share one vertex, so
+about n / (block - 1) vertices are articulation points and BFS depth grows
+with n. That is the worst case for Slota's exclusion BFS.
+"""
+import argparse
+import itertools
+import os
+import subprocess
+from build_engines import build_engine
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR_CPP = os.path.join(REPO_ROOT, "Code", "generate.cpp")
+
+FAMILIES = ("rmat", "er", "grid2d", "grid3d", "path", "cycle", "cliques")
+# Families whose structure is fixed by n alone ignore degree; only cliques takes a block size.
+DEGREE_FAMILIES = ("rmat", "er", "cliques")
+BLOCK_FAMILIES = ("cliques",)
+
+def graph_filename(family, n, degree=None, block=None, seed=1, fmt="mtx"):
+    """File name encoding the parameters that matter for a family, e.g. er_n1000000_d8_s1.mtx."""
+    parts = [family, f"n{n}"]
+    if family in DEGREE_FAMILIES and degree is not None:
+        parts.append(f"d{degree:g}")
+    if family in BLOCK_FAMILIES and block is not None:
+        parts.append(f"b{block}")
+    parts.append(f"s{seed}")
+    return "_".join(parts) + "." + fmt
+
+def generate_graph(family, n, output, degree=None, block=None, seed=1, rmat=None, build_dir="builds", threads=None):
+    """Write one synthetic graph to output (.mtx or .csr) and return its path."""
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown graph family: {family}")
+    executable = build_engine(GENERATOR_CPP, "O3", build_dir)
+    command = [executable, family, str(n), output, "--seed", str(seed)]
+    if degree is not None:
+        command += ["--degree", str(degree)]
+    if block is not None:
+        command += ["--block", str(block)]
+    if rmat is not None:
+        command += ["--rmat", ",".join(map(str, rmat))]
+    env = dict(os.environ, OMP_NUM_THREADS=str(threads)) if threads else None
+    subprocess.run(command, check=True, env=env)
+    return output
+
+def generate_sweep(output_dir, families, sizes, degrees=(None,), blocks=(None,), seeds=(1,), fmt="mtx", rmat=None,
+                   build_dir="builds", threads=None):
+    """Generate the cross product of sizes, degrees, block sizes and seeds for each family.
+
+    n, degree and block vary independently. A family skips the knobs it does
+    not take, so a grid is generated once per size and seed. Existing files
+    are kept, so an interrupted sweep picks up where it stopped.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for family in families:
+        family_degrees = degrees if family in DEGREE_FAMILIES else (None,)
+        family_blocks = blocks if family in BLOCK_FAMILIES else (None,)
+        for n, degree, block, seed in itertools.product(sizes, family_degrees, family_blocks, seeds):
+            path = os.path.join(output_dir, graph_filename(family, n, degree, block, seed, fmt))
+            if path in paths:
+                continue
+            if not os.path.exists(path):
+                print(f"Generating {path}...")
+                generate_graph(family, n, path, degree, block, seed, rmat, build_dir, threads)
+            paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic graphs for scaling sweeps.")
+    parser.add_argument("--families", nargs="+", choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument("--sizes", nargs="+", type=lambda s: int(float(s)), default=[10**4, 10**5, 10**6],
+                        help="vertex counts; 1e6 style is accepted")
+    parser.add_argument("--degrees", nargs="+", type=float, default=[None],
+                        help="average degree for rmat, er and cliques (default: 8, or block - 1 for cliques)")
+    parser.add_argument("--blocks", nargs="+", type=int, default=[None], help="vertices per block for cliques (default 4)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1])
+    parser.add_argument("--rmat", nargs=3, type=float, metavar=("A", "B", "C"), help="R-MAT quadrant probabilities")
+    parser.add_argument("--format", choices=["mtx", "csr"], default="mtx",
+                        help="mtx streams in constant memory; csr is built in memory and needs no cache conversion")
+    parser.add_argument("--output-dir", default="synthetic")
+    parser.add_argument("--build-dir", default="builds")
+    parser.add_argument("--threads", type=int, help="OpenMP threads for the generator")
+    args = parser.parse_args()
+
+    degrees = [None if d is None else (int(d) if d == int(d) else d) for d in args.degrees]
+    generate_sweep(args.output_dir, args.families, args.sizes, degrees, args.blocks, args.seeds, args.format,
+                   args.rmat, args.build_dir, args.threads)
+
+if __name__ == "__main__":
+    main()
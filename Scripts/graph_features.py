@@ -0,0 +1,175 @@
+"""Per-graph structural features, computed once and kept in a sidecar index.
+
+The index is a JSON file mapping a graph's content hash (the same sha256
+script.py keys results.db with) to its file name and features. Features are
+computed with NumPy over the graph's CSR: degree moments, maximum degree,
+degree-0 and degree-1 counts, connected components, and BFS depths from a
+double sweep. Matrix Market sources are read in blocks, which also gives the
+self-loop and duplicate entry counts that the CSR no longer shows. Binary CSR
+files are mapped directly.
+
+    python Scripts/graph_features.py matrices --index graph_features.json
+"""
+import argparse
+import json
+import os
+import numpy as np
+from csr_cache import CSR_HEADER, csr_from_entries, file_sha256, is_graph_file, read_csr_header, read_entries
+
+# Bump when a feature's definition changes; entries of other versions are recomputed.
+FEATURE_VERSION = 1
+# BFS sweeps stop after this many levels (long paths would take one NumPy step per vertex).
+MAX_BFS_LEVELS = 1 << 16
+
+def map_csr(path):
+    """(n, m, offsets, neighbors) of a binary CSR file, mapped read-only."""
+    _version, n, m, nnz, _hash = read_csr_header(path)
+    offsets = np.memmap(path, dtype=np.int64, mode="r", offset=CSR_HEADER.size, shape=(n + 1,))
+    neighbors = np.memmap(path, dtype=np.int32, mode="r", offset=CSR_HEADER.size + 8 * (n + 1), shape=(nnz,))
+    return n, m, offsets, neighbors
+
+def connected_components(n, offsets, neighbors):
+    """Component label (its smallest vertex) per vertex, by hooking roots onto smaller roots and pointer jumping."""
+    src = np.repeat(np.arange(n, dtype=np.int32), np.diff(offsets))
+    keep = src < neighbors
+    src, dst = src[keep], np.asarray(neighbors)[keep]
+    parent = np.arange(n, dtype=np.int32)
+    while True:
+        root_src, root_dst = parent[src], parent[dst]
+        differ = root_src != root_dst
+        if not differ.any():
+            return parent
+        # Every hook points to a smaller root, so no cycles form whichever duplicate write wins.
+        parent[np.maximum(root_src, root_dst)[differ]] = np.minimum(root_src, root_dst)[differ]
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        src, dst = src[differ], dst[differ]
+
+def bfs_depths(offsets, neighbors, source, max_levels=MAX_BFS_LEVELS):
+    """(depth per vertex, -1 if unreached; eccentricity of source; whether max_levels cut the search short)."""
+    depth = np.full(len(offsets) - 1, -1, dtype=np.int32)
+    depth[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+    while level < max_levels:
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        # Positions of every frontier vertex's neighbors in one gather
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        reached = neighbors[positions]
+        frontier = np.unique(reached[depth[reached] < 0]).astype(np.int64)
+        if frontier.size == 0:
+            return depth, level, False
+        level += 1
+        depth[frontier] = level
+    return depth, level, True
+
+def csr_features(n, offsets, neighbors):
+    """Degree moments, degree extremes, components and double-sweep BFS depths of a symmetric CSR."""
+    degrees = np.diff(offsets).astype(np.float64)
+    mean = degrees.mean() if n else 0.0
+    std = degrees.std() if n else 0.0
+    centered = degrees - mean
+    features = {
+        "vertices": int(n),
+        "edges": int(len(neighbors) // 2),
+        "degree_mean": float(mean),
+        "degree_std": float(std),
+        "degree_skewness": float((centered ** 3).mean() / std ** 3) if std > 0 else 0.0,
+        "degree_kurtosis": float((centered ** 4).mean() / std ** 4 - 3) if std > 0 else 0.0,
+        "degree_max": int(degrees.max()) if n else 0,
+        "isolated_vertices": int((degrees == 0).sum()),
+        "degree_one_vertices": int((degrees == 1).sum()),
+    }
+    labels = connected_components(n, offsets, neighbors)
+    sizes = np.bincount(labels, minlength=n) if n else np.zeros(0, dtype=np.int64)
+    features["components"] = int((labels == np.arange(n)).sum())
+    features["largest_component"] = int(sizes.max()) if n else 0
+
+    # Double sweep in the largest component: BFS from its highest-degree vertex, then from the farthest vertex
+    # reached. The larger eccentricity is a lower bound on the diameter.
+    bfs_depth = diameter = 0
+    truncated = False
+    if n:
+        largest = np.flatnonzero(labels == np.argmax(sizes))
+        start = largest[np.argmax(degrees[largest])]
+        depth, bfs_depth, truncated = bfs_depths(offsets, neighbors, start)
+        diameter = bfs_depth
+        if not truncated:
+            _, diameter, truncated = bfs_depths(offsets, neighbors, int(np.argmax(depth)))
+            diameter = max(diameter, bfs_depth)
+    features["bfs_depth"] = int(bfs_depth)
+    features["diameter_estimate"] = int(diameter)
+    features["bfs_truncated"] = bool(truncated)
+    return features
+
+def compute_features(path):
+    """Features of one graph file (.mtx, compressed .mtx or binary .csr)."""
+    if read_csr_header(path) is not None:
+        n, m, offsets, neighbors = map_csr(path)
+        features = csr_features(n, offsets, neighbors)
+        # A CSR file only keeps the entry count: loops and duplicates together.
+        features.update(entries=int(m), self_loops=None, duplicate_entries=None,
+                        dropped_entries=int(m - len(neighbors) // 2))
+        return features
+    n, rows, cols = read_entries(path)
+    offsets, neighbors, self_loops, duplicates = csr_from_entries(n, rows, cols)
+    features = csr_features(n, offsets, neighbors)
+    features.update(entries=int(len(rows)), self_loops=self_loops, duplicate_entries=duplicates,
+                    dropped_entries=self_loops + duplicates)
+    return features
+
+class FeatureIndex:
+    """JSON sidecar of graph features keyed by content hash, rewritten atomically after each new entry."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def get(self, graph_hash):
+        entry = self.entries.get(graph_hash)
+        return entry if entry and entry.get("version") == FEATURE_VERSION else None
+
+    def ensure(self, graph_file, graph_hash=None):
+        """Features of a graph, computed and stored unless the index already has them for this content."""
+        if graph_hash is None:
+            graph_hash = file_sha256(graph_file).hex()
+        entry = self.get(graph_hash)
+        if entry is not None:
+            return entry
+        print(f"Extracting features of {graph_file}...")
+        entry = {"name": os.path.basename(graph_file), "version": FEATURE_VERSION, **compute_features(graph_file)}
+        self.entries[graph_hash] = entry
+        self.save()
+        return entry
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+def index_directory(input_dir, index_path):
+    """Add every graph file in input_dir to the index; returns the index."""
+    index = FeatureIndex(index_path)
+    for filename in sorted(os.listdir(input_dir)):
+        if is_graph_file(filename):
+            index.ensure(os.path.join(input_dir, filename))
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute per-graph features into the sidecar index.")
+    parser.add_argument("input_dir")
+    parser.add_argument("--index", default="graph_features.json")
+    args = parser.parse_args()
+    index = index_directory(args.input_dir, args.index)
+    print(f"{len(index.entries)} graphs in {args.index}")
+
+if __name__ == "__main__":
+    main()
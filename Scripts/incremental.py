@@ -0,0 +1,132 @@
+"""Incremental block-cut tree updates, and a benchmark against full recomputation.
+
+A state is a block-cut tree file written by an engine's --block-cut-tree.
+apply_batch() runs Code/incremental.cpp, which merges the blocks along the
+tree paths that new edges close and writes the updated tree without reading
+the rest of the graph. The benchmark holds out k random edges of a graph for
+each batch size k. It builds the state of the remaining graph, then times
+inserting the batch against rerunning the engine on the whole file. The two
+resulting trees must be byte-identical.
+
+    python Scripts/incremental.py apply state.bct batch.mtx updated.bct
+    python Scripts/incremental.py benchmark matrices/graph.mtx --batch-sizes 1 100 10000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import numpy as np
+from build_engines import build_engine
+from csr_cache import csr_from_entries, read_csr_header, read_entries
+from graph_features import map_csr
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INCREMENTAL_CPP = os.path.join(REPO_ROOT, "Code", "incremental.cpp")
+ENGINE_SOURCES = {engine: os.path.join(REPO_ROOT, "Code", f"{engine}.cpp")
+                  for engine in ("tarjan", "slota", "tarjan_parallel")}
+
+def run_json(command):
+    """The JSON line an engine or the incremental tool prints first."""
+    result = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.splitlines()[0])
+
+def apply_batch(state, batch, output, build_dir="builds"):
+    """Insert the edges of the graph file batch into the tree in state, writing output; returns the tool's JSON."""
+    return run_json([build_engine(INCREMENTAL_CPP, "O3", build_dir), state, batch, output])
+
+def graph_edges(path):
+    """(n, edges): the vertex count and the distinct undirected edges (u < v) of a graph file."""
+    if read_csr_header(path) is not None:
+        n, _m, offsets, neighbors = map_csr(path)
+    else:
+        n, rows, cols = read_entries(path)
+        offsets, neighbors, _, _ = csr_from_entries(n, rows, cols)
+    src = np.repeat(np.arange(n, dtype=np.int32), np.diff(offsets))
+    keep = src < neighbors
+    return n, np.stack([src[keep], np.asarray(neighbors)[keep]], axis=1)
+
+def write_mtx(path, n, edges):
+    """Edges as a 1-based Matrix Market pattern file with n vertices."""
+    with open(path, "w") as f:
+        f.write(f"%%MatrixMarket matrix coordinate pattern symmetric\n{n} {n} {len(edges)}\n")
+        np.savetxt(f, edges[:, ::-1] + 1, fmt="%d")
+
+def benchmark(graph, batch_sizes, engine="tarjan_parallel", trials=3, seed=1, work_dir="incremental_work",
+              build_dir="builds"):
+    """Rows of (batch size, incremental seconds, update seconds, full seconds, touched nodes, identical).
+
+    Times are the medians of the in-process totals over trials. The
+    incremental time covers loading the state, reading the batch, the update
+    and writing the tree. The full time is the engine's run on the whole
+    graph, including parsing it.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    engine_exe = build_engine(ENGINE_SOURCES[engine], "O3", build_dir)
+    incremental_exe = build_engine(INCREMENTAL_CPP, "O3", build_dir)
+    n, edges = graph_edges(graph)
+    rng = np.random.default_rng(seed)
+    full_tree = os.path.join(work_dir, "full.bct")
+    full = [run_json([engine_exe, graph, "--block-cut-tree", full_tree])["total"] for _ in range(trials)]
+    with open(full_tree, "rb") as f:
+        expected = f.read()
+
+    rows = []
+    for size in batch_sizes:
+        size = min(size, len(edges))
+        held_out = np.zeros(len(edges), dtype=bool)
+        held_out[rng.choice(len(edges), size, replace=False)] = True
+        base_graph, batch = os.path.join(work_dir, "base.mtx"), os.path.join(work_dir, "batch.mtx")
+        state, updated = os.path.join(work_dir, "base.bct"), os.path.join(work_dir, "updated.bct")
+        write_mtx(base_graph, n, edges[~held_out])
+        write_mtx(batch, n, edges[held_out])
+        run_json([engine_exe, base_graph, "--block-cut-tree", state])
+
+        results = [run_json([incremental_exe, state, batch, updated]) for _ in range(trials)]
+        with open(updated, "rb") as f:
+            identical = f.read() == expected
+        rows.append((size, statistics.median(r["total"] for r in results),
+                     statistics.median(r["phases"]["update"] for r in results), statistics.median(full),
+                     results[0]["touched"], identical))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply edge batches to block-cut trees, or benchmark doing so.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    apply = commands.add_parser("apply", help="insert a batch of edges into a saved block-cut tree")
+    apply.add_argument("state")
+    apply.add_argument("batch", help="graph file with the new edges, in the state's vertex numbering")
+    apply.add_argument("output")
+    apply.add_argument("--build-dir", default="builds")
+    bench = commands.add_parser("benchmark", help="time incremental updates against full recomputation")
+    bench.add_argument("graph")
+    bench.add_argument("--batch-sizes", nargs="+", type=lambda s: int(float(s)), default=[1, 10, 100, 1000, 10000])
+    bench.add_argument("--engine", choices=sorted(ENGINE_SOURCES), default="tarjan_parallel",
+                       help="engine for the state and the full runs")
+    bench.add_argument("--trials", type=int, default=3)
+    bench.add_argument("--seed", type=int, default=1)
+    bench.add_argument("--work-dir", default="incremental_work")
+    bench.add_argument("--build-dir", default="builds")
+    bench.add_argument("--output", help="append the rows to this CSV file")
+    args = parser.parse_args()
+
+    if args.command == "apply":
+        print(json.dumps(apply_batch(args.state, args.batch, args.output, args.build_dir)))
+        return
+    rows = benchmark(args.graph, args.batch_sizes, args.engine, args.trials, args.seed, args.work_dir, args.build_dir)
+    graph = os.path.basename(args.graph)
+    for size, incremental, update, full, touched, identical in rows:
+        print(f"{graph}: batch {size}, incremental {incremental:.6f}s (update {update:.6f}s, {touched} nodes), "
+              f"full {full:.6f}s, speedup {full / incremental:.1f}x{'' if identical else ', TREES DIFFER'}")
+    if args.output:
+        write_header = not os.path.exists(args.output)
+        with open(args.output, "a") as f:
+            if write_header:
+                f.write("engine,graph,batch,incremental,update,full,speedup,touched,identical\n")
+            for size, incremental, update, full, touched, identical in rows:
+                f.write(f"{args.engine},{graph},{size},{incremental:.6f},{update:.6f},{full:.6f},"
+                        f"{full / incremental:.4f},{touched},{int(identical)}\n")
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Vertex reordering and leaf pruning before an engine run, and mapping its results back.
+
+Code/preprocess.cpp strips degree-1 chains (--prune-leaves) and relabels the
+remaining core in BFS, reverse Cuthill-McKee or decreasing-degree order. It
+writes the core as a binary CSR file the engines run on directly, and a .map
+file with each core vertex's input id and the pruned edges. Every pruned edge
+is a bridge, so it is a block of its own. VertexMap splices those blocks back
+into results computed on the core:
+
+  articulation_points(core_indptr, core_articulation)   input ids, sorted
+  edge_labels(edges, core_indptr, core_indices, core_labels)
+      one block label per input edge, in edge id order, numbered by first
+      appearance as the engines number BCCs (the layout of tarjan --labels)
+
+    python Scripts/preprocess.py run matrices/graph.mtx core.csr --order rcm --prune-leaves
+    python Scripts/preprocess.py labels matrices/graph.mtx core.csr --output graph.labels
+"""
+import argparse
+import os
+import struct
+import numpy as np
+from build_engines import build_engine
+from graph_features import map_csr
+from incremental import graph_edges, run_json
+
+PREPROCESS_CPP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Code", "preprocess.cpp")
+ORDERS = ("none", "bfs", "rcm", "degree")
+
+# Must match Code/preprocess.cpp
+MAP_MAGIC = b"BCCMAP\x00\x00"
+MAP_VERSION = 1
+MAP_HEADER = struct.Struct("<8sIIqqq")
+
+def preprocess(graph, output, order="rcm", prune=False, map_path=None, build_dir="builds"):
+    """Write the preprocessed core of graph to output (and its map to map_path, default output + ".map").
+
+    Returns the tool's JSON record: phases, total, core size, pruned edges and
+    the mean |u - v| over adjacency entries before and after.
+    """
+    command = [build_engine(PREPROCESS_CPP, "O3", build_dir), graph, output, "--order", order]
+    if prune:
+        command.append("--prune-leaves")
+    if map_path is not None:
+        command += ["--map", map_path]
+    return run_json(command)
+
+class VertexMap:
+    """The .map file written next to a preprocessed core."""
+
+    def __init__(self, data):
+        data = memoryview(data).cast("B")
+        if len(data) < MAP_HEADER.size:
+            raise ValueError("not a vertex map: file too short")
+        magic, version, _flags, n, core, pruned = MAP_HEADER.unpack_from(data)
+        if magic != MAP_MAGIC or version != MAP_VERSION:
+            raise ValueError("not a vertex map of this version")
+        if len(data) != MAP_HEADER.size + 4 * (core + 2 * pruned):
+            raise ValueError("vertex map size does not match its header")
+        arrays = np.frombuffer(data, dtype="<i4", offset=MAP_HEADER.size)
+        self.n = n
+        self.old_ids = arrays[:core]
+        # (leaf, vertex it hung from), in removal order
+        self.pruned = arrays[core:].reshape(-1, 2)
+        self.new_ids = np.full(n, -1, dtype=np.int64)
+        self.new_ids[self.old_ids] = np.arange(core)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def articulation_points(self, core_indptr, core_articulation):
+        """Input ids of the articulation points, from those of the core.
+
+        A vertex on a pruned edge is one exactly when it has another edge,
+        since the pruned edge is a bridge.
+        """
+        degree = np.zeros(self.n, dtype=np.int64)
+        degree[self.old_ids] = np.diff(core_indptr)
+        np.add.at(degree, self.pruned.ravel(), 1)
+        touched = np.unique(self.pruned)
+        return np.union1d(self.old_ids[np.asarray(core_articulation, dtype=np.int64)],
+                          touched[degree[touched] >= 2]).astype(np.int32)
+
+    def edge_labels(self, edges, core_indptr, core_indices, core_labels):
+        """Block label per input edge (rows of edges, u < v, in edge id order).
+
+        core_labels gives the block of each core CSR entry (as bcc.py returns
+        them). Edges with a pruned endpoint get a block each.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        core = len(self.old_ids)
+        ends = self.new_ids[edges]
+        in_core = (ends >= 0).all(axis=1)
+        labels = np.empty(len(edges), dtype=np.int64)
+        rows = np.repeat(np.arange(core, dtype=np.int64), np.diff(core_indptr))
+        keys = rows * core + np.asarray(core_indices)
+        positions = np.searchsorted(keys, ends[in_core, 0] * core + ends[in_core, 1])
+        core_labels = np.asarray(core_labels, dtype=np.int64)
+        labels[in_core] = core_labels[positions]
+        bridges = np.count_nonzero(~in_core)
+        labels[~in_core] = (core_labels.max() + 1 if len(core_labels) else 0) + np.arange(bridges)
+        _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.empty(len(first), dtype=np.int64)
+        rank[np.argsort(first)] = np.arange(len(first))
+        return rank[inverse].astype(np.int32)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reorder and prune a graph for the engines, or map core results back.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="write the preprocessed core and its map")
+    run.add_argument("graph")
+    run.add_argument("output", help="binary CSR file for the core")
+    run.add_argument("--order", choices=ORDERS, default="rcm")
+    run.add_argument("--prune-leaves", action="store_true")
+    run.add_argument("--map", help="map file (default: output + .map)")
+    run.add_argument("--build-dir", default="builds")
+    labels = commands.add_parser("labels", help="BCC labels of the input graph, computed on its core in process")
+    labels.add_argument("graph")
+    labels.add_argument("core", help="core CSR file written by run")
+    labels.add_argument("--map", help="map file (default: core + .map)")
+    labels.add_argument("--engine", choices=["slota", "tarjan_vishkin"], default="tarjan_vishkin")
+    labels.add_argument("--output", help="write the labels as int32, one per input edge in edge id order")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        record = preprocess(args.graph, args.output, args.order, args.prune_leaves, args.map, args.build_dir)
+        print(f"{args.graph}: {record['core_vertices']} of {record['n']} vertices kept, {record['pruned_edges']} "
+              f"edges pruned, mean gap {record['mean_gap_before']:.1f} -> {record['mean_gap_after']:.1f}, "
+              f"{record['total']:.6f}s")
+        return
+    import bcc
+    vertex_map = VertexMap.load(args.map or args.core + ".map")
+    _n, _m, indptr, indices = map_csr(args.core)
+    engine = bcc.slota_bcc if args.engine == "slota" else bcc.tarjan_vishkin_bcc
+    core_articulation, core_labels = engine(np.asarray(indptr), np.asarray(indices))
+    _, edges = graph_edges(args.graph)
+    edge_labels = vertex_map.edge_labels(edges, indptr, indices, core_labels)
+    articulation = vertex_map.articulation_points(indptr, core_articulation)
+    blocks = int(edge_labels.max()) + 1 if len(edge_labels) else 0
+    print(f"{args.graph}: {len(edges)} edges, {blocks} blocks, {len(articulation)} articulation points")
+    if args.output:
+        edge_labels.astype("<i4").tofile(args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import platform
+import re
+import socket
+import sqlite3
+import threading
+import time
+from bench_stats import summarize_samples
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    graph_hash TEXT NOT NULL,
+    graph_name TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    compiler_flags TEXT NOT NULL,
+    host TEXT NOT NULL,
+    trial INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    time REAL NOT NULL,
+    memory INTEGER,
+    vertices INTEGER,
+    edges INTEGER,
+    max_rss INTEGER,
+    rss_upper_bound INTEGER,
+    user_time REAL,
+    sys_time REAL,
+    major_faults INTEGER,
+    minor_faults INTEGER,
+    voluntary_switches INTEGER,
+    involuntary_switches INTEGER,
+    schedule_mode TEXT,
+    concurrency INTEGER,
+    cores TEXT,
+    phases TEXT,
+    compressed_bytes INTEGER,
+    decompress_throughput REAL,
+    status TEXT,
+    UNIQUE (graph_hash, engine, source_hash, compiler_flags, host, trial)
+);
+CREATE INDEX IF NOT EXISTS runs_by_build ON runs (engine, source_hash, compiler_flags, host, graph_hash);
+"""
+
+# Columns added after the first schema, with their types, for upgrading older databases in place.
+ADDED_COLUMNS = [("compressed_bytes", "INTEGER"), ("decompress_throughput", "REAL"), ("status", "TEXT"),
+                 ("rss_upper_bound", "INTEGER")]
+
+def host_id():
+    """Identify the machine results were measured on."""
+    return f"{socket.gethostname()} {platform.machine()} {os.cpu_count()}cpu"
+
+INCLUDE_PATTERN = re.compile(rb'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+def local_includes(cpp_file):
+    """The source file and every file it reaches through #include "...", in a stable order.
+
+    Quoted includes are resolved relative to the including file; ones that
+    do not exist there (e.g. Python.h found on the include path) are left out.
+    """
+    seen = []
+    pending = [os.path.abspath(cpp_file)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.append(path)
+        with open(path, "rb") as f:
+            names = INCLUDE_PATTERN.findall(f.read())
+        for name in names:
+            included = os.path.normpath(os.path.join(os.path.dirname(path), name.decode()))
+            if os.path.isfile(included):
+                pending.append(included)
+    return [seen[0]] + sorted(seen[1:])
+
+def source_hash(cpp_file):
+    """Hash an engine source together with the headers it includes, directly or not, so only engines that use an edited header are invalidated."""
+    digest = hashlib.sha256()
+    for path in local_includes(cpp_file):
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+class ResultsStore:
+    """SQLite store of individual trials keyed by graph hash, engine build, host and trial number.
+
+    Every trial is committed as soon as it finishes, so an interrupted sweep
+    resumes from the trials already on disk. Safe to share across threads.
+    A trial a resource limit stopped is kept as a censored measurement: status
+    names the limit ("timeout", "aborted", "cpu_limit" or "oom") and time is
+    how long it ran. Completed trials have no status.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        for name, column_type in ADDED_COLUMNS:
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE runs ADD COLUMN {name} {column_type}")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def trial_times(self, graph_hash, build):
+        """Times of the completed trials already stored for a graph under a build dict (engine, source_hash, compiler_flags, host)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT time FROM runs WHERE graph_hash=? AND engine=? AND source_hash=? AND compiler_flags=? AND host=? "
+                "AND status IS NULL ORDER BY trial",
+                (graph_hash, build["engine"], build["source_hash"], build["compiler_flags"], build["host"])
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def censored_status(self, graph_hash, build):
+        """Status of the latest censored trial of a graph under a build dict, or None if no limit stopped one."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM runs WHERE graph_hash=? AND engine=? AND source_hash=? AND compiler_flags=? AND host=? "
+                "AND status IS NOT NULL ORDER BY trial DESC LIMIT 1",
+                (graph_hash, build["engine"], build["source_hash"], build["compiler_flags"], build["host"])
+            ).fetchone()
+        return row[0] if row else None
+
+    def add_trial(self, graph_hash, graph_name, build, time_taken, integers, usage, phases, placement=None):
+        """Insert one trial with the next free trial number and commit it.
+
+        When the engine streamed a compressed input, its compressed size and
+        decompress throughput (decompressed bytes per second of streaming) are kept too.
+        A censored run (usage["status"] set) may have no integers.
+        """
+        placement = placement or {}
+        integers = integers or (None, None, None)
+        stream = (phases or {}).get("input") or {}
+        throughput = stream["decompressed_bytes"] / stream["stream_seconds"] if stream.get("stream_seconds") else None
+        with self._lock:
+            (trial,) = self._conn.execute(
+                "SELECT COUNT(*) FROM runs WHERE graph_hash=? AND engine=? AND source_hash=? AND compiler_flags=? AND host=?",
+                (graph_hash, build["engine"], build["source_hash"], build["compiler_flags"], build["host"])
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO runs (graph_hash, graph_name, engine, source_hash, compiler_flags, host, trial, created_at, "
+                "time, memory, vertices, edges, max_rss, rss_upper_bound, user_time, sys_time, major_faults, minor_faults, "
+                "voluntary_switches, involuntary_switches, schedule_mode, concurrency, cores, phases, "
+                "compressed_bytes, decompress_throughput, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (graph_hash, graph_name, build["engine"], build["source_hash"], build["compiler_flags"], build["host"],
+                 trial, time.time(), time_taken, integers[2], integers[0], integers[1],
+                 usage["max_rss"], usage["rss_upper_bound"], usage["user_time"], usage["sys_time"], usage["major_faults"], usage["minor_faults"],
+                 usage["voluntary_switches"], usage["involuntary_switches"],
+                 placement.get("mode"), placement.get("concurrency"),
+                 ",".join(map(str, placement["cores"])) if "cores" in placement else None,
+                 json.dumps(phases["phases"]) if phases else None,
+                 stream.get("compressed_bytes"), throughput, usage.get("status"))
+            )
+            self._conn.commit()
+
+    def latest_build(self, engine, compiler_flags=None, host=None, variant=None):
+        """(source_hash, compiler_flags, host) of the most recent trial of an engine, optionally filtered.
+
+        variant matches the build variant name inside the compiler_flags tag (e.g. "O3-pgo").
+        """
+        query = "SELECT source_hash, compiler_flags, host FROM runs WHERE engine=?"
+        params = [engine]
+        if compiler_flags is not None:
+            query += " AND compiler_flags=?"
+            params.append(compiler_flags)
+        if variant is not None:
+            query += " AND compiler_flags LIKE ?"
+            params.append(f"% | {variant}: %")
+        if host is not None:
+            query += " AND host=?"
+            params.append(host)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY created_at DESC LIMIT 1", params).fetchone()
+
+    def build_runs(self, engine, build, columns):
+        """Rows of the given columns for every trial of one build, a (source_hash, compiler_flags, host) tuple."""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM runs WHERE engine=? AND source_hash=? AND compiler_flags=? AND host=? "
+                "ORDER BY graph_hash, trial", (engine, *build)
+            ).fetchall()
+
+def has_enough_trials(times, benchmark=None):
+    """Whether stored trials already satisfy a single run or the benchmark stop rule."""
+    if benchmark is None:
+        return len(times) >= 1
+    if len(times) >= benchmark["max_reps"]:
+        return True
+    if len(times) < benchmark["min_reps"]:
+        return False
+    stats = summarize_samples(times)
+    return stats["ci_half_width"] <= benchmark["ci_target"] * stats["median"]
@@ -0,0 +1,100 @@
+import os
+import threading
+from csr_cache import open_graph_text, read_csr_header
+
+# Coarse per-run footprint model used to cap concurrency. Tarjan's edge map and
+# edge lists dominate, so the per-entry figure is deliberately pessimistic.
+BYTES_PER_VERTEX = 64
+BYTES_PER_ENTRY = 128
+
+def available_cores():
+    """CPU ids this process may run on."""
+    return sorted(os.sched_getaffinity(0))
+
+def physical_memory_bytes():
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+def graph_size(input_file):
+    """Return (n, nnz) from a CSR cache header or the size line of a (possibly compressed) .mtx file."""
+    header = read_csr_header(input_file)
+    if header is not None:
+        _, n, _, nnz, _ = header
+        return n, nnz
+    with open_graph_text(input_file) as f:
+        for line in f:
+            if line.strip() and not line.startswith("%"):
+                rows, _cols, nnz = map(int, line.split()[:3])
+                return rows, 2 * nnz
+    return 0, 0
+
+def estimate_job_memory(input_file):
+    """Estimated peak bytes for one engine run on input_file."""
+    n, nnz = graph_size(input_file)
+    return BYTES_PER_VERTEX * n + BYTES_PER_ENTRY * nnz
+
+class CoreScheduler:
+    """Hands out dedicated core sets to runs and caps concurrency by a memory budget.
+
+    "exclusive" mode runs one job at a time on a core set away from CPU 0, for
+    final numbers. "throughput" mode runs as many jobs as there are disjoint
+    core sets (at most max_workers), for quick sweeps. A job whose memory
+    estimate does not fit waits until enough running jobs finish, but a job
+    always starts when nothing else is running.
+    """
+
+    def __init__(self, mode="throughput", cores_per_job=1, max_workers=None, memory_budget=None):
+        if mode not in ("exclusive", "throughput"):
+            raise ValueError(f"Unknown scheduling mode: {mode}")
+        cores = available_cores()
+        cores_per_job = max(1, min(cores_per_job, len(cores)))
+        if mode == "exclusive":
+            core_sets = [cores[-cores_per_job:]]
+        else:
+            core_sets = [cores[i:i + cores_per_job] for i in range(0, len(cores) - cores_per_job + 1, cores_per_job)]
+            if max_workers is not None:
+                core_sets = core_sets[:max(1, max_workers)]
+
+        self.mode = mode
+        self.slots = len(core_sets)
+        self.memory_budget = memory_budget if memory_budget is not None else int(0.8 * physical_memory_bytes())
+        self._free = list(core_sets)
+        self._memory_in_use = 0
+        self._running = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, memory):
+        """Block until a core set and enough memory are free; return (cores, concurrency at launch)."""
+        with self._cond:
+            while not self._free or (self._running > 0 and self._memory_in_use + memory > self.memory_budget):
+                self._cond.wait()
+            cores = self._free.pop(0)
+            self._memory_in_use += memory
+            self._running += 1
+            return cores, self._running
+
+    def release(self, cores, memory):
+        with self._cond:
+            self._free.append(cores)
+            self._memory_in_use -= memory
+            self._running -= 1
+            self._cond.notify_all()
+
+    def run(self, fn, executable, input_file, memory_cap=None, **kwargs):
+        """Run fn(executable, input_file, cores=..., **kwargs) under a reservation; return (result, placement).
+
+        memory_cap bounds the reservation for runs that enforce their own memory budget.
+        """
+        memory = estimate_job_memory(input_file)
+        if memory_cap is not None:
+            memory = min(memory, memory_cap)
+        cores, concurrency = self.acquire(memory)
+        try:
+            result = fn(executable, input_file, cores=cores, **kwargs)
+        finally:
+            self.release(cores, memory)
+        placement = {"mode": self.mode, "concurrency": concurrency, "cores": cores, "estimated_memory": memory}
+        return result, placement
+
+def order_largest_first(input_files):
+    """Sort inputs by estimated footprint, largest first, to shorten the makespan."""
+    return sorted(input_files, key=estimate_job_memory, reverse=True)
@@ -1,85 +1,950 @@
 import subprocess
 import os
+import json
+import math
+import random
+import resource
+import signal
 import time
+import argparse
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from csr_cache import ensure_csr_cache, file_sha256, is_graph_file, read_csr_header, read_input_stats
+from graph_features import FeatureIndex
+from cost_model import CostModel, training_samples
+from bench_stats import summarize_samples
+from scheduler import CoreScheduler, available_cores, order_largest_first
+from results_store import ResultsStore, has_enough_trials, host_id, source_hash
+from build_engines import BUILD_VARIANTS, build_engine, pick_training_inputs, variant_tag
+from preprocess import ORDERS, preprocess
 
-def compile_cpp_code(cpp_file, executable_name):
-    """Compile the C++ code using g++."""
-    compile_command = ["g++", cpp_file, "-o", executable_name]
-    try:
-        subprocess.run(compile_command, check=True)
-        print(f"Compilation of {cpp_file} successful.")
-    except subprocess.CalledProcessError:
-        print(f"Compilation of {cpp_file} failed.")
-        exit(1)
-
-def run_cpp_with_input_file(executable, input_file):
-    """Run the compiled executable with a given .mtx input file and return the time taken and output."""
-    start_time = time.time()
-    try:
-        result = subprocess.run(
-            [f"./{executable}", input_file], check=True, capture_output=True, text=True
-        )
-        output = result.stdout
-    except subprocess.CalledProcessError as e:
-        print(f"Error running {input_file}: {e.stderr}")
-        return input_file, None, None
-    
-    end_time = time.time()
+# Engines script.py can build and run, and those that take --threads. "auto" picks one of
+# --auto-engines per graph from the cost model.
+ENGINES = ["tarjan", "slota", "tarjan_parallel", "auto"]
+THREADED_ENGINES = ["slota", "tarjan_parallel"]
+
+def limit_resources(cores=None, limits=None):
+    """preexec_fn that pins the child to cores and applies the CPU-time and address-space caps in limits, or None."""
+    limits = limits or {}
+    if not cores and not limits.get("cpu_timeout") and not limits.get("memory_limit"):
+        return None
+
+    def apply():
+        if cores:
+            os.sched_setaffinity(0, cores)
+        if limits.get("cpu_timeout"):
+            # SIGXCPU at the soft limit, SIGKILL a second later should the engine survive it
+            seconds = math.ceil(limits["cpu_timeout"])
+            resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+        if limits.get("memory_limit"):
+            resource.setrlimit(resource.RLIMIT_AS, (limits["memory_limit"], limits["memory_limit"]))
+    return apply
+
+def run_with_rusage(command, cores=None, limits=None):
+    """Run a command, wait for it with os.wait4 and return (returncode, stdout, stderr, rusage, killed).
+
+    The resource usage comes from the kernel accounting of the reaped child, so
+    it covers the whole process rather than what the program reports itself.
+    Its ru_maxrss is not used: Linux carries the pre-exec high-water mark over
+    exec, so it never reads below the RSS this Python process had when it
+    forked the child. If cores is given, the child is pinned to those CPUs before exec. limits
+    may set cpu_timeout (seconds, RLIMIT_CPU) and memory_limit (bytes,
+    RLIMIT_AS), applied before exec, and a wall-clock timeout (the smaller of
+    timeout and abort_after), after which the child is killed and killed is True.
+    """
+    limits = limits or {}
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                            preexec_fn=limit_resources(cores, limits))
+    wall = min((limits[key] for key in ("timeout", "abort_after") if limits.get(key)), default=None)
+    timer = None
+    kill_lock = threading.Lock()
+    state = {"exited": False, "killed": False}
+    if wall is not None:
+        def kill():
+            # The child is only waited for, not reaped, until exited is set, so its pid cannot be reused here.
+            with kill_lock:
+                if not state["exited"]:
+                    os.kill(proc.pid, signal.SIGKILL)
+                    state["killed"] = True
+        timer = threading.Timer(wall, kill)
+        timer.daemon = True
+        timer.start()
+    stderr_chunks = []
+    stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()))
+    stderr_reader.start()
+    stdout = proc.stdout.read()
+    stderr_reader.join()
+    proc.stdout.close()
+    proc.stderr.close()
+    if timer is not None:
+        os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+        with kill_lock:
+            state["exited"] = True
+        timer.cancel()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, stdout, "".join(stderr_chunks), usage, state["killed"]
+
+def censored_status(returncode, stderr, usage, limits, killed):
+    """Why a run under limits was stopped: "timeout", "aborted", "cpu_limit" or "oom"; None if no limit stopped it.
+
+    A wall-clock kill is "aborted" when the early-abort deadline was the
+    tighter one. A SIGKILL that was not ours is taken for the kernel's OOM
+    killer; RLIMIT_AS shows up as a failed allocation (std::bad_alloc).
+    """
+    if returncode == 0:
+        return None
+    if killed:
+        abort_after, timeout = limits.get("abort_after"), limits.get("timeout")
+        return "aborted" if abort_after and (not timeout or abort_after < timeout) else "timeout"
+    cpu_time = usage.ru_utime + usage.ru_stime
+    if returncode == -signal.SIGXCPU or (returncode == -signal.SIGKILL and limits.get("cpu_timeout")
+                                         and cpu_time >= limits["cpu_timeout"]):
+        return "cpu_limit"
+    if returncode == -signal.SIGKILL or "bad_alloc" in stderr or "Cannot allocate memory" in stderr:
+        return "oom"
+    return None
+
+def rusage_to_dict(usage, peak_rss=None):
+    """Extract the fields we record per run from a resource.struct_rusage.
+
+    max_rss is peak_rss, the engine's own VmHWM from its JSON record, or None
+    when the engine wrote none (a run a limit stopped). rss_upper_bound is the
+    kernel's ru_maxrss, which Linux carries over exec from the forking Python
+    process, so it is only an upper bound on the engine's peak.
+    """
+    return {
+        "max_rss": peak_rss,
+        "rss_upper_bound": usage.ru_maxrss * 1024,
+        "user_time": usage.ru_utime,
+        "sys_time": usage.ru_stime,
+        "major_faults": usage.ru_majflt,
+        "minor_faults": usage.ru_minflt,
+        "voluntary_switches": usage.ru_nvcsw,
+        "involuntary_switches": usage.ru_nivcsw,
+    }
+
+def parse_phase_record(output_lines):
+    """Return the per-phase timing record the engines print as a JSON line, or None."""
+    for line in output_lines:
+        if line.startswith("{"):
+            try:
+                return json.loads(line)
+            except ValueError:
+                print(f"Could not parse phase record: {line}")
+    return None
+
+def with_input_stats(phases, run_file):
+    """phases with the "input" record saved when run_file was converted from a compressed source.
+
+    A run on the CSR cache never reads the compressed file, so the record of
+    its one conversion stands in. A record the engine streamed itself wins.
+    """
+    if phases is None or "input" in phases:
+        return phases
+    stream = read_input_stats(run_file)
+    return dict(phases, input=stream) if stream else phases
+
+def run_cpp_with_input_file(executable, input_file, cores=None, args=(), limits=None):
+    """Run the compiled executable with a given .mtx input file and return the time taken, output, rusage and phase timings.
+
+    args are extra command-line arguments for the engine, e.g. ("--threads", "4").
+    limits is a dict of run_with_rusage caps. A run one of them stops is
+    returned as a censored measurement rather than an error: the time is how
+    long it ran (a lower bound), usage["status"] says which limit stopped it,
+    integers carry the CSR header's n and m when the input is a CSR file
+    (memory None), usage["max_rss"] is None (usage["rss_upper_bound"] still
+    bounds it) and phases is None.
+    """
+    start_time = time.perf_counter_ns()
+    returncode, output, stderr, usage, killed = run_with_rusage([os.path.abspath(executable), input_file, *args], cores,
+                                                                limits)
+    end_time = time.perf_counter_ns()
+    if returncode != 0:
+        status = censored_status(returncode, stderr, usage, limits, killed) if limits else None
+        if status is not None:
+            header = read_csr_header(input_file)
+            integers = [header[1], header[2], None] if header else None
+            return input_file, (end_time - start_time) / 1e9, integers, dict(rusage_to_dict(usage), status=status), None
+        print(f"Error running {input_file}: {stderr}")
+        return input_file, None, None, None, None
 
     output_lines = output.strip().split("\n")
     if output_lines:
         try:
             integers = list(map(int, output_lines[-1].split()))
             if len(integers) == 3:
-                return input_file, end_time - start_time, integers
+                phases = with_input_stats(parse_phase_record(output_lines[:-1]), input_file)
+                peak_rss = phases.get("peak_rss") if phases else None
+                return input_file, (end_time - start_time) / 1e9, integers, rusage_to_dict(usage, peak_rss), phases
             else:
                 print(f"Unexpected output format in {input_file}. Expected 3 integers.")
         except ValueError:
             print(f"Could not parse integers from output of {input_file}.")
     
-    return input_file, None, None
-
-def process_files_concurrent(executable, input_dir, output_txt, max_workers=8):
-    """Process each .mtx file concurrently using threads."""
-    futures = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for filename in os.listdir(input_dir):
-            if filename.endswith(".mtx"):
-                input_file = os.path.join(input_dir, filename)
-                print(f"Submitting {input_file}...")
-                futures.append(executor.submit(run_cpp_with_input_file, executable, input_file))
+    return input_file, None, None, None, None
+
+def run_status(result):
+    """The censored status of a run_cpp_with_input_file result, or None for a completed (or failed) run."""
+    usage = result[3]
+    return usage.get("status") if usage else None
+
+def drop_page_cache():
+    """Flush dirty pages and drop the OS page cache so the next run reads its input cold.
+
+    Needs root; returns False (and the run stays warm) when that is not possible.
+    """
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+def benchmark_input_file(executable, input_file, warmup=1, min_reps=6, max_reps=50, ci_target=0.02, cold=False, cores=None,
+                         previous_samples=None, on_trial=None, args=(), limits=None):
+    """Run one input repeatedly and return the same tuple as run_cpp_with_input_file plus a stats dict.
+
+    After the warmup runs, trials continue until the 95% CI half-width is at
+    most ci_target times the median (checked once min_reps trials exist) or
+    max_reps is reached. With cold=True the page cache is dropped before each
+    trial. The reported time is the median, and max_rss and rss_upper_bound are
+    the largest over trials.
+    previous_samples resumes from trials already recorded, and on_trial(result,
+    cores) is called after each new trial so it can be persisted immediately.
+    args and limits are passed through to run_cpp_with_input_file. A censored
+    trial (or warmup run) ends the benchmark: it is passed to on_trial and
+    returned as it is, with stats None.
+    """
+    for _ in range(warmup):
+        result = run_cpp_with_input_file(executable, input_file, cores, args, limits)
+        if run_status(result) is not None:
+            if on_trial is not None:
+                on_trial(result, cores)
+            return (*result, None)
+
+    samples = list(previous_samples or [])
+    peak_rss = rss_bound = 0
+    result = None
+    while len(samples) < max_reps:
+        if cold and not drop_page_cache():
+            print(f"Could not drop page cache before {input_file}; continuing warm.")
+            cold = False
+        result = run_cpp_with_input_file(executable, input_file, cores, args, limits)
+        if result[1] is None:
+            return input_file, None, None, None, None, None
+        if run_status(result) is not None:
+            if on_trial is not None:
+                on_trial(result, cores)
+            return (*result, None)
+        samples.append(result[1])
+        peak_rss = max(peak_rss, result[3]["max_rss"] or 0)
+        rss_bound = max(rss_bound, result[3]["rss_upper_bound"] or 0)
+        if on_trial is not None:
+            on_trial(result, cores)
+        if len(samples) >= min_reps:
+            stats = summarize_samples(samples)
+            if stats["ci_half_width"] <= ci_target * stats["median"]:
+                break
+
+    stats = summarize_samples(samples)
+    _, _, integers, usage, phases = result
+    usage = dict(usage, max_rss=peak_rss or None, rss_upper_bound=rss_bound or None)
+    return input_file, stats["median"], integers, usage, phases, stats
+
+def format_rss(rss):
+    """A max_rss or rss_upper_bound as written to result lines: bytes, or "unknown" when there is none."""
+    return "unknown" if rss is None else f"{rss} Bytes"
+
+def format_result_line(filename, time_taken, integers, usage, phases, stats=None, placement=None, variant=None, engine=None):
+    """Format one result line; rusage, trial statistics, placement, build variant, the engine auto picked and phases are appended after the original fields."""
+    line = (
+        f"{filename}: {time_taken:.6f} seconds, Memory : {integers[2]} Bytes, Integers: {integers[0]}, {integers[1]}, "
+        f"MaxRSS : {format_rss(usage['max_rss'])}, RSS bound : {format_rss(usage['rss_upper_bound'])}, User : {usage['user_time']:.6f} seconds, Sys : {usage['sys_time']:.6f} seconds, "
+        f"Faults : {usage['major_faults']} major {usage['minor_faults']} minor, "
+        f"Switches : {usage['voluntary_switches']} voluntary {usage['involuntary_switches']} involuntary"
+    )
+    if stats:
+        line += (
+            f", Trials : {stats['trials']} ({stats['kept']} kept), Median : {stats['median']:.6f} seconds, "
+            f"MAD : {stats['mad']:.6f} seconds, CI95 : [{stats['ci_low']:.6f}, {stats['ci_high']:.6f}] seconds"
+        )
+    if placement:
+        line += (
+            f", Schedule : {placement['mode']} concurrency {placement['concurrency']}, "
+            f"Cores : {','.join(map(str, placement['cores']))}"
+        )
+    if variant:
+        line += f", Build : {variant}"
+    if engine:
+        line += f", Engine : {engine}"
+    if phases and phases.get("input"):
+        stream = phases["input"]
+        line += (
+            f", Input : {stream['compressed_bytes']:.0f} compressed bytes, "
+            f"{stream['decompressed_bytes'] / stream['stream_seconds'] / 1e6:.1f} MB/s decompressed"
+        )
+    if phases:
+        line += f", Phases : {json.dumps(phases['phases'])}"
+    return line + "\n"
+
+def format_censored_line(filename, time_taken, integers, usage, placement=None, variant=None, engine=None):
+    """Format the result line of a run a limit stopped: how long it ran, the limit, what is known of the graph and rusage."""
+    line = f"{filename}: {time_taken:.6f} seconds, Censored : {usage['status']}"
+    if integers:
+        line += f", Integers: {integers[0]}, {integers[1]}"
+    line += (
+        f", MaxRSS : {format_rss(usage['max_rss'])}, RSS bound : {format_rss(usage['rss_upper_bound'])}, User : {usage['user_time']:.6f} seconds, Sys : {usage['sys_time']:.6f} seconds, "
+        f"Faults : {usage['major_faults']} major {usage['minor_faults']} minor, "
+        f"Switches : {usage['voluntary_switches']} voluntary {usage['involuntary_switches']} involuntary"
+    )
+    if placement:
+        line += (
+            f", Schedule : {placement['mode']} concurrency {placement['concurrency']}, "
+            f"Cores : {','.join(map(str, placement['cores']))}"
+        )
+    if variant:
+        line += f", Build : {variant}"
+    if engine:
+        line += f", Engine : {engine}"
+    return line + "\n"
+
+def reference_time(store, graph_hash, build, engines):
+    """Fastest stored median time on a graph among the other engines' latest builds with the same flags and host, or None."""
+    medians = []
+    for engine in engines:
+        if engine == build["engine"]:
+            continue
+        latest = store.latest_build(engine, build["compiler_flags"], build["host"])
+        if latest is None:
+            continue
+        times = store.trial_times(graph_hash, dict(zip(("source_hash", "compiler_flags", "host"), latest), engine=engine))
+        if times:
+            medians.append(summarize_samples(times)["median"])
+    return min(medians, default=None)
+
+def collect_run_files(input_dir, csr_cache_dir=None, store=None, build=None, benchmark=None, retry_censored=False):
+    """Map the file each engine run reads to (source file, graph hash) for every graph file in input_dir.
+
+    Graphs that already have enough stored trials for this build are skipped,
+    and so are graphs a limit stopped before, unless retry_censored is set.
+    Also returns the stored trial times per graph hash.
+    """
+    run_files = {}
+    previous = {}
+    for filename in os.listdir(input_dir):
+        if is_graph_file(filename):
+            input_file = os.path.join(input_dir, filename)
+            digest = file_sha256(input_file)
+            graph_hash = digest.hex()
+            if store is not None:
+                previous[graph_hash] = store.trial_times(graph_hash, build)
+                if has_enough_trials(previous[graph_hash], benchmark):
+                    print(f"Skipping {input_file}: {len(previous[graph_hash])} trials already stored.")
+                    continue
+                status = None if retry_censored else store.censored_status(graph_hash, build)
+                if status is not None:
+                    print(f"Skipping {input_file}: stopped by a limit ({status}) before.")
+                    continue
+            run_file = ensure_csr_cache(input_file, csr_cache_dir, digest) if csr_cache_dir else input_file
+            run_files[run_file] = (input_file, graph_hash)
+    return run_files, previous
+
+def process_files_concurrent(executable, input_dir, output_txt, max_workers=8, csr_cache_dir=None, benchmark=None,
+                             mode="throughput", cores_per_job=1, memory_budget=None, store=None, build=None, args=(),
+                             memory_cap=None, limits=None, abort_factor=None, reference_engines=(), retry_censored=False):
+    """Process each .mtx file concurrently, largest first, each run pinned to its own cores.
+
+    If csr_cache_dir is given, each matrix is converted once to a binary CSR
+    file there and the executable is run on that file instead of the text.
+    If benchmark is a dict of benchmark_input_file options, each file is run
+    as a repeated-trial benchmark instead of once. mode, cores_per_job and
+    memory_budget configure the CoreScheduler. With a ResultsStore and a build
+    dict (engine, source_hash, compiler_flags, host), every trial is stored,
+    and graphs that already have enough trials for this build are skipped.
+    args are extra engine arguments. memory_cap (bytes) bounds what the
+    scheduler reserves per run, for engines run with --memory-budget.
+    limits caps every run (see run_with_rusage). With abort_factor and a
+    store, a run is also stopped once it takes abort_factor times the fastest
+    of reference_engines on the same graph. Runs a limit stopped are stored
+    and written as censored results.
+    """
+    scheduler = CoreScheduler(mode, cores_per_job, max_workers, memory_budget)
+    run_files, previous = collect_run_files(input_dir, csr_cache_dir, store, build, benchmark, retry_censored)
+
+    def graph_limits(graph_hash):
+        reference = reference_time(store, graph_hash, build, reference_engines) if abort_factor and store else None
+        return dict(limits or {}, abort_after=abort_factor * reference) if reference else limits
+
+    def record_trial(input_file, graph_hash, result, placement):
+        _, time_taken, integers, usage, phases = result[:5]
+        if store is not None and time_taken is not None:
+            store.add_trial(graph_hash, os.path.basename(input_file), build, time_taken, integers, usage, phases, placement)
+
+    futures = {}
+    with ThreadPoolExecutor(max_workers=scheduler.slots) as executor:
+        for run_file in order_largest_first(run_files):
+            input_file, graph_hash = run_files[run_file]
+            print(f"Submitting {input_file}...")
+            if benchmark is not None:
+                on_trial = (lambda result, cores, input_file=input_file, graph_hash=graph_hash:
+                            record_trial(input_file, graph_hash, result, {"mode": scheduler.mode, "cores": cores}))
+                future = executor.submit(scheduler.run, benchmark_input_file, executable, run_file, **benchmark,
+                                         previous_samples=previous.get(graph_hash), on_trial=on_trial, args=args,
+                                         limits=graph_limits(graph_hash), memory_cap=memory_cap)
+            else:
+                future = executor.submit(scheduler.run, run_cpp_with_input_file, executable, run_file, args=args,
+                                         limits=graph_limits(graph_hash), memory_cap=memory_cap)
+            futures[future] = (input_file, graph_hash)
         
         with open(output_txt, "a") as output_file:
             for future in as_completed(futures):
-                input_file, time_taken, integers = future.result()
-                if time_taken is not None and integers is not None:
+                result, placement = future.result()
+                _, time_taken, integers, usage, phases, *stats = result
+                stats = stats[0] if stats else None
+                input_file, graph_hash = futures[future]
+                status = run_status(result)
+                if status is not None:
+                    if benchmark is None:
+                        record_trial(input_file, graph_hash, result, placement)
+                    filename = os.path.basename(input_file)
+                    variant = build["compiler_flags"] if build else None
+                    output_file.write(format_censored_line(filename, time_taken, integers, usage, placement, variant))
+                    print(f"{filename}: stopped after {time_taken:.6f}s ({status})")
+                elif time_taken is not None and integers is not None:
+                    if benchmark is None:
+                        record_trial(input_file, graph_hash, result, placement)
                     filename = os.path.basename(input_file)
-                    output_file.write(
-                        f"{filename}: {time_taken:.6f} seconds, Memory : {integers[2]} Bytes, Integers: {integers[0]}, {integers[1]}\n"
-                    )
-                    print(f"{filename}: {time_taken:.6f}s, Mem: {integers[2]} Bytes, Ints: {integers[0]}, {integers[1]}")
+                    variant = build["compiler_flags"] if build else None
+                    output_file.write(format_result_line(filename, time_taken, integers, usage, phases, stats, placement, variant))
+                    print(f"{filename}: {time_taken:.6f}s, Mem: {integers[2]} Bytes, MaxRSS: {format_rss(usage['max_rss'])} (at most {format_rss(usage['rss_upper_bound'])}), Ints: {integers[0]}, {integers[1]}")
                 else:
                     print(f"Failed to process {input_file}")
             output_file.write("\n")
 
     print(f"Results saved to {output_txt}")
 
+def read_proc_usage(pid):
+    """Cumulative rusage-style counters of a live process from /proc, in rusage_to_dict's units (without the RSS fields)."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    with open(f"/proc/{pid}/status") as f:
+        status = dict(line.split(":", 1) for line in f if ":" in line)
+    ticks = os.sysconf("SC_CLK_TCK")
+    return {
+        "user_time": int(fields[11]) / ticks,
+        "sys_time": int(fields[12]) / ticks,
+        "major_faults": int(fields[9]),
+        "minor_faults": int(fields[7]),
+        "voluntary_switches": int(status["voluntary_ctxt_switches"]),
+        "involuntary_switches": int(status["nonvoluntary_ctxt_switches"]),
+    }
+
+class BatchWorker:
+    """A long-lived engine process in --batch mode, fed one graph path at a time over stdin.
+
+    run() returns the same tuple as run_cpp_with_input_file. The time is the
+    engine's in-process total, and usage is the /proc delta over that graph.
+    The engine resets its peak RSS before each graph, but its scratch buffers
+    stay resident at the size of the largest graph so far, so only the first
+    graph of a worker process gets the record's peak_rss as max_rss; later
+    graphs store None, and the record's peak_rss only as rss_upper_bound. A
+    worker that dies is restarted for the next graph.
+    """
+
+    def __init__(self, executable, cores=None, args=()):
+        self.command = [os.path.abspath(executable), "--batch", "-", *args]
+        self.cores = cores
+        self.proc = None
+        self.fresh = False
+
+    def start(self):
+        self.proc = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1,
+                                     preexec_fn=limit_resources(self.cores))
+        self.fresh = True
+
+    def run(self, input_file):
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+        try:
+            before = read_proc_usage(self.proc.pid)
+            self.proc.stdin.write(input_file + "\n")
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+            after = read_proc_usage(self.proc.pid)
+        except (OSError, ValueError):
+            line = ""
+        if not line:
+            print(f"Error running {input_file}: batch worker exited")
+            self.close()
+            return input_file, None, None, None, None
+        fresh, self.fresh = self.fresh, False
+        record = json.loads(line)
+        if "error" in record:
+            print(f"Error running {input_file}: {record['error']}")
+            return input_file, None, None, None, None
+        usage = {key: after[key] - before[key] for key in after}
+        usage["max_rss"] = record.get("peak_rss") if fresh else None
+        usage["rss_upper_bound"] = record.get("peak_rss")
+        return input_file, record["total"], [record["n"], record["m"], record["memory"]], usage, with_input_stats(record, input_file)
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+            self.proc.wait()
+            self.proc = None
+
+def process_files_batch(executable, input_dir, output_txt, max_workers=8, csr_cache_dir=None, cores_per_job=1,
+                        store=None, build=None, args=()):
+    """Like process_files_concurrent, but through a pool of long-lived --batch engine processes.
+
+    One BatchWorker is started per disjoint core set (at most max_workers), so
+    process startup and allocator warmup are paid once per worker rather than
+    once per graph. Graphs are handed out largest first.
+    """
+    scheduler = CoreScheduler("throughput", cores_per_job, max_workers)
+    run_files, _ = collect_run_files(input_dir, csr_cache_dir, store, build)
+    pending = order_largest_first(run_files)
+    pending.reverse()
+    pending_lock = threading.Lock()
+    results = []
+
+    def drain(cores):
+        worker = BatchWorker(executable, cores, args)
+        try:
+            while True:
+                with pending_lock:
+                    if not pending:
+                        return
+                    run_file = pending.pop()
+                result = worker.run(run_file)
+                input_file, graph_hash = run_files[run_file]
+                placement = {"mode": "batch", "concurrency": scheduler.slots, "cores": cores}
+                if result[1] is not None and store is not None:
+                    _, time_taken, integers, usage, phases = result
+                    store.add_trial(graph_hash, os.path.basename(input_file), build, time_taken, integers, usage, phases, placement)
+                with pending_lock:
+                    results.append((input_file, result, placement))
+        finally:
+            worker.close()
+
+    core_sets = [scheduler.acquire(0)[0] for _ in range(scheduler.slots)]
+    with ThreadPoolExecutor(max_workers=len(core_sets)) as executor:
+        for future in [executor.submit(drain, cores) for cores in core_sets]:
+            future.result()
+
+    with open(output_txt, "a") as output_file:
+        for input_file, (_, time_taken, integers, usage, phases), placement in results:
+            filename = os.path.basename(input_file)
+            if time_taken is None:
+                print(f"Failed to process {input_file}")
+                continue
+            variant = build["compiler_flags"] if build else None
+            output_file.write(format_result_line(filename, time_taken, integers, usage, phases, None, placement, variant))
+            print(f"{filename}: {time_taken:.6f}s, Mem: {integers[2]} Bytes, MaxRSS: {format_rss(usage['max_rss'])} (at most {format_rss(usage['rss_upper_bound'])}), Ints: {integers[0]}, {integers[1]}")
+        output_file.write("\n")
+    print(f"Results saved to {output_txt}")
+
+def fit_cost_model(store, features, candidates):
+    """Fit the cost model on the stored trials of exactly the candidate builds (engine -> (executable, build))."""
+    builds = {engine: (build["source_hash"], build["compiler_flags"], build["host"])
+              for engine, (_, build) in candidates.items()}
+    return CostModel.fit(training_samples(store, features, builds))
+
+def pick_auto_engine(model, features, candidates, memory_budget, fallback, graph_hash, explore=0.0, seed=0):
+    """(engine, predictions, explored) for one graph: the candidate auto runs it on.
+
+    That is the model's best candidate, or fallback while none is modeled.
+    On a share explore of the graphs, drawn from a generator seeded with seed
+    and the graph hash, the runner-up runs instead: the next modeled
+    candidate whose predicted memory fits, else a candidate the model does
+    not cover yet. Otherwise an engine predicted to lose would never get
+    samples from those graphs, and refits could not correct the first fit.
+    """
+    order, predictions = model.rank(features, candidates, memory_budget)
+    best = order[0] if order else fallback
+    if random.Random(f"{seed}:{graph_hash}").random() >= explore:
+        return best, predictions, False
+    runners_up = [engine for engine in order[1:] if memory_budget is None or predictions[engine]["memory"] <= memory_budget]
+    runners_up += [engine for engine in candidates if engine not in predictions and engine not in (best, fallback)]
+    return (runners_up[0], predictions, True) if runners_up else (best, predictions, False)
+
+def process_files_auto(candidates, model, features, input_dir, output_txt, log_path, fallback, max_workers=8,
+                       csr_cache_dir=None, mode="throughput", cores_per_job=1, memory_budget=None, store=None,
+                       limits=None, explore=0.0, seed=0):
+    """Run each graph once on the candidate engine the cost model predicts to be fastest.
+
+    candidates maps engine -> (executable, build dict). Engines whose
+    predicted peak memory exceeds the scheduler's memory budget are passed
+    over. fallback runs graphs when no candidate is modeled. A seeded share
+    explore of the graphs runs on the runner-up instead (see
+    pick_auto_engine). Every run is stored under the engine that ran it, so
+    the next fit learns from it. The predictions, whether the graph was
+    explored, and the measured time and peak RSS are appended to log_path as
+    a JSON line. Unlike the comparison sweeps, no graph is skipped. limits
+    caps every run; a censored run is stored and logged with its status.
+    """
+    scheduler = CoreScheduler(mode, cores_per_job, max_workers, memory_budget)
+    run_files, _ = collect_run_files(input_dir, csr_cache_dir)
+
+    futures = {}
+    with ThreadPoolExecutor(max_workers=scheduler.slots) as executor:
+        for run_file in order_largest_first(run_files):
+            input_file, graph_hash = run_files[run_file]
+            engine, predictions, explored = pick_auto_engine(model, features.ensure(input_file, graph_hash), candidates,
+                                                             scheduler.memory_budget, fallback, graph_hash, explore,
+                                                             seed)
+            print(f"Submitting {input_file} to {engine}{' (exploring)' if explored else ''}...")
+            future = executor.submit(scheduler.run, run_cpp_with_input_file, candidates[engine][0], run_file,
+                                     limits=limits)
+            futures[future] = (input_file, graph_hash, engine, predictions, explored)
+
+        with open(output_txt, "a") as output_file, open(log_path, "a") as log_file:
+            for future in as_completed(futures):
+                result, placement = future.result()
+                _, time_taken, integers, usage, phases = result
+                input_file, graph_hash, engine, predictions, explored = futures[future]
+                status = run_status(result)
+                if time_taken is None or (integers is None and status is None):
+                    print(f"Failed to process {input_file} with {engine}")
+                    continue
+                filename = os.path.basename(input_file)
+                build = candidates[engine][1]
+                if store is not None:
+                    store.add_trial(graph_hash, filename, build, time_taken, integers, usage, phases, placement)
+                actual = {"time": time_taken, "max_rss": usage["max_rss"]}
+                if status is not None:
+                    actual["status"] = status
+                log_file.write(json.dumps({
+                    "graph": graph_hash, "file": filename, "engine": engine, "explored": explored,
+                    "predicted": predictions, "actual": actual, "model_fitted_at": model.fitted_at,
+                }) + "\n")
+                if status is not None:
+                    output_file.write(format_censored_line(filename, time_taken, integers, usage, placement,
+                                                           build["compiler_flags"], engine))
+                    print(f"{filename}: {engine}, stopped after {time_taken:.6f}s ({status})")
+                    continue
+                output_file.write(format_result_line(filename, time_taken, integers, usage, phases, None, placement,
+                                                     build["compiler_flags"], engine))
+                print(f"{filename}: {engine}, {time_taken:.6f}s, MaxRSS: {format_rss(usage['max_rss'])} (at most {format_rss(usage['rss_upper_bound'])})")
+            output_file.write("\n")
+    print(f"Results saved to {output_txt}; predictions logged to {log_path}")
+
+def strong_scaling_sweep(executable, build, input_dir, output_csv, thread_counts, csr_cache_dir=None, benchmark=None,
+                         store=None, limits=None):
+    """Run a multithreaded engine on every .mtx file at each thread count and record speedup and efficiency.
+
+    build is the engine's build dict (engine, source_hash, compiler_flags, host).
+
+    Runs go one at a time, each pinned to as many cores as it has threads.
+    Speedup is relative to the smallest thread count t0, and efficiency is
+    speedup * t0 / threads. Each thread count is stored as its own engine
+    ("slota --threads 4") so resumed sweeps skip counts already measured.
+    Rows of engine, graph, threads, time, speedup and efficiency are appended
+    to output_csv. A run stopped by limits is stored as censored and ends
+    the graph's sweep, like a failed run.
+    """
+    thread_counts = sorted(set(thread_counts))
+    if len(available_cores()) < thread_counts[-1]:
+        print(f"Only {len(available_cores())} cores available; runs with more threads will share cores.")
+
+    rows = []
+    for filename in sorted(f for f in os.listdir(input_dir) if is_graph_file(f)):
+        input_file = os.path.join(input_dir, filename)
+        digest = file_sha256(input_file)
+        graph_hash = digest.hex()
+        run_file = ensure_csr_cache(input_file, csr_cache_dir, digest) if csr_cache_dir else input_file
+
+        times = {}
+        for threads in thread_counts:
+            thread_build = dict(build, engine=f"{build['engine']} --threads {threads}")
+            previous = store.trial_times(graph_hash, thread_build) if store is not None else []
+            if has_enough_trials(previous, benchmark):
+                times[threads] = summarize_samples(previous)["median"]
+                continue
+
+            def record_trial(result, cores, threads=threads, thread_build=thread_build):
+                _, time_taken, integers, usage, phases = result[:5]
+                if store is not None and time_taken is not None:
+                    placement = {"mode": "exclusive", "concurrency": 1, "cores": cores}
+                    store.add_trial(graph_hash, filename, thread_build, time_taken, integers, usage, phases, placement)
+
+            scheduler = CoreScheduler("exclusive", threads)
+            thread_args = ("--threads", str(threads))
+            if benchmark is not None:
+                result, _ = scheduler.run(benchmark_input_file, executable, run_file, **benchmark,
+                                          previous_samples=previous, on_trial=record_trial, args=thread_args,
+                                          limits=limits)
+            else:
+                result, placement = scheduler.run(run_cpp_with_input_file, executable, run_file, args=thread_args,
+                                                  limits=limits)
+                record_trial(result, placement["cores"])
+            if run_status(result) is not None:
+                print(f"{input_file} with {threads} threads stopped after {result[1]:.6f}s ({run_status(result)})")
+                break
+            if result[1] is None:
+                print(f"Failed to process {input_file} with {threads} threads")
+                break
+            times[threads] = result[1]
+
+        if thread_counts[0] not in times:
+            continue
+        base = thread_counts[0]
+        for threads, time_taken in times.items():
+            speedup = times[base] / time_taken
+            efficiency = speedup * base / threads
+            rows.append((build["engine"], filename, threads, time_taken, speedup, efficiency))
+            print(f"{build['engine']} {filename}: {threads} threads, {time_taken:.6f}s, speedup {speedup:.2f}x, efficiency {efficiency:.0%}")
+
+    write_header = not os.path.exists(output_csv)
+    with open(output_csv, "a") as output_file:
+        if write_header:
+            output_file.write("engine,graph,threads,time,speedup,efficiency\n")
+        for engine, filename, threads, time_taken, speedup, efficiency in rows:
+            output_file.write(f"{engine},{filename},{threads},{time_taken:.6f},{speedup:.4f},{efficiency:.4f}\n")
+    print(f"Scaling results saved to {output_csv}")
+
+def preprocess_sweep(executable, build, input_dir, output_csv, orders, prune, work_dir, build_dir, csr_cache_dir=None,
+                     benchmark=None, store=None, limits=None):
+    """Time an engine on every graph as given and after each preprocessing order, against the preprocessing cost.
+
+    Each graph's core is written to work_dir by Scripts/preprocess.py (in
+    every sweep, since its cost is measured), and the runs on it are stored
+    as their own engine ("slota --preprocess rcm+prune"). Speedup is the
+    engine's time on the input over its time on the core; net speedup also
+    charges the preprocessing, and break-even is the number of runs after
+    which preprocessing has paid for itself. Rows are appended to output_csv.
+    Runs stopped by limits are stored as censored and leave no row.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    scheduler = CoreScheduler("exclusive", 1)
+
+    def measure(run_file, graph_hash, filename, stage_build):
+        previous = store.trial_times(graph_hash, stage_build) if store is not None else []
+        if has_enough_trials(previous, benchmark):
+            return summarize_samples(previous)["median"]
+
+        def record_trial(result, cores):
+            _, time_taken, integers, usage, phases = result[:5]
+            if store is not None and time_taken is not None:
+                placement = {"mode": "exclusive", "concurrency": 1, "cores": cores}
+                store.add_trial(graph_hash, filename, stage_build, time_taken, integers, usage, phases, placement)
+
+        if benchmark is not None:
+            result, _ = scheduler.run(benchmark_input_file, executable, run_file, **benchmark,
+                                      previous_samples=previous, on_trial=record_trial, limits=limits)
+        else:
+            result, placement = scheduler.run(run_cpp_with_input_file, executable, run_file, limits=limits)
+            record_trial(result, placement["cores"])
+        if run_status(result) is not None:
+            print(f"{filename} ({stage_build['engine']}) stopped after {result[1]:.6f}s ({run_status(result)})")
+            return None
+        return result[1]
+
+    rows = []
+    for filename in sorted(f for f in os.listdir(input_dir) if is_graph_file(f)):
+        input_file = os.path.join(input_dir, filename)
+        digest = file_sha256(input_file)
+        graph_hash = digest.hex()
+        run_file = ensure_csr_cache(input_file, csr_cache_dir, digest) if csr_cache_dir else input_file
+        baseline = measure(run_file, graph_hash, filename, build)
+        if baseline is None:
+            print(f"Failed to process {input_file}")
+            continue
+        for order in orders:
+            tag = order + ("+prune" if prune else "")
+            core_file = os.path.join(work_dir, f"{filename}.{tag}.csr")
+            record = preprocess(run_file, core_file, order, prune, build_dir=build_dir)
+            time_taken = measure(core_file, graph_hash, filename, dict(build, engine=f"{build['engine']} --preprocess {tag}"))
+            if time_taken is None:
+                print(f"Failed to process {input_file} after {tag}")
+                continue
+            cost = record["total"]
+            saved = baseline - time_taken
+            break_even = cost / saved if saved > 0 else float("inf")
+            rows.append((build["engine"], filename, tag, cost, baseline, time_taken, baseline / time_taken,
+                         baseline / (time_taken + cost), break_even))
+            print(f"{build['engine']} {filename}: {tag} costs {cost:.6f}s, {baseline:.6f}s -> {time_taken:.6f}s "
+                  f"({baseline / time_taken:.2f}x, {baseline / (time_taken + cost):.2f}x net, "
+                  f"{record['pruned_edges']} edges pruned, mean gap {record['mean_gap_before']:.0f} -> "
+                  f"{record['mean_gap_after']:.0f})")
+
+    write_header = not os.path.exists(output_csv)
+    with open(output_csv, "a") as output_file:
+        if write_header:
+            output_file.write("engine,graph,preprocess,preprocess_time,baseline,time,speedup,net_speedup,break_even_runs\n")
+        for engine, filename, tag, cost, baseline, time_taken, speedup, net, break_even in rows:
+            output_file.write(f"{engine},{filename},{tag},{cost:.6f},{baseline:.6f},{time_taken:.6f},{speedup:.4f},"
+                              f"{net:.4f},{break_even:.2f}\n")
+    print(f"Preprocessing results saved to {output_csv}")
+
+def parse_args():
+    project = "/home/saiyamjain/Desktop/AlgoEngg/Project"
+    parser = argparse.ArgumentParser(description="Compile both engines and run them over a directory of Matrix Market files (.mtx, .mtx.gz, .mtx.zst or .tar.gz).")
+    parser.add_argument("--tarjan-cpp", default=f"{project}/tarjan.cpp")
+    parser.add_argument("--slota-cpp", default=f"{project}/slota.cpp")
+    parser.add_argument("--tarjan-parallel-cpp", default=f"{project}/tarjan_parallel.cpp")
+    parser.add_argument("--input-dir", default=f"{project}/matrices")
+    parser.add_argument("--tarjan-output", default=f"{project}/tarjan_result.txt")
+    parser.add_argument("--slota-output", default=f"{project}/slota_result.txt")
+    parser.add_argument("--tarjan-parallel-output", default=f"{project}/tarjan_parallel_result.txt")
+    parser.add_argument("--auto-output", default=f"{project}/auto_result.txt")
+    parser.add_argument("--engines", nargs="+", default=["tarjan", "slota"], choices=ENGINES,
+                        help="engines to compare; tarjan_parallel is the multicore Tarjan-Vishkin engine, and auto "
+                             "runs each graph on the engine the cost model picks")
+    parser.add_argument("--auto-engines", nargs="+", default=["slota", "tarjan"], choices=ENGINES[:-1],
+                        help="engines auto chooses between")
+    parser.add_argument("--auto-fallback", default="tarjan", choices=ENGINES[:-1],
+                        help="engine auto runs while too few stored results exist to model the candidates")
+    parser.add_argument("--auto-explore", type=float, default=0.1,
+                        help="share of graphs auto runs on the runner-up engine, so every candidate keeps getting samples")
+    parser.add_argument("--auto-seed", type=int, default=0,
+                        help="seed for choosing the explored graphs; change it to explore others")
+    parser.add_argument("--cost-model", default=f"{project}/cost_model.json", help="where auto saves the model it fits")
+    parser.add_argument("--auto-log", default=f"{project}/auto_predictions.jsonl",
+                        help="JSON lines of auto's predictions next to the measured time and peak RSS")
+    parser.add_argument("--csr-cache-dir", default=f"{project}/csr_cache",
+                        help="directory for binary CSR caches; pass an empty string to run on the text files")
+    parser.add_argument("--variants", nargs="+", default=["O3"], choices=sorted(BUILD_VARIANTS),
+                        help="build variants to sweep; each engine is compiled once per variant and cached")
+    parser.add_argument("--build-dir", default=f"{project}/builds")
+    parser.add_argument("--pgo-train", type=int, default=3, help="number of corpus graphs used to train PGO builds")
+    parser.add_argument("--features-index", default=f"{project}/graph_features.json",
+                        help="JSON sidecar of per-graph features filled before the runs; pass an empty string to skip")
+    parser.add_argument("--results-db", default=f"{project}/results.db",
+                        help="SQLite results store used to skip finished work; pass an empty string to disable")
+    parser.add_argument("--workers", type=int, default=8, help="upper bound on concurrent runs in throughput mode")
+    parser.add_argument("--mode", choices=["throughput", "exclusive"], default="throughput",
+                        help="exclusive runs one pinned job at a time (final numbers); throughput fills all cores")
+    parser.add_argument("--cores-per-job", type=int, default=1)
+    parser.add_argument("--memory-budget-gb", type=float, default=None,
+                        help="cap on the summed memory estimates of concurrent runs (default 80%% of RAM)")
+    parser.add_argument("--tarjan-memory-budget-mb", type=float, default=None,
+                        help="run tarjan in its memory-capped mode with this resident-memory budget")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="kill a run after this many wall-clock seconds and record it as censored")
+    parser.add_argument("--cpu-timeout", type=float, default=None,
+                        help="CPU-time limit per run in seconds (RLIMIT_CPU, summed over threads)")
+    parser.add_argument("--memory-limit-gb", type=float, default=None,
+                        help="address-space limit per run (RLIMIT_AS); runs that exceed it are recorded as OOM")
+    parser.add_argument("--abort-factor", type=float, default=None,
+                        help="stop a run once it takes this many times the fastest other engine's stored time on the graph")
+    parser.add_argument("--retry-censored", action="store_true",
+                        help="rerun graphs a limit stopped in an earlier sweep instead of skipping them")
+    parser.add_argument("--benchmark", action="store_true", help="run repeated trials with warmup and confidence intervals")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--min-reps", type=int, default=6,
+                        help="trials before the stop rule is checked (the median CI needs at least 6)")
+    parser.add_argument("--max-reps", type=int, default=50)
+    parser.add_argument("--ci-target", type=float, default=0.02,
+                        help="stop once the 95%% CI half-width is below this fraction of the median")
+    parser.add_argument("--cold", action="store_true", help="drop the OS page cache before every trial (needs root)")
+    parser.add_argument("--batch", action="store_true",
+                        help="run graphs through long-lived --batch engine processes instead of one process per graph")
+    parser.add_argument("--scaling-threads", type=int, nargs="+", default=None,
+                        help="run a strong-scaling sweep over these thread counts instead of the engine comparison")
+    parser.add_argument("--scaling-engines", nargs="+", default=["slota", "tarjan_parallel"], choices=THREADED_ENGINES)
+    parser.add_argument("--scaling-output", default=f"{project}/scaling.csv")
+    parser.add_argument("--preprocess-orders", nargs="+", default=None, choices=ORDERS,
+                        help="compare each engine on every graph against its core reordered in these orders")
+    parser.add_argument("--prune-leaves", action="store_true", help="also strip degree-1 chains in --preprocess-orders")
+    parser.add_argument("--preprocess-dir", default=f"{project}/preprocessed", help="where the preprocessed cores go")
+    parser.add_argument("--preprocess-output", default=f"{project}/preprocess.csv")
+    return parser.parse_args()
+
 def main():
-    cpp_file1 = "/home/saiyamjain/Desktop/AlgoEngg/Project/tarjan.cpp"
-    cpp_file2 = "/home/saiyamjain/Desktop/AlgoEngg/Project/slota.cpp"
-    input_dir = "/home/saiyamjain/Desktop/AlgoEngg/Project/matrices"
-    output_txt1 = "/home/saiyamjain/Desktop/AlgoEngg/Project/tarjan_result.txt"
-    output_txt2 = "/home/saiyamjain/Desktop/AlgoEngg/Project/slota_result.txt"
+    args = parse_args()
+    if args.batch and (args.benchmark or args.scaling_threads):
+        raise SystemExit("--batch runs each graph once; it cannot be combined with --benchmark or --scaling-threads")
+    if args.preprocess_orders and (args.batch or args.scaling_threads or "auto" in args.engines):
+        raise SystemExit("--preprocess-orders runs its own sweep; it cannot be combined with --batch, "
+                         "--scaling-threads or auto")
+    if args.batch and args.tarjan_memory_budget_mb:
+        raise SystemExit("--tarjan-memory-budget-mb runs one graph per process; it cannot be combined with --batch")
+    limits = {key: value for key, value in (("timeout", args.timeout), ("cpu_timeout", args.cpu_timeout),
+                                            ("memory_limit", int(args.memory_limit_gb * 2**30)
+                                             if args.memory_limit_gb else None)) if value}
+    if args.batch and (limits or args.abort_factor):
+        raise SystemExit("resource limits apply per process; they cannot be combined with --batch")
+    if args.abort_factor and not args.results_db:
+        raise SystemExit("--abort-factor compares against stored times and needs --results-db")
+    limits = limits or None
+    if "auto" in args.engines and (args.batch or args.benchmark or not args.results_db or not args.features_index):
+        raise SystemExit("auto needs --results-db and --features-index, and does not run with --batch or --benchmark")
+    if not 0 <= args.auto_explore <= 1:
+        raise SystemExit("--auto-explore is a share of the graphs, between 0 and 1")
+    csr_cache_dir = args.csr_cache_dir or None
+    benchmark = None
+    if args.benchmark:
+        benchmark = {"warmup": args.warmup, "min_reps": args.min_reps, "max_reps": args.max_reps,
+                     "ci_target": args.ci_target, "cold": args.cold}
     
-    executable1 = "executable1"
-    executable2 = "executable2"
+    schedule = {"mode": args.mode, "cores_per_job": args.cores_per_job,
+                "memory_budget": int(args.memory_budget_gb * 2**30) if args.memory_budget_gb else None}
 
-    compile_cpp_code(cpp_file1, executable1)
-    process_files_concurrent(executable1, input_dir, output_txt1)
+    store = ResultsStore(args.results_db) if args.results_db else None
+    corpus = [os.path.join(args.input_dir, f) for f in os.listdir(args.input_dir) if is_graph_file(f)]
+    features = None
+    if args.features_index:
+        features = FeatureIndex(args.features_index)
+        for input_file in sorted(corpus):
+            features.ensure(input_file)
+    training_inputs = [ensure_csr_cache(f, csr_cache_dir) if csr_cache_dir else f
+                       for f in pick_training_inputs(corpus, args.pgo_train)]
 
-    compile_cpp_code(cpp_file2, executable2)
-    process_files_concurrent(executable2, input_dir, output_txt2)
+    sources = {"tarjan": (args.tarjan_cpp, args.tarjan_output), "slota": (args.slota_cpp, args.slota_output),
+               "tarjan_parallel": (args.tarjan_parallel_cpp, args.tarjan_parallel_output), "auto": (None, args.auto_output)}
+    for variant in args.variants:
+        tag = variant_tag(variant)
+        if args.scaling_threads:
+            for engine in args.scaling_engines:
+                cpp_file = sources[engine][0]
+                executable = build_engine(cpp_file, variant, args.build_dir, training_inputs=training_inputs)
+                build = {"engine": engine, "source_hash": source_hash(cpp_file), "compiler_flags": tag, "host": host_id()}
+                strong_scaling_sweep(executable, build, args.input_dir, args.scaling_output, args.scaling_threads,
+                                     csr_cache_dir, benchmark, store, limits)
+            continue
+        for engine in args.engines:
+            cpp_file, output_txt = sources[engine]
+            if engine == "auto":
+                candidates = {}
+                for candidate in dict.fromkeys(args.auto_engines + [args.auto_fallback]):
+                    candidate_cpp = sources[candidate][0]
+                    candidates[candidate] = (
+                        build_engine(candidate_cpp, variant, args.build_dir, training_inputs=training_inputs),
+                        {"engine": candidate, "source_hash": source_hash(candidate_cpp), "compiler_flags": tag,
+                         "host": host_id()})
+                model = fit_cost_model(store, features, {e: candidates[e] for e in args.auto_engines})
+                model.save(args.cost_model)
+                process_files_auto(candidates, model, features, args.input_dir, output_txt, args.auto_log,
+                                   args.auto_fallback, args.workers, csr_cache_dir, **schedule, store=store,
+                                   limits=limits, explore=args.auto_explore, seed=args.auto_seed)
+                continue
+            executable = build_engine(cpp_file, variant, args.build_dir, training_inputs=training_inputs)
+            build = {"engine": engine, "source_hash": source_hash(cpp_file), "compiler_flags": tag, "host": host_id()}
+            if args.preprocess_orders:
+                preprocess_sweep(executable, build, args.input_dir, args.preprocess_output, args.preprocess_orders,
+                                 args.prune_leaves, args.preprocess_dir, args.build_dir, csr_cache_dir, benchmark, store,
+                                 limits)
+                continue
+            capped = {}
+            if engine == "tarjan" and args.tarjan_memory_budget_mb:
+                # Stored as its own engine, like the thread counts of a scaling sweep.
+                budget = f"{args.tarjan_memory_budget_mb:g}"
+                build["engine"] = f"tarjan --memory-budget {budget}"
+                capped = {"args": ("--memory-budget", budget), "memory_cap": int(args.tarjan_memory_budget_mb * 2**20)}
+            if args.batch:
+                process_files_batch(executable, args.input_dir, output_txt, args.workers, csr_cache_dir, args.cores_per_job,
+                                    store, build)
+                continue
+            process_files_concurrent(executable, args.input_dir, output_txt, args.workers, csr_cache_dir, benchmark,
+                                     **schedule, store=store, build=build, **capped, limits=limits,
+                                     abort_factor=args.abort_factor, reference_engines=args.engines,
+                                     retry_censored=args.retry_censored)
 
 if __name__ == "__main__":
     main()